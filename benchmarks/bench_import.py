@@ -0,0 +1,69 @@
+"""
+Benchmark the import time of buienradar and the startup time of the cli.
+
+Usage:
+  python benchmarks/bench_import.py [--number=<n>]
+
+Every statement is run in a new python process (nothing is imported yet);
+shows the best and median wall clock time and the largest imports
+(python -X importtime) of each statement.
+"""
+import statistics
+import subprocess
+import sys
+import time
+
+STATEMENTS = (
+    'import buienradar.buienradar',
+    'import buienradar.buienradar_xml',
+    'import buienradar.fetch; buienradar.fetch.create_session()',
+    'from buienradar.__main__ import main; main(["--help"])',
+    'from buienradar.__main__ import main; main(["--version"])',
+)
+# number of (cumulative) imports to show per statement:
+TOP = 3
+
+
+def run(statement, importtime=False):
+    """Run statement in a new interpreter; returns (seconds, stderr)."""
+    args = [sys.executable]
+    if importtime:
+        args += ['-X', 'importtime']
+    args += ['-c', statement]
+    start = time.perf_counter()
+    proc = subprocess.run(args, stdout=subprocess.DEVNULL,
+                          stderr=subprocess.PIPE, universal_newlines=True)
+    return time.perf_counter() - start, proc.stderr
+
+
+def largest_imports(stderr):
+    """Get the largest (cumulative, us) imports from -X importtime."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _self, cumulative, name = line[len('import time:'):].split('|')
+        imports.append((int(cumulative), name.strip()))
+    return sorted(imports, reverse=True)[:TOP]
+
+
+def main(argv=sys.argv[1:]):
+    """Run the benchmark."""
+    number = 10
+    for arg in argv:
+        if arg.startswith('--number='):
+            number = int(arg.split('=', 1)[1])
+
+    baseline = min(run('pass')[0] for _ in range(number))
+    print("python startup: %.1f ms, %d runs" % (baseline * 1000, number))
+    print("%-60s %9s %9s" % ('statement', 'best (ms)', 'median'))
+    for statement in STATEMENTS:
+        times = [run(statement)[0] - baseline for _ in range(number)]
+        print("%-60s %9.1f %9.1f" % (statement, min(times) * 1000,
+                                     statistics.median(times) * 1000))
+        for cumulative, name in largest_imports(run(statement, True)[1]):
+            print("    %-56s %9.1f" % (name, cumulative / 1000))
+
+
+if __name__ == '__main__':
+    main()
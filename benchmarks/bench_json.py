@@ -0,0 +1,58 @@
+"""
+Benchmark the json decoders on the json test feed.
+
+Usage:
+  python benchmarks/bench_json.py [<file>] [--number=<n>]
+
+Shows the time to load the feed (load_feed) and the peak memory used while
+decoding for each available decoder (see buienradar.jsonstream).
+"""
+import sys
+import timeit
+import tracemalloc
+
+from buienradar.buienradar import load_feed
+from buienradar.jsonstream import DECODERS
+
+DEFAULT_FILE = 'tests/json/buienradar.json'
+
+
+def peak_memory(func):
+    """Return the peak memory (bytes) allocated while calling func."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main(argv=sys.argv[1:]):
+    """Run the benchmark."""
+    number = 1000
+    files = []
+    for arg in argv:
+        if arg.startswith('--number='):
+            number = int(arg.split('=', 1)[1])
+        else:
+            files.append(arg)
+    name = files[0] if files else DEFAULT_FILE
+
+    with open(name, 'r') as file:
+        content = file.read()
+    print("%s: %d bytes, %d loops" % (name, len(content), number))
+    print("%-10s %12s %14s" % ('decoder', 'time (ms)', 'peak mem (kB)'))
+
+    for decoder in sorted(DECODERS):
+        def load():
+            return load_feed(content, decoder=decoder)
+
+        assert load()['success']
+        seconds = min(timeit.repeat(load, number=number, repeat=3))
+        peak = peak_memory(load)
+        print("%-10s %12.3f %14.1f" % (decoder, seconds / number * 1000,
+                                       peak / 1024))
+
+
+if __name__ == '__main__':
+    main()
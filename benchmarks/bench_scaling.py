@@ -0,0 +1,73 @@
+"""
+Benchmark how the parsing scales with the size of the feed.
+
+Usage:
+  bench_scaling.py [options]
+
+ Options:
+  --stations=<list>     Numbers of weather stations (comma separated)
+                        [default: 50,500,5000,20000]
+  --locations=<n>       Number of locations for parse_for_locations
+                        [default: 100]
+  --invalid=<rate>      Fraction (0..1) of the values that is invalid
+                        [default: 0.01]
+  --missing=<rate>      Fraction (0..1) of the values that is missing
+                        [default: 0.01]
+  --number=<n>          Number of runs (the fastest is shown) [default: 3]
+
+Generates synthetic feeds (see buienradar.synthetic) and shows, for the
+json and xml feed, the time to load the feed, to parse the data of one
+location and of many locations. The time per station should stay about the
+same for all sizes; when it grows, the parsing is not linear in the number
+of stations.
+"""
+import random
+import timeit
+
+from docopt import docopt
+
+from buienradar.buienradar import load_feed, parse_data, parse_for_locations
+from buienradar.constants import DATA, SUCCESS
+from buienradar.synthetic import BOUNDS, json_feed, xml_feed
+
+SEED = 6252
+
+
+def measure(func, number):
+    """Get the time (ms) of the fastest of number calls to func."""
+    return min(timeit.repeat(func, number=1, repeat=number)) * 1000
+
+
+def main(argv=None):
+    """Run the benchmark."""
+    args = docopt(__doc__, argv=argv)
+    sizes = [int(size) for size in args['--stations'].split(',')]
+    number = int(args['--number'])
+    invalid = float(args['--invalid'])
+    missing = float(args['--missing'])
+    rnd = random.Random(SEED)
+    locations = [(rnd.uniform(*BOUNDS[0]), rnd.uniform(*BOUNDS[1]))
+                 for _ in range(int(args['--locations']))]
+
+    print("%-5s %8s %10s %10s %10s %14s %12s" % (
+        'feed', 'stations', 'bytes', 'load (ms)', 'parse (ms)',
+        '%d loc. (ms)' % len(locations), 'us/station'))
+    for usexml, generate in ((False, json_feed), (True, xml_feed)):
+        for size in sizes:
+            content = generate(size, invalid=invalid, missing=missing,
+                               seed=SEED)
+            snapshot = load_feed(content, usexml)
+            assert snapshot[SUCCESS]
+
+            load = measure(lambda: load_feed(content, usexml), number)
+            parse = measure(lambda: parse_data(content, None, 52.1, 5.1,
+                                               usexml=usexml), number)
+            many = measure(lambda: parse_for_locations(snapshot[DATA],
+                                                       locations), number)
+            print("%-5s %8d %10d %10.2f %10.2f %14.2f %12.2f" % (
+                'xml' if usexml else 'json', size, len(content), load,
+                parse, many, parse / size * 1000))
+
+
+if __name__ == '__main__':
+    main()
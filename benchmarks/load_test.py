@@ -0,0 +1,112 @@
+"""
+Load test get_data (and parse_data) against the local stand-in server.
+
+Usage:
+  load_test.py [options]
+
+ Options:
+  --requests=<n>        Number of get_data calls [default: 2000]
+  --workers=<n>         Number of threads calling get_data [default: 50]
+  --base-url=<url>      Use a running (stand-in) server instead of starting
+                        one (see python -m buienradar.standin)
+  --latency=<seconds>   Latency of the started stand-in server [default: 0]
+  --error-rate=<rate>   Error rate of the started stand-in server
+                        [default: 0]
+  --usexml              Use the xml feed
+  --parse               Also parse the retrieved data (parse_data)
+  --cache               Share a buienradar.cache.FeedCache between the calls
+  --conditional         Use conditional requests (ConditionalStore)
+
+Every call uses a random location in the Netherlands; shows the throughput
+(calls per second) and the latency percentiles of the calls.
+"""
+import os
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from docopt import docopt
+
+from buienradar.buienradar import get_data, parse_data
+from buienradar.cache import FeedCache
+from buienradar.constants import CONTENT, RAINCONTENT, SUCCESS
+from buienradar.fetch import ConditionalStore, create_session
+from buienradar.standin import StandinServer
+from buienradar.urls import BASE_URL_ENV
+
+
+def percentile(values, fraction):
+    """Get the value below which fraction (0..1) of the sorted values are."""
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run(number, workers, usexml, parse, cache, conditional):
+    """Call get_data number times; returns (seconds, latencies, failures)."""
+    session = create_session(pool_maxsize=workers)
+    rnd = random.Random(6252)
+    locations = [(rnd.uniform(50.8, 53.5), rnd.uniform(3.4, 7.2))
+                 for _ in range(number)]
+    failures = []
+    lock = threading.Lock()
+
+    def call(location):
+        start = time.perf_counter()
+        result = get_data(location[0], location[1], usexml, session,
+                          conditional, cache)
+        if result[SUCCESS] and parse:
+            result = parse_data(result[CONTENT], result[RAINCONTENT],
+                                location[0], location[1], usexml=usexml)
+        if not result[SUCCESS]:
+            with lock:
+                failures.append(result)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        latencies = list(pool.map(call, locations))
+    return time.perf_counter() - start, latencies, failures
+
+
+def main(argv=None):
+    """Run the load test."""
+    args = docopt(__doc__, argv=argv)
+    number = int(args['--requests'])
+    workers = int(args['--workers'])
+
+    server = None
+    base_url = args['--base-url']
+    if base_url is None:
+        server = StandinServer(latency=float(args['--latency']),
+                               error_rate=float(args['--error-rate']))
+        base_url = server.start()
+    os.environ[BASE_URL_ENV] = base_url
+
+    cache = FeedCache(maxsize=number + 2) if args['--cache'] else None
+    conditional = ConditionalStore() if args['--conditional'] else None
+    try:
+        seconds, latencies, failures = run(number, workers, args['--usexml'],
+                                           args['--parse'], cache,
+                                           conditional)
+    finally:
+        if server is not None:
+            server.stop()
+
+    latencies.sort()
+    print("%s: %d calls, %d workers, %d failed" % (base_url, number, workers,
+                                                   len(failures)))
+    print("throughput: %.1f calls/s" % (number / seconds))
+    print("latency (ms): median %.2f, p90 %.2f, p99 %.2f, max %.2f" % (
+        statistics.median(latencies) * 1000,
+        percentile(latencies, 0.9) * 1000,
+        percentile(latencies, 0.99) * 1000,
+        latencies[-1] * 1000))
+    if server is not None:
+        print("responses: %s" % dict(server.stats))
+    if cache is not None:
+        print("cache: %s" % cache.stats())
+
+
+if __name__ == '__main__':
+    main()
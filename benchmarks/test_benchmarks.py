@@ -0,0 +1,117 @@
+"""
+Benchmarks of the parsing on the test files (pytest-benchmark).
+
+Run (and compare to the stored baseline, failing on a regression):
+
+  tox -e benchmark
+
+or store a new baseline after an (intended) change:
+
+  tox -e benchmark -- --benchmark-save=baseline
+
+The baselines are stored per machine (platform and python version) in
+benchmarks/baselines; only compare results of the same machine.
+"""
+import pytest
+
+from buienradar.buienradar import condition_from_code
+from buienradar.buienradar_json import __parse_precipfc_data as json_precip
+from buienradar.buienradar_json import __select_nearest_ws as json_nearest
+from buienradar.buienradar_json import load_json_feed, parse_json_data
+from buienradar.buienradar_xml import __parse_precipfc_data as xml_precip
+from buienradar.buienradar_xml import __select_nearest_ws as xml_nearest
+from buienradar.buienradar_xml import load_xml_feed, parse_xml_data
+from buienradar.constants import __BRCONDITIONS, DATA, SUCCESS
+
+pytest.importorskip('pytest_benchmark')
+
+# locations spread over the Netherlands:
+LOCATIONS = [(50.85, 5.69), (51.44, 3.57), (51.98, 5.91), (52.09, 5.12),
+             (52.37, 4.89), (52.52, 6.08), (53.22, 6.57), (53.36, 5.22)]
+
+
+def load_file(name):
+    """Load a file with test data."""
+    file = open(name, 'r')
+    data = file.read()
+    file.close()
+    return data
+
+
+@pytest.fixture(scope='module')
+def json_feed():
+    """Get the json test feed."""
+    return load_file('tests/json/buienradar.json')
+
+
+@pytest.fixture(scope='module')
+def xml_feed():
+    """Get the xml test feed."""
+    return load_file('tests/xml/buienradar.xml')
+
+
+@pytest.fixture(scope='module')
+def raindata():
+    """Get the precipitation test data."""
+    return load_file('tests/raindata/raindata.txt')
+
+
+@pytest.mark.benchmark(group='parse_data')
+def test_parse_json_data(benchmark, json_feed, raindata):
+    """Benchmark parsing the json feed and precipitation data."""
+    result = benchmark(parse_json_data, json_feed, raindata, 52.09, 5.12, 60)
+    assert (result[SUCCESS])
+
+
+@pytest.mark.benchmark(group='parse_data')
+def test_parse_xml_data(benchmark, xml_feed, raindata):
+    """Benchmark parsing the xml feed and precipitation data."""
+    result = benchmark(parse_xml_data, xml_feed, raindata, 52.09, 5.12, 60)
+    assert (result[SUCCESS])
+
+
+@pytest.mark.benchmark(group='select_nearest_ws')
+def test_select_nearest_ws_json(benchmark, json_feed):
+    """Benchmark selecting the nearest station in the json feed."""
+    snapshot = load_json_feed(json_feed)[DATA]
+
+    def select():
+        return [json_nearest(snapshot, lat, lon) for lat, lon in LOCATIONS]
+
+    assert (all(benchmark(select)))
+
+
+@pytest.mark.benchmark(group='select_nearest_ws')
+def test_select_nearest_ws_xml(benchmark, xml_feed):
+    """Benchmark selecting the nearest station in the xml feed."""
+    snapshot = load_xml_feed(xml_feed)[DATA]
+
+    def select():
+        return [xml_nearest(snapshot, lat, lon) for lat, lon in LOCATIONS]
+
+    assert (all(benchmark(select)))
+
+
+@pytest.mark.benchmark(group='parse_precipfc_data')
+def test_parse_precipfc_data_json(benchmark, raindata):
+    """Benchmark parsing the precipitation data (json)."""
+    result = benchmark(json_precip, raindata, 120)
+    assert (result['timeframe'] == 120)
+
+
+@pytest.mark.benchmark(group='parse_precipfc_data')
+def test_parse_precipfc_data_xml(benchmark, raindata):
+    """Benchmark parsing the precipitation data (xml)."""
+    result = benchmark(xml_precip, raindata, 120)
+    assert (result['timeframe'] == 120)
+
+
+@pytest.mark.benchmark(group='condition_from_code')
+def test_condition_from_code(benchmark):
+    """Benchmark getting the condition of every code."""
+    codes = sorted(__BRCONDITIONS) + ['?']
+
+    def conditions():
+        return [condition_from_code(code) for code in codes]
+
+    assert (benchmark(conditions)[0])
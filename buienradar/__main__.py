@@ -16,21 +16,33 @@ Usage:
   --timeframe=<timeframe>   Minutes to look ahead for
                             precipitation (5..120) [default: 60]
   --usexml                  Use old xml API (default is json API)
+  --batch=<file>            Get the data for the locations (latitude,
+                            longitude) in a csv or ndjson file ('-' to
+                            read stdin); prints a line of json per location
+  --format=<format>         Format of the batch file: csv or ndjson
+                            (default: detected from the first line)
+  --workers=<workers>       Number of locations to process in parallel in
+                            batch mode [default: 10]
+  --watch                   Keep running and refresh the data when buienradar
+                            updates it (every 5 minutes); prints a line of
+                            json when the data changed
+  --iterations=<n>          Number of refreshes in watch mode (default: run
+                            until interrupted)
 """
 import logging
 import sys
 
-import pkg_resources
 from docopt import docopt
 
-from .buienradar import get_data, parse_data
 from .constants import CONTENT, MESSAGE, RAINCONTENT, SUCCESS
 
 
 def main(argv=sys.argv[1:]):
     """Parse argument and start main program."""
-    args = docopt(__doc__, argv=argv,
-                  version=pkg_resources.require('buienradar')[0].version)
+    version = None
+    if '--version' in argv:
+        version = __version()
+    args = docopt(__doc__, argv=argv, version=version)
 
     level = logging.ERROR
     if args['-v']:
@@ -50,6 +62,19 @@ def main(argv=sys.argv[1:]):
     if args['--usexml']:
         usexml = True
 
+    if args['--batch']:
+        return __batch(args['--batch'], args['--format'],
+                       int(args['--workers']), usexml, timeframe)
+
+    if args['--watch']:
+        iterations = None
+        if args['--iterations']:
+            iterations = int(args['--iterations'])
+        return __watch(latitude, longitude, usexml, timeframe, iterations)
+
+    # imported after parsing the arguments; -h and --version stay fast:
+    from .buienradar import get_data, parse_data
+
     result = get_data(latitude, longitude, usexml)
     if result[SUCCESS]:
         log.debug("Retrieved data:\n%s", result)
@@ -64,6 +89,52 @@ def main(argv=sys.argv[1:]):
                   result[MESSAGE])
 
 
+def __batch(name, fmt, workers, usexml, timeframe):
+    """Get the data for all locations in file name; prints ndjson."""
+    from .batch import process_locations, read_locations, write_ndjson
+    from .fetch import create_session
+
+    session = create_session(pool_maxsize=workers)
+    if name == '-':
+        locations = list(read_locations(sys.stdin, fmt))
+    else:
+        with open(name, 'r', newline='') as file:
+            locations = list(read_locations(file, fmt))
+
+    results = process_locations(locations, usexml, timeframe, workers,
+                                session=session)
+    write_ndjson(results, sys.stdout)
+
+
+def __watch(latitude, longitude, usexml, timeframe, iterations):
+    """Print the data of the location (as json) whenever it changes."""
+    from .batch import to_json
+    from .watch import watch
+
+    def emit(result):
+        print(to_json(result), flush=True)
+
+    try:
+        watch(latitude, longitude, emit, usexml, timeframe,
+              iterations=iterations)
+    except KeyboardInterrupt:
+        pass
+
+
+def __version():
+    """Get the version of the installed buienradar package."""
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+    except ImportError:     # pragma: no cover
+        # python < 3.8
+        import pkg_resources
+        return pkg_resources.require('buienradar')[0].version
+    try:
+        return version('buienradar')
+    except PackageNotFoundError:
+        return 'unknown'
+
+
 if __name__ == '__main__':
     # execute only if run as the entry point into the program
     main()
@@ -0,0 +1,188 @@
+"""
+Get the weather data for many locations at once (cli batch mode).
+
+The locations are read from csv or ndjson; the feed is retrieved and
+parsed once, the precipitation forecast once per (rounded) location and
+the results are written as ndjson, in the order of the locations.
+"""
+import csv
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+from buienradar.buienradar import get_data, load_feed, parse_for_locations
+from buienradar.cache import FeedCache
+from buienradar.constants import (
+    CONTENT,
+    DATA,
+    LATITUDE,
+    LONGITUDE,
+    MESSAGE,
+    RAINCONTENT,
+    SUCCESS
+)
+
+CSV = 'csv'
+NDJSON = 'ndjson'
+# default number of locations processed in parallel:
+WORKERS = 10
+
+log = logging.getLogger(__name__)
+
+
+def read_locations(file, fmt=None):
+    """
+    Read the locations from a csv or ndjson file.
+
+    csv: rows with a latitude and a longitude; with a header row, the
+         columns named latitude and longitude are used
+    ndjson: a json object per line with a latitude and a longitude
+    fmt: CSV, NDJSON or None to detect the format from the first line
+
+    Yields a dict per location with (at least) LATITUDE and LONGITUDE as
+    floats; the other fields (columns) of the location are kept. A location
+    that can not be read has None for LATITUDE and LONGITUDE and a MESSAGE.
+    """
+    lines = (line for line in file if line.strip())
+    first = next(lines, None)
+    if first is None:
+        return
+    if fmt is None:
+        fmt = NDJSON if first.lstrip().startswith('{') else CSV
+
+    if fmt == NDJSON:
+        for line in __chain(first, lines):
+            try:
+                location = json.loads(line)
+                if not isinstance(location, dict):
+                    raise ValueError("not a json object")
+            except ValueError as err:
+                yield __invalid({}, "Invalid location: %s (%s)."
+                                % (line.strip(), err))
+                continue
+            yield __to_location(location)
+    elif fmt == CSV:
+        rows = csv.reader(__chain(first, lines))
+        fields = None
+        for row in rows:
+            if fields is None:
+                fields = [LATITUDE, LONGITUDE]
+                names = [name.strip().lower() for name in row]
+                if LATITUDE in names and LONGITUDE in names:
+                    # header row:
+                    fields = names
+                    continue
+            yield __to_location(dict(zip(fields, row)))
+    else:
+        raise ValueError("Unknown format: %s." % fmt)
+
+
+def process_locations(locations, usexml=False, timeframe=60,
+                      workers=WORKERS, series=False, session=None,
+                      cache=None):
+    """
+    Get and parse the weather data for each location.
+
+    locations: dicts with LATITUDE and LONGITUDE (see read_locations)
+    workers: number of locations processed in parallel
+    session: optional requests.Session (see fetch.create_session)
+    cache: optional cache.FeedCache; by default a cache (large enough for
+           all locations) is used, so the feed is retrieved once and nearby
+           locations share the precipitation forecast
+
+    Yields the location updated with the result of parse_data (SUCCESS,
+    MESSAGE, DATA and DISTANCE), in the order of the locations.
+    """
+    locations = list(locations)
+    if cache is None:
+        cache = FeedCache(maxsize=len(locations) + 2)
+    feed = {CONTENT: None, DATA: None}
+    lock = threading.Lock()
+
+    def snapshot(content):
+        # parse the feed once (and again when it changed):
+        with lock:
+            if feed[CONTENT] is not content:
+                feed[DATA] = load_feed(content, usexml)
+                feed[CONTENT] = content
+            return feed[DATA]
+
+    def process(location):
+        if location[LATITUDE] is None or location[LONGITUDE] is None:
+            return location
+        result = get_data(location[LATITUDE], location[LONGITUDE], usexml,
+                          session=session, cache=cache)
+        if not result[SUCCESS]:
+            return __failed(location, result[MESSAGE])
+        loaded = snapshot(result[CONTENT])
+        if not loaded[SUCCESS]:
+            return __failed(location, loaded[MESSAGE])
+        result = parse_for_locations(
+            loaded[DATA], [(location[LATITUDE], location[LONGITUDE])],
+            timeframe, [result[RAINCONTENT]], series)[0]
+        location.update(result)
+        return location
+
+    with ThreadPoolExecutor(max_workers=workers,
+                            thread_name_prefix='buienradar-batch') as pool:
+        for result in pool.map(process, locations):
+            yield result
+    log.info("Processed %d locations, cache: %s", len(locations),
+             cache.stats())
+
+
+def to_json(result):
+    """Convert a result into a line of json (datetimes in iso format)."""
+    return json.dumps(result, default=__default, ensure_ascii=False)
+
+
+def write_ndjson(results, file):
+    """Write the results as ndjson to file, one line per result."""
+    for result in results:
+        file.write(to_json(result))
+        file.write('\n')
+        file.flush()
+
+
+def __chain(first, lines):
+    """Yield the first line followed by the other lines."""
+    yield first
+    yield from lines
+
+
+def __to_location(location):
+    """Convert the coordinates of a location into floats."""
+    try:
+        location[LATITUDE] = float(location[LATITUDE])
+        location[LONGITUDE] = float(location[LONGITUDE])
+    except (KeyError, TypeError, ValueError):
+        return __invalid(location, "Invalid location: %s." % location)
+    return location
+
+
+def __invalid(location, message):
+    """Mark the location as invalid."""
+    log.warning(message)
+    location = dict(location)
+    location[LATITUDE] = None
+    location[LONGITUDE] = None
+    location[SUCCESS] = False
+    location[MESSAGE] = message
+    location[DATA] = None
+    return location
+
+
+def __failed(location, message):
+    """Set the failed result of the location."""
+    location.update({SUCCESS: False, MESSAGE: message, DATA: None})
+    return location
+
+
+def __default(value):
+    """Convert the values json does not support."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError("Object of type %s is not JSON serializable"
+                    % type(value).__name__)
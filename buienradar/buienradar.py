@@ -1,52 +1,163 @@
 """Buienradar library to get parsed weather data from buienradar.nl."""
 import logging
 
-from buienradar.buienradar_json import get_json_data, parse_json_data
-from buienradar.buienradar_xml import get_xml_data, parse_xml_data
-from buienradar.constants import (
-    __BRCONDITIONS,
-    CONDCODE,
-    CONDITION,
-    DETAILED,
-    EXACT,
-    EXACTNL
+from buienradar.buienradar_json import (
+    convert_json_stations,
+    get_json_data,
+    load_json_feed,
+    parse_json_data,
+    parse_json_snapshot
 )
+from buienradar.conditions import lookup
+from buienradar.constants import SUCCESS
+from buienradar.instrument import GET_DATA, PARSE_DATA, attach, mark, stage
+from buienradar.spatial import batch_candidates
+
+# the xml support (buienradar.buienradar_xml) is imported on first use
 
 log = logging.getLogger(__name__)
 
 
-def get_data(latitude=52.091579, longitude=5.119734, usexml=False):
-    """Get buienradar xml data and return results."""
-    if usexml:
-        log.info("Getting buienradar XML data for latitude=%s, longitude=%s",
-                 latitude, longitude)
-        return get_xml_data(latitude, longitude)
-    else:
-        log.info("Getting buienradar JSON data for latitude=%s, longitude=%s",
-                 latitude, longitude)
-        return get_json_data(latitude, longitude)
+def get_data(latitude=52.091579, longitude=5.119734, usexml=False,
+             session=None, conditional=None, cache=None, executor=None):
+    """
+    Get buienradar xml data and return results.
+
+    session: optional (shared) requests.Session to reuse connections
+             between calls, see buienradar.fetch.create_session
+    conditional: optional buienradar.fetch.ConditionalStore to send
+                 conditional requests (ETag/Last-Modified); NOT_MODIFIED in
+                 the result indicates the content did not change
+    cache: optional buienradar.cache.FeedCache to share the retrieved data
+           between calls (within this process)
+    executor: optional concurrent.futures.Executor to request the
+              precipitation forecast in (see buienradar.fetch.submit)
+
+    The stages are timed when instrumented (see buienradar.instrument).
+    """
+    position = mark()
+    with stage(GET_DATA, format='xml' if usexml else 'json') as details:
+        if usexml:
+            from buienradar.buienradar_xml import get_xml_data
+            log.info("Getting buienradar XML data for latitude=%s, "
+                     "longitude=%s", latitude, longitude)
+            result = get_xml_data(latitude, longitude, session, conditional,
+                                  cache, executor)
+        else:
+            log.info("Getting buienradar JSON data for latitude=%s, "
+                     "longitude=%s", latitude, longitude)
+            result = get_json_data(latitude, longitude, session, conditional,
+                                   cache, executor)
+        details[SUCCESS] = result[SUCCESS]
+    return attach(result, position)
 
 
 def parse_data(content, raincontent, latitude=52.091579,
-               longitude=5.119734, timeframe=60, usexml=False):
-    """Parse the raw data and return as data dictionary."""
+               longitude=5.119734, timeframe=60, usexml=False, series=False,
+               decoder=None):
+    """
+    Parse the raw data and return as data dictionary.
+
+    series: include the full (5 minute) precipitation forecast in SERIES
+            of the PRECIPITATION_FORECAST data
+    decoder: json decoder to use (see buienradar.jsonstream.get_decoder)
+
+    The stages are timed when instrumented (see buienradar.instrument).
+    """
+    position = mark()
+    with stage(PARSE_DATA, format='xml' if usexml else 'json') as details:
+        if usexml:
+            from buienradar.buienradar_xml import parse_xml_data
+            result = parse_xml_data(content, raincontent,
+                                    latitude, longitude, timeframe, series)
+        else:
+            result = parse_json_data(content, raincontent,
+                                     latitude, longitude, timeframe, series,
+                                     decoder)
+        details[SUCCESS] = result[SUCCESS]
+    return attach(result, position)
+
+
+def load_feed(content, usexml=False, decoder=None):
+    """
+    Parse the raw feed once; returns a FeedSnapshot in DATA.
+
+    The snapshot can be passed to parse_for_locations to extract the weather
+    data for many locations without parsing the raw content again.
+
+    decoder: json decoder to use (see buienradar.jsonstream.get_decoder)
+    """
     if usexml:
-        return parse_xml_data(content, raincontent,
-                              latitude, longitude, timeframe)
+        from buienradar.buienradar_xml import load_xml_feed
+        return load_xml_feed(content)
     else:
-        return parse_json_data(content, raincontent,
-                               latitude, longitude, timeframe)
+        return load_json_feed(content, decoder)
+
+
+def parse_for_locations(snapshot, locations, timeframe=60, raincontents=None,
+                        series=False):
+    """
+    Parse the weather data for multiple locations from one FeedSnapshot.
+
+    snapshot: FeedSnapshot (DATA of a successful load_feed result)
+    locations: list of (latitude, longitude) tuples
+    timeframe: minutes to look ahead for precipitation (5..120)
+    raincontents: optional list with the raincontent per location
+    series: include the full precipitation forecast (see parse_data)
+
+    Returns a list with a result (as returned by parse_data) per location.
+    """
+    if timeframe < 5 or timeframe > 120:
+        raise ValueError("Timeframe must be >=5 and <=120.")
+
+    locations = list(locations)
+    if raincontents is None:
+        raincontents = [None] * len(locations)
+    elif len(raincontents) != len(locations):
+        raise ValueError("Expected a raincontent for each location.")
+
+    if snapshot.usexml:
+        from buienradar.buienradar_xml import parse_xml_snapshot
+        parse = parse_xml_snapshot
+    else:
+        parse = parse_json_snapshot
+
+    # select the candidate stations for all locations at once (numpy):
+    candidates = None
+    if len(locations) > 1:
+        candidates = batch_candidates(snapshot.coordinates, locations)
+    if candidates is None:
+        candidates = [None] * len(locations)
+
+    return [parse(snapshot, raincontent, latitude, longitude, timeframe,
+                  cands, series)
+            for (latitude, longitude), raincontent, cands
+            in zip(locations, raincontents, candidates)]
+
+
+def convert_stations(snapshot):
+    """
+    Convert the data of all weather stations in a FeedSnapshot at once.
+
+    Returns DATA: a dict with a list (column) per key: LATITUDE, LONGITUDE
+    and the (converted) weather data like TEMPERATURE; see
+    buienradar.table to convert the columns into numpy arrays or a pandas
+    DataFrame.
+    """
+    if snapshot.usexml:
+        from buienradar.buienradar_xml import convert_xml_stations
+        return convert_xml_stations(snapshot)
+    else:
+        return convert_json_stations(snapshot)
 
 
 def condition_from_code(condcode):
-    """Get the condition name from the condition code."""
-    if condcode in __BRCONDITIONS:
-        cond_data = __BRCONDITIONS[condcode]
-
-        return {CONDCODE: condcode,
-                CONDITION: cond_data[0],
-                DETAILED: cond_data[1],
-                EXACT: cond_data[2],
-                EXACTNL: cond_data[3],
-                }
-    return None
+    """
+    Get the condition name from the condition code.
+
+    Returns a new dict; see conditions.lookup for the shared, read-only one.
+    """
+    record = lookup(condcode)
+    if record is None:
+        return None
+    return record.copy()
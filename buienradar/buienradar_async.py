@@ -0,0 +1,160 @@
+"""Asyncio (aiohttp) variants of get_data, get_json_data and get_xml_data."""
+import asyncio
+import logging
+
+import aiohttp
+
+from buienradar.constants import (
+    CONTENT,
+    HEADERS,
+    MESSAGE,
+    NOT_MODIFIED,
+    RAINCONTENT,
+    STATUS_CODE,
+    SUCCESS
+)
+from buienradar.instrument import BYTES, FALLBACK, FETCH, record, stage
+from buienradar.urls import (
+    json_feed_url,
+    json_precipitation_forecast_url,
+    xml_feed_url,
+    xml_precipitation_forecast_url,
+    xml_secondary_feed_url
+)
+
+log = logging.getLogger(__name__)
+
+
+async def async_get_data(latitude=52.091579, longitude=5.119734,
+                         usexml=False, session=None, conditional=None):
+    """
+    Get buienradar data and return results.
+
+    session: optional (shared) aiohttp.ClientSession; when omitted a
+             session is created for this call only
+    conditional: optional fetch.ConditionalStore to use conditional requests
+    """
+    if usexml:
+        log.info("Getting buienradar XML data for latitude=%s, longitude=%s",
+                 latitude, longitude)
+        return await async_get_xml_data(latitude, longitude, session,
+                                        conditional)
+    else:
+        log.info("Getting buienradar JSON data for latitude=%s, longitude=%s",
+                 latitude, longitude)
+        return await async_get_json_data(latitude, longitude, session,
+                                         conditional)
+
+
+async def async_get_json_data(latitude=52.091579, longitude=5.119734,
+                              session=None, conditional=None):
+    """Get buienradar json data and return results."""
+    log.debug("Getting buienradar json data for latitude=%s, longitude=%s",
+              latitude, longitude)
+    return await __get_data(
+        [json_feed_url()],
+        json_precipitation_forecast_url(latitude, longitude),
+        session, conditional)
+
+
+async def async_get_xml_data(latitude=52.091579, longitude=5.119734,
+                             session=None, conditional=None):
+    """Get buienradar xml data and return results."""
+    log.debug("Getting buienradar xml data for latitude=%s, longitude=%s",
+              latitude, longitude)
+    return await __get_data(
+        [xml_feed_url(), xml_secondary_feed_url()],
+        xml_precipitation_forecast_url(latitude, longitude),
+        session, conditional)
+
+
+async def async_get_url(url, session, conditional=None):
+    """Load data from url and return result."""
+    log.debug("Retrieving weather data (%s)...", url)
+    result = {SUCCESS: False, MESSAGE: None}
+    headers = stored = None
+    if conditional is not None:
+        headers, stored = conditional.lookup(url)
+    with stage(FETCH, url=url) as details:
+        try:
+            async with session.get(url, headers=headers) as r:
+                result[STATUS_CODE] = r.status
+                result[HEADERS] = r.headers
+                details[STATUS_CODE] = r.status
+                if (304 == r.status and stored is not None):
+                    result[CONTENT] = stored
+                    result[NOT_MODIFIED] = True
+                    result[SUCCESS] = True
+                    details.update({SUCCESS: True, NOT_MODIFIED: True})
+                    return result
+                result[CONTENT] = await r.text()
+                details[BYTES] = len(result[CONTENT])
+                if (200 == r.status):
+                    result[SUCCESS] = True
+                    if conditional is not None:
+                        conditional.update(url, r.headers, result[CONTENT])
+                else:
+                    result[MESSAGE] = "Got http statuscode: %d." % (r.status)
+                details[SUCCESS] = result[SUCCESS]
+                return result
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            result[MESSAGE] = 'Error getting url data. %s' % err
+            log.error(result[MESSAGE])
+            details.update({SUCCESS: False, MESSAGE: result[MESSAGE]})
+
+    return result
+
+
+async def __get_data(feed_urls, rain_url, session, conditional):
+    """Get the feed (trying feed_urls in order) and rain data concurrently."""
+    if session is None:
+        async with aiohttp.ClientSession() as session:
+            return await __get_data(feed_urls, rain_url, session,
+                                    conditional)
+
+    final_result = {SUCCESS: False, MESSAGE: None,
+                    CONTENT: None, RAINCONTENT: None}
+
+    result, rain_result = await asyncio.gather(
+        __get_ws_data(feed_urls, session, conditional),
+        async_get_url(rain_url, session, conditional))
+
+    if result[SUCCESS]:
+        final_result[CONTENT] = result[CONTENT]
+        final_result[SUCCESS] = True
+        if conditional is not None:
+            final_result[NOT_MODIFIED] = result.get(NOT_MODIFIED, False)
+    else:
+        final_result[MESSAGE] = __error_message(result)
+
+    if rain_result[SUCCESS]:
+        final_result[RAINCONTENT] = rain_result[CONTENT]
+    else:
+        final_result[MESSAGE] = __error_message(rain_result)
+
+    return final_result
+
+
+async def __get_ws_data(feed_urls, session, conditional):
+    """Get the feed; try the next url when the first fails."""
+    for position, url in enumerate(feed_urls):
+        if position:
+            record(FALLBACK, url=url)
+        result = await async_get_url(url, session, conditional)
+        if result[SUCCESS]:
+            break
+    return result
+
+
+def __error_message(result):
+    """Construct (and log) the message for a failed request."""
+    if STATUS_CODE in result and MESSAGE in result:
+        msg = "Status: %d, Msg: %s" % (result[STATUS_CODE],
+                                       result[MESSAGE])
+    elif MESSAGE in result:
+        msg = "Msg: %s" % (result[MESSAGE])
+    else:
+        msg = "Something went wrong (reason unknown)."
+
+    log.warning(msg)
+    return msg
@@ -1,43 +1,33 @@
 """Buienradar library to get parsed weather data from buienradar.nl."""
-import json
 import logging
-from datetime import datetime  # , timedelta
+from collections.abc import Mapping
 
-import pytz
-import requests
 from vincenty import vincenty
 
+from buienradar.conditions import with_image
 from buienradar.constants import (
-    __BRCONDITIONS,
-    ATTRIBUTION,
-    ATTRIBUTION_INFO,
-    AVERAGE,
     BAROMETERFC,
     BAROMETERFCNAME,
     BAROMETERFCNAMENL,
-    CONDCODE,
     CONDITION,
     CONTENT,
     DATA,
     DATETIME,
-    DETAILED,
     DISTANCE,
-    EXACT,
-    EXACTNL,
     FEELTEMPERATURE,
     FORECAST,
     GROUNDTEMP,
-    HEADERS,
     HUMIDITY,
-    IMAGE,
     IRRADIANCE,
+    LATITUDE,
+    LONGITUDE,
     MAX_RAIN,
     MAX_TEMP,
     MEASURED,
     MESSAGE,
     MIN_RAIN,
     MIN_TEMP,
-    NIGHTTIME,
+    NOT_MODIFIED,
     PRECIPITATION,
     PRECIPITATION_FORECAST,
     PRESSURE,
@@ -52,8 +42,6 @@ from buienradar.constants import (
     SUCCESS,
     SUN_CHANCE,
     TEMPERATURE,
-    TIMEFRAME,
-    TOTAL,
     VISIBILITY,
     WINDAZIMUTH,
     WINDDIRECTION,
@@ -61,13 +49,27 @@ from buienradar.constants import (
     WINDGUST,
     WINDSPEED
 )
-from buienradar.urls import JSON_FEED_URL, json_precipitation_forecast_url
+from buienradar.fetch import get_url, submit
+from buienradar.instrument import (
+    CONVERT,
+    CONVERT_FORECAST,
+    DECODE,
+    PARSE_PRECIPITATION,
+    SELECT,
+    STATIONS,
+    stage
+)
+from buienradar.jsonstream import get_decoder
+from buienradar.precipitation import parse_precipitation
+from buienradar.snapshot import FeedSnapshot
+from buienradar.spatial import build_index, nearest_candidates
+from buienradar.stations import StationConverter
+from buienradar.timestamps import to_localdatetime
+from buienradar.urls import json_feed_url, json_precipitation_forecast_url
 
 # buienradar date format: '07/26/2017 15:50:00'
 # "2019-02-03T19:20:00",
 __DATE_FORMAT = '%Y-%m-%dT%H:%M:%S'
-__TIMEZONE = 'Europe/Amsterdam'
-__PYTZ_TIMEZONE = pytz.timezone(__TIMEZONE)
 
 __ACTUAL = "actual"
 __STATIONMEASUREMENTS = "stationmeasurements"
@@ -90,6 +92,9 @@ __MMRAINMIN = "mmRainMin"
 __WIND = "wind"
 __WINDDIRECTION = "windDirection"
 __DAY = "day"
+# paths of the (only) sections used from the json:
+__STATIONSPATH = (__ACTUAL, __STATIONMEASUREMENTS)
+__FORECASTPATH = (__FORECAST, __FIVEDAYFORECAST)
 
 
 def __to_upper(val):
@@ -128,13 +133,8 @@ def __to_float1(val):
 
 def __to_localdatetime(val):
     """Convert val into a local datetime for tz Europe/Amsterdam."""
-    try:
-        #  "timestamp": "2019-02-03T19:20:00",
-        dt = datetime.strptime(val, __DATE_FORMAT)
-        dt = __PYTZ_TIMEZONE.localize(dt)
-        return dt
-    except (AttributeError, ValueError, TypeError):
-        return None
+    #  "timestamp": "2019-02-03T19:20:00",
+    return to_localdatetime(val, __DATE_FORMAT)
 
 
 def __getBarFC(pressure):
@@ -235,11 +235,50 @@ SENSOR_TYPES = {
 }
 
 
+def __condition_step(name):
+    """Create the step converting the condition of a station record."""
+    def step(loc_data, data):
+        if name not in loc_data:
+            raise KeyError(name)
+        # update weather symbol & status text
+        # test clear-->sunny vs clear-->clear-night
+        # loc_data[__ICONURL] =
+        #   "https://www.buienradar.nl/resources/images/icons/weather/30x30/a.png"
+        # loc_data[__ICONURL] =
+        #   "https://www.buienradar.nl/resources/images/icons/weather/30x30/aa.png"
+        data[CONDITION] = __cond_from_image(loc_data[__ICONURL])
+    return step
+
+
+def __stationname_step(name):
+    """Create the step converting the name of a station record."""
+    def step(loc_data, data):
+        data[STATIONNAME] = __getStationName(loc_data[name],
+                                             loc_data[__STATIONID])
+    return step
+
+
+__CONVERTER = StationConverter(SENSOR_TYPES,
+                               {CONDITION: __condition_step,
+                                STATIONNAME: __stationname_step})
+# the columns of the converted stations (see convert_json_stations):
+__COLUMNS = (LATITUDE, LONGITUDE) + tuple(SENSOR_TYPES)
+
 log = logging.getLogger(__name__)
 
 
-def get_json_data(latitude=52.091579, longitude=5.119734):
-    """Get buienradar json data and return results."""
+def get_json_data(latitude=52.091579, longitude=5.119734, session=None,
+                  conditional=None, cache=None, executor=None):
+    """
+    Get buienradar json data and return results.
+
+    session: optional (shared) requests.Session, see fetch.create_session
+    conditional: optional fetch.ConditionalStore to use conditional requests;
+                 NOT_MODIFIED in the result indicates if the content is
+                 unchanged since the previous request
+    cache: optional cache.FeedCache to share the retrieved data
+    executor: optional executor for the precipitation request (fetch.submit)
+    """
     final_result = {SUCCESS: False,
                     MESSAGE: None,
                     CONTENT: None,
@@ -247,12 +286,18 @@ def get_json_data(latitude=52.091579, longitude=5.119734):
 
     log.debug("Getting buienradar json data for latitude=%s, longitude=%s",
               latitude, longitude)
-    result = __get_ws_data()
+    # load forecasted precipitation (concurrently):
+    rain_future = submit(__get_precipfc_data, latitude, longitude, session,
+                         conditional, cache, executor=executor)
+
+    result = __get_ws_data(session, conditional, cache)
 
     if result[SUCCESS]:
         # store json data:
         final_result[CONTENT] = result[CONTENT]
         final_result[SUCCESS] = True
+        if conditional is not None:
+            final_result[NOT_MODIFIED] = result.get(NOT_MODIFIED, False)
     else:
         if STATUS_CODE in result and MESSAGE in result:
             msg = "Status: %d, Msg: %s" % (result[STATUS_CODE],
@@ -265,9 +310,7 @@ def get_json_data(latitude=52.091579, longitude=5.119734):
         log.warning(msg)
         final_result[MESSAGE] = msg
 
-    # load forecasted precipitation:
-    result = __get_precipfc_data(latitude,
-                                 longitude)
+    result = rain_future.result()
     if result[SUCCESS]:
         final_result[RAINCONTENT] = result[CONTENT]
     else:
@@ -286,7 +329,8 @@ def get_json_data(latitude=52.091579, longitude=5.119734):
 
 
 def parse_json_data(content, raincontent, latitude=52.091579,
-                    longitude=5.119734, timeframe=60):
+                    longitude=5.119734, timeframe=60, series=False,
+                    decoder=None):
     """Parse the raw data and return as data dictionary."""
     result = {SUCCESS: False, MESSAGE: None, DATA: None}
 
@@ -294,134 +338,195 @@ def parse_json_data(content, raincontent, latitude=52.091579,
         raise ValueError("Timeframe must be >=5 and <=120.")
 
     if content is not None:
+        feed = load_json_feed(content, decoder)
+        if not feed[SUCCESS]:
+            result[MESSAGE] = feed[MESSAGE]
+            return result
+
+        result = parse_json_snapshot(feed[DATA], raincontent,
+                                     latitude, longitude, timeframe,
+                                     series=series)
+
+    log.debug("Extracted weather-data: %s", result[DATA])
+    return result
+
+
+def load_json_feed(content, decoder=None):
+    """
+    Parse the raw json feed once into a (reusable) FeedSnapshot.
+
+    decoder: name of the json decoder to use (see jsonstream.get_decoder),
+             like jsonstream.ORJSON; default json.loads
+    """
+    result = {SUCCESS: False, MESSAGE: None, DATA: None}
+
+    decode = get_decoder(decoder)
+    with stage(DECODE, format='json', bytes=len(content)) as details:
         try:
-            json_content = json.loads(content)
-        except json.JSONDecodeError as err:
+            json_content = decode(content, (__STATIONSPATH, __FORECASTPATH))
+        except ValueError as err:
             result[MESSAGE] = "Unable to parse content as json."
             log.error("Unable to parse content as json. %s", err)
+            details.update({SUCCESS: False, MESSAGE: result[MESSAGE]})
             return result
+        details[SUCCESS] = True
+        details[STATIONS] = len(json_content.get(__STATIONSPATH) or ())
+
+    stations = None
+    if __STATIONSPATH in json_content:
+        stations = json_content[__STATIONSPATH]
+        if stations is None:
+            stations = []
+
+    forecast = None
+    if __FORECASTPATH in json_content:
+        forecast = json_content[__FORECASTPATH]
+        if forecast is None:
+            forecast = []
+
+    coordinates = __get_ws_coordinates(stations) if stations else []
+    result[DATA] = FeedSnapshot(stations, forecast, coordinates,
+                                usexml=False)
+    result[SUCCESS] = True
+    return result
 
-        result = __parse_ws_data(json_content, latitude, longitude)
 
-        if result[SUCCESS] and raincontent is not None:
-            data = __parse_precipfc_data(raincontent, timeframe)
-            result[DATA][PRECIPITATION_FORECAST] = data
+def parse_json_snapshot(snapshot, raincontent, latitude=52.091579,
+                        longitude=5.119734, timeframe=60, candidates=None,
+                        series=False):
+    """
+    Parse the data for a single location from a loaded FeedSnapshot.
+
+    candidates: optional positions of the stations to select the nearest
+    weatherstation from (see buienradar.spatial.batch_candidates).
+    series: include the full precipitation forecast (SERIES)
+    """
+    if timeframe < 5 or timeframe > 120:
+        raise ValueError("Timeframe must be >=5 and <=120.")
+
+    result = __parse_ws_data(snapshot, latitude, longitude, candidates)
+
+    if result[SUCCESS] and raincontent is not None:
+        with stage(PARSE_PRECIPITATION, bytes=len(raincontent)):
+            data = __parse_precipfc_data(raincontent, timeframe, series)
+        result[DATA][PRECIPITATION_FORECAST] = data
 
-    log.debug("Extracted weather-data: %s", result[DATA])
     return result
 
 
-def __get_ws_data():
+def __get_ws_data(session=None, conditional=None, cache=None):
     """Get buienradar json data and return results."""
-    return __get_url(JSON_FEED_URL)
+    url = json_feed_url()
+    if cache is not None:
+        return cache.fetch(url, cache.feed_ttl,
+                           __get_ws_data, session, conditional)
+    return __get_url(url, session=session, conditional=conditional)
 
 
-def __get_precipfc_data(latitude, longitude):
+def __get_precipfc_data(latitude, longitude, session=None, conditional=None,
+                        cache=None):
     """Get buienradar forecasted precipitation."""
-    return __get_url(json_precipitation_forecast_url(latitude, longitude))
+    url = json_precipitation_forecast_url(latitude, longitude)
+    if cache is not None:
+        return cache.fetch(url, cache.rain_ttl,
+                           __get_url, url, True, session, conditional)
+    return __get_url(url, session=session, conditional=conditional)
 
 
-def __get_url(url, fetch=True):
-    """Load json data from url and return result."""
-    log.debug("Retrieving  weather data (%s)...", url)
-    result = {SUCCESS: False, MESSAGE: None}
-    try:
-        r = requests.get(url)
-        result[STATUS_CODE] = r.status_code
-        result[HEADERS] = r.headers
-        if fetch:
-            result[CONTENT] = r.text
-        if (200 == r.status_code):
-            result[SUCCESS] = True
-        else:
-            result[MESSAGE] = "Got http statuscode: %d." % (r.status_code)
-        return result
-    except requests.RequestException as ose:
-        result[MESSAGE] = 'Error getting url data. %s' % ose
+def convert_json_stations(snapshot):
+    """
+    Convert all (valid) weather stations of a loaded FeedSnapshot.
+
+    Returns DATA: a dict with a list (column) for LATITUDE, LONGITUDE and
+    each key of SENSOR_TYPES; the values of a station are at the same
+    position in each list. Stations with invalid data (all 0's) are
+    skipped, like parse_data does.
+    """
+    result = {SUCCESS: False, MESSAGE: None, DATA: None}
+
+    if snapshot.stations is None:
+        result[MESSAGE] = 'Unable to extract weatherstation data.'
         log.error(result[MESSAGE])
+        return result
 
+    coordinates = {pos: (lat, lon) for pos, lat, lon in snapshot.coordinates}
+    columns = {key: [] for key in __COLUMNS}
+    appends = [(key, columns[key].append) for key in __COLUMNS]
+    for pos, wstation in enumerate(snapshot.stations):
+        if not wstation or not isinstance(wstation, Mapping):
+            # empty or malformed (not a record):
+            continue
+        data, valid = __convert_station(wstation)
+        if not valid:
+            continue
+        data[LATITUDE], data[LONGITUDE] = coordinates.get(pos, (None, None))
+        for key, append in appends:
+            append(data[key])
+
+    result[DATA] = columns
+    result[SUCCESS] = True
     return result
 
 
-def __parse_ws_data(jsondata, latitude=52.091579, longitude=5.119734):
+def __get_url(url, fetch=True, session=None, conditional=None):
+    """Load json data from url and return result."""
+    log.debug("Retrieving  weather data (%s)...", url)
+    return get_url(url, session, fetch, conditional)
+
+
+def __parse_ws_data(snapshot, latitude=52.091579, longitude=5.119734,
+                    candidates=None):
     """Parse the buienradar json and rain data."""
     log.debug("Parse ws data: latitude: %s, longitude: %s",
               latitude, longitude)
     result = {SUCCESS: False, MESSAGE: None, DATA: None}
 
     # select the nearest weather station
-    loc_data = __select_nearest_ws(jsondata, latitude, longitude)
+    with stage(SELECT, stations=len(snapshot.stations or ())):
+        loc_data = __select_nearest_ws(snapshot, latitude, longitude,
+                                       candidates)
     # process current weather data from selected weatherstation
     if not loc_data:
         result[MESSAGE] = 'No location selected.'
         return result
 
-    if not __is_valid(loc_data):
+    with stage(CONVERT):
+        data, valid = __convert_station(loc_data)
+    if not valid:
         result[MESSAGE] = 'Location data is invalid.'
         return result
 
     # add distance to weatherstation
     log.debug("Raw location data: %s", loc_data)
     result[DISTANCE] = __get_ws_distance(loc_data, latitude, longitude)
-    result = __parse_loc_data(loc_data, result)
+    result[DATA] = data
+    result[SUCCESS] = True
 
     # extract weather forecast
-    try:
-        fc_data = jsondata[__FORECAST][__FIVEDAYFORECAST]
-    except (json.JSONDecodeError, KeyError):
+    fc_data = snapshot.forecast
+    if fc_data is None:
         result[MESSAGE] = 'Unable to extract forecast data.'
-        log.exception(result[MESSAGE])
+        log.error(result[MESSAGE])
         return result
 
     if fc_data:
         # result = __parse_fc_data(fc_data, result)
         log.debug("Raw forecast data: %s", fc_data)
         # pylint: disable=unsupported-assignment-operation
-        result[DATA][FORECAST] = __parse_fc_data(fc_data)
+        with stage(CONVERT_FORECAST):
+            result[DATA][FORECAST] = __parse_fc_data(fc_data)
 
     return result
 
 
-def __parse_loc_data(loc_data, result):
-    """Parse the json data from selected weatherstation."""
-    result[DATA] = {ATTRIBUTION: ATTRIBUTION_INFO,
-                    FORECAST: [],
-                    PRECIPITATION_FORECAST: None}
+def __convert_station(loc_data):
+    """
+    Convert a station record in a single pass.
 
-    for key, [value, func] in SENSOR_TYPES.items():
-        result[DATA][key] = None
-        try:
-            sens_data = loc_data[value]
-            if key == CONDITION:
-                # update weather symbol & status text
-                # desc = loc_data[__WEATHERDESCRIPTION]
-                # result[DATA][CONDITION] = __cond_from_desc(desc)
-                #
-                # test clear-->sunny vs clear-->clear-night
-                # loc_data[__ICONURL] =
-                #   "https://www.buienradar.nl/resources/images/icons/weather/30x30/a.png"
-                # loc_data[__ICONURL] =
-                #   "https://www.buienradar.nl/resources/images/icons/weather/30x30/aa.png"
-                result[DATA][CONDITION] = __cond_from_image(
-                    loc_data[__ICONURL])
-                if result[DATA][CONDITION]:
-                    result[DATA][CONDITION][IMAGE] = loc_data[__ICONURL]
-
-                continue
-            if key == STATIONNAME:
-                result[DATA][key] = __getStationName(loc_data[__STATIONNAME],
-                                                     loc_data[__STATIONID])
-                continue
-            # update all other data:
-            if func is not None:
-                result[DATA][key] = func(sens_data)
-            else:
-                result[DATA][key] = sens_data
-        except KeyError:
-            log.debug("Data element with key='%s' "
-                      "not loaded from br data!", key)
-    result[SUCCESS] = True
-    return result
+    Returns the converted data and whether the record is valid.
+    """
+    data, _missing = __CONVERTER.convert(loc_data)
+    return data, __is_valid(loc_data, data)
 
 
 def __parse_fc_data(fc_data):
@@ -434,10 +539,12 @@ def __parse_fc_data(fc_data):
             #        day,
             #        __WEATHERDESCRIPTION)
             # ),
+            # fc never is about nighttime:
             CONDITION: __cond_from_image(
                 __get_str(
                     day,
-                    __ICONURL)
+                    __ICONURL),
+                nighttime=False
             ),
             TEMPERATURE: __get_avr_float(day, __MAXTEMPERATUREMIN,
                                          __MAXTEMPERATUREMAX),
@@ -459,10 +566,6 @@ def __parse_fc_data(fc_data):
             WINDAZIMUTH: __get_windazimuth(__get_str(day, __WINDDIRECTION)),
             DATETIME: __to_localdatetime(__get_str(day, __DAY)),
         }
-        # fc never is about nighttime:
-        fcdata[CONDITION][NIGHTTIME] = False
-        fcdata[CONDITION][IMAGE] = day[__ICONURL]
-
         fc.append(fcdata)
     return fc
 
@@ -539,57 +642,17 @@ def __get_int(section, name):
         return 0
 
 
-def __parse_precipfc_data(data, timeframe):
+def __parse_precipfc_data(data, timeframe, series=False):
     """Parse the forecasted precipitation data."""
-    result = {AVERAGE: None, TOTAL: None, TIMEFRAME: None}
-
-    log.debug("Precipitation data: %s", data)
-    lines = data.splitlines()
-    index = 1
-    totalrain = 0
-    numberoflines = 0
-    nrlines = min(len(lines), round(float(timeframe) / 5) + 1)
-    # looping through lines of forecasted precipitation data and
-    # not using the time data (HH:MM) int the data. This is to allow for
-    # correct data in case we are running in a different timezone.
-    while index < nrlines:
-        line = lines[index]
-        log.debug("__parse_precipfc_data: line: %s", line)
-        # pylint: disable=unused-variable
-        (val, key) = line.split("|")
-        # See buienradar documentation for this api, attribution
-        # https://www.buienradar.nl/overbuienradar/gratis-weerdata
-        #
-        # Op basis van de door u gewenste coordinaten (latitude en longitude)
-        # kunt u de neerslag tot twee uur vooruit ophalen in tekstvorm. De
-        # data wordt iedere 5 minuten geupdatet. Op deze pagina kunt u de
-        # neerslag in tekst vinden. De waarde 0 geeft geen neerslag aan (droog)
-        # de waarde 255 geeft zware neerslag aan. Gebruik de volgende formule
-        # voor het omrekenen naar de neerslagintensiteit in de eenheid
-        # millimeter per uur (mm/u):
-        #
-        # Neerslagintensiteit = 10^((waarde-109)/32)
-        #
-        # Ter controle: een waarde van 77 is gelijk aan een neerslagintensiteit
-        # van 0,1 mm/u.
-        val = float(val.replace(',', '.'))
-        mmu = 10**((val - 109) / 32)
-        totalrain = totalrain + float(mmu)
-        numberoflines = numberoflines + 1
-        index += 1
-
-    if numberoflines > 0:
-        result[AVERAGE] = round((totalrain / numberoflines), 2)
-    else:
-        result[AVERAGE] = 0
-    result[TOTAL] = round(totalrain / 12, 2)
-    result[TIMEFRAME] = timeframe
+    return parse_precipitation(data, timeframe, series)
 
-    return result
 
+def __cond_from_image(img, nighttime=None):
+    """
+    Get the condition (including the image url) from the image url.
 
-def __cond_from_image(img):
-    """Get the condition from the image url."""
+    nighttime: use instead of the nighttime derived from the image url
+    """
     # the image url should be something like:
     # - http://somehost/somefolder/cc.png (night time)
     # - http://somehost/somefolder/CC.png
@@ -605,18 +668,12 @@ def __cond_from_image(img):
     night = False
     if image[-6:-5] == code:
         night = True
-    if code in __BRCONDITIONS:
-        return {CONDCODE: code,
-                CONDITION: __BRCONDITIONS[code][0],
-                DETAILED: __BRCONDITIONS[code][1],
-                EXACT: __BRCONDITIONS[code][2],
-                EXACTNL: __BRCONDITIONS[code][3],
-                NIGHTTIME: night
-                }
-    return None
-
-
-def __select_nearest_ws(jsondata, latitude, longitude):
+    if nighttime is not None:
+        night = nighttime
+    return with_image(code, img, night)
+
+
+def __select_nearest_ws(snapshot, latitude, longitude, candidates=None):
     """Select the nearest weatherstation."""
     log.debug("__select_nearest_ws: latitude: %s, longitude: %s",
               latitude, longitude)
@@ -624,16 +681,21 @@ def __select_nearest_ws(jsondata, latitude, longitude):
     dist2 = 0
     loc_data = None
 
-    try:
-        ws_json = jsondata[__ACTUAL]
-        ws_json = ws_json[__STATIONMEASUREMENTS]
-    except (KeyError, TypeError):
+    ws_json = snapshot.stations
+    if ws_json is None:
         log.warning("Missing section in Buienradar jsondata (%s)."
                     "Can happen 00:00-01:00 CE(S)T",
                     __STATIONMEASUREMENTS)
         return None
 
-    for wstation in ws_json:
+    # only calculate the exact distance for the candidates from the index:
+    if candidates is None:
+        if snapshot.index is None:
+            snapshot.index = build_index(snapshot.coordinates)
+        candidates = nearest_candidates(snapshot.index, latitude, longitude)
+    candidates = [ws_json[pos] for pos in candidates]
+
+    for wstation in candidates:
         dist2 = __get_ws_distance(wstation, latitude, longitude)
 
         if dist2 is not None:
@@ -641,6 +703,16 @@ def __select_nearest_ws(jsondata, latitude, longitude):
                 dist = dist2
                 loc_data = wstation
 
+    if loc_data is None and candidates:
+        # no (converging) distance for the candidates, check all stations:
+        for wstation in ws_json:
+            dist2 = __get_ws_distance(wstation, latitude, longitude)
+
+            if dist2 is not None:
+                if ((loc_data is None) or (dist2 < dist)):
+                    dist = dist2
+                    loc_data = wstation
+
     if loc_data is None:
         log.warning("No weatherstation selected; aborting...")
         return None
@@ -682,18 +754,14 @@ def __get_ws_distance(wstation, latitude, longitude):
         return None
 
 
-def __is_valid(loc_data):
+def __is_valid(loc_data, data):
     """Determine if this can be valid data (not all 0's)."""
-    # return True
-    for key, [value, func] in SENSOR_TYPES.items():
-        if (key != CONDITION and key != STATIONNAME and key != MEASURED):
-            if (func is not None):
-                sens_data = loc_data.get(value)
-                if (sens_data is not None and                        # noqa ignore W504
-                        func(sens_data) is not None and                  # noqa ignore W504
-                        func(sens_data) != 0 and                         # noqa ignore W504
-                        func(sens_data) != ""):
-                    return True
+    for key, name in __CONVERTER.valid_fields:
+        value = data[key]
+        if (value is not None and value != 0 and value != "" and  # noqa ignore W504
+                loc_data.get(name) is not None):
+            return True
+    return False
 
 
 def __getStationName(name, id):
@@ -702,3 +770,17 @@ def __getStationName(name, id):
     name = name.strip()
     name += " (%s)" % id
     return name
+
+
+def __get_ws_coordinates(wstations):
+    """Get (position, latitude, longitude) of all weatherstations."""
+    coordinates = []
+    for pos, wstation in enumerate(wstations):
+        try:
+            coordinates.append((pos,
+                                float(wstation[__LAT]),
+                                float(wstation[__LON])))
+        except (ValueError, TypeError, KeyError):
+            # value does not exist, or is not a float
+            continue
+    return coordinates
@@ -1,16 +1,12 @@
 """Buienradar library to get parsed weather data from buienradar.nl."""
 import logging
+from collections.abc import Mapping
 from datetime import datetime, timedelta
 
-import pytz
-import requests
-import xmltodict
 from vincenty import vincenty
 
+from buienradar.conditions import with_image
 from buienradar.constants import (
-    ATTRIBUTION,
-    ATTRIBUTION_INFO,
-    AVERAGE,
     CONDITION,
     CONTENT,
     DATA,
@@ -18,14 +14,15 @@ from buienradar.constants import (
     DISTANCE,
     FORECAST,
     GROUNDTEMP,
-    HEADERS,
     HUMIDITY,
-    IMAGE,
     IRRADIANCE,
+    LATITUDE,
+    LONGITUDE,
     MAX_TEMP,
     MEASURED,
     MESSAGE,
     MIN_TEMP,
+    NOT_MODIFIED,
     PRECIPITATION,
     PRECIPITATION_FORECAST,
     PRESSURE,
@@ -38,8 +35,6 @@ from buienradar.constants import (
     SUCCESS,
     SUN_CHANCE,
     TEMPERATURE,
-    TIMEFRAME,
-    TOTAL,
     VISIBILITY,
     WINDAZIMUTH,
     WINDDIRECTION,
@@ -47,11 +42,29 @@ from buienradar.constants import (
     WINDGUST,
     WINDSPEED
 )
+from buienradar.fetch import get_url, submit
+from buienradar.instrument import (
+    CONVERT,
+    CONVERT_FORECAST,
+    DECODE,
+    FALLBACK,
+    PARSE_PRECIPITATION,
+    SELECT,
+    STATIONS,
+    record,
+    stage
+)
+from buienradar.precipitation import parse_precipitation
+from buienradar.snapshot import FeedSnapshot
+from buienradar.spatial import build_index, nearest_candidates
+from buienradar.stations import StationConverter
+from buienradar.timestamps import timezone, to_localdatetime
 from buienradar.urls import (
-    XML_FEED_URL,
-    XML_SECONDARY_FEED_URL,
-    xml_precipitation_forecast_url
+    xml_feed_url,
+    xml_precipitation_forecast_url,
+    xml_secondary_feed_url
 )
+from buienradar.xmlstream import ExpatError, extract
 
 # key names in buienradar xml:
 __BRROOT = 'buienradarnl'
@@ -77,11 +90,13 @@ __BRKANSREGEN = 'kansregen'
 __BRMAXMMREGEN = 'maxmmregen'
 __BRMINMMREGEN = 'minmmregen'
 __BRWINDKRACHT = 'windkracht'
+# paths of the (only) elements extracted from the xml:
+__BRSTATIONSPATH = (__BRROOT, __BRWEERGEGEVENS, __BRACTUEELWEER,
+                    __BRWEERSTATIONS, __BRWEERSTATION)
+__BRFORECASTPATH = (__BRROOT, __BRWEERGEGEVENS, __BRVERWACHTING)
 
 # buienradat date format: '07/26/2017 15:50:00'
 __DATE_FORMAT = '%m/%d/%Y %H:%M:%S'
-__TIMEZONE = 'Europe/Amsterdam'
-__PYTZ_TIMEZONE = pytz.timezone(__TIMEZONE)
 
 
 def __to_int(val):
@@ -112,12 +127,7 @@ def __to_float1(val):
 
 def __to_localdatetime(val):
     """Convert val into a local datetime for tz Europe/Amsterdam."""
-    try:
-        dt = datetime.strptime(val, __DATE_FORMAT)
-        dt = __PYTZ_TIMEZONE.localize(dt)
-        return dt
-    except (ValueError, TypeError):
-        return None
+    return to_localdatetime(val, __DATE_FORMAT)
 
 
 # Sensor types are defined like so:
@@ -141,22 +151,64 @@ SENSOR_TYPES = {
 }
 
 
+def __condition_step(name):
+    """Create the step converting the condition of a station record."""
+    def step(loc_data, data):
+        sens_data = loc_data[name]
+        # update weather symbol & status text
+        code = sens_data[__BRID][:1].lower()
+        data[CONDITION] = with_image(code, sens_data[__BRTEXT])
+    return step
+
+
+def __stationname_step(name):
+    """Create the step converting the name of a station record."""
+    def step(loc_data, data):
+        stationname = loc_data[name][__BRTEXT].replace("Meetstation", "")
+        stationname = stationname.strip()
+        stationname += " (%s)" % loc_data[__BRSTATIONCODE]
+        data[STATIONNAME] = stationname
+    return step
+
+
+__CONVERTER = StationConverter(SENSOR_TYPES,
+                               {CONDITION: __condition_step,
+                                STATIONNAME: __stationname_step})
+# the columns of the converted stations (see convert_xml_stations):
+__COLUMNS = (LATITUDE, LONGITUDE) + tuple(SENSOR_TYPES)
+
 log = logging.getLogger(__name__)
 
 
-def get_xml_data(latitude=52.091579, longitude=5.119734):
-    """Get buienradar xml data and return results."""
+def get_xml_data(latitude=52.091579, longitude=5.119734, session=None,
+                 conditional=None, cache=None, executor=None):
+    """
+    Get buienradar xml data and return results.
+
+    session: optional (shared) requests.Session, see fetch.create_session
+    conditional: optional fetch.ConditionalStore to use conditional requests;
+                 NOT_MODIFIED in the result indicates if the content is
+                 unchanged since the previous request
+    cache: optional cache.FeedCache to share the retrieved data
+    executor: optional executor for the precipitation request (fetch.submit)
+    """
     final_result = {SUCCESS: False, MESSAGE: None,
                     CONTENT: None, RAINCONTENT: None}
 
     log.debug("Getting buienradar data for latitude=%s, longitude=%s",
               latitude, longitude)
-    result = __get_ws_data()
+    # load forecasted precipitation (concurrently):
+    rain_future = submit(__get_precipfc_data, latitude, longitude, session,
+                         conditional, cache, executor=executor)
+
+    result = __get_ws_data(session, conditional, cache)
 
     if result[SUCCESS]:
         # store xml data:
         final_result[CONTENT] = result[CONTENT]
         final_result[SUCCESS] = True
+        if conditional is not None:
+            final_result[NOT_MODIFIED] = result.get(NOT_MODIFIED, False)
     else:
         if STATUS_CODE in result and MESSAGE in result:
             msg = "Status: %d, Msg: %s" % (result[STATUS_CODE],
@@ -169,9 +221,7 @@ def get_xml_data(latitude=52.091579, longitude=5.119734):
         log.warning(msg)
         final_result[MESSAGE] = msg
 
-    # load forecasted precipitation:
-    result = __get_precipfc_data(latitude,
-                                 longitude)
+    result = rain_future.result()
     if result[SUCCESS]:
         final_result[RAINCONTENT] = result[CONTENT]
     else:
@@ -190,7 +240,7 @@ def get_xml_data(latitude=52.091579, longitude=5.119734):
 
 
 def parse_xml_data(content, raincontent, latitude=52.091579,
-                   longitude=5.119734, timeframe=60):
+                   longitude=5.119734, timeframe=60, series=False):
     """Parse the raw data and return as data dictionary."""
     result = {SUCCESS: False, MESSAGE: None, DATA: None}
 
@@ -198,209 +248,235 @@ def parse_xml_data(content, raincontent, latitude=52.091579,
         raise ValueError("Timeframe must be >=5 and <=120.")
 
     if content is not None:
-        result = __parse_ws_data(content, latitude, longitude)
+        feed = load_xml_feed(content)
+        if not feed[SUCCESS]:
+            result[MESSAGE] = feed[MESSAGE]
+            return result
 
-        if result[SUCCESS] and raincontent is not None:
-            data = __parse_precipfc_data(raincontent, timeframe)
-            result[DATA][PRECIPITATION_FORECAST] = data
+        result = parse_xml_snapshot(feed[DATA], raincontent,
+                                    latitude, longitude, timeframe,
+                                    series=series)
 
     log.debug("Extracted weather-data: %s", result[DATA])
     return result
 
 
-def __get_url(url):
-    """Load data from url and return result."""
-    log.debug("Retrieving xml weather data (%s)...", url)
-    result = {SUCCESS: False, MESSAGE: None}
-    try:
-        r = requests.get(url)
-        result[STATUS_CODE] = r.status_code
-        result[HEADERS] = r.headers
-        result[CONTENT] = r.text
-        if (200 == r.status_code):
-            result[SUCCESS] = True
-        else:
-            result[MESSAGE] = "Got http statuscode: %d." % (r.status_code)
-        return result
-    except requests.RequestException as ose:
-        result[MESSAGE] = 'Error getting url data. %s' % ose
+def load_xml_feed(content):
+    """Parse the raw xml feed once into a (reusable) FeedSnapshot."""
+    result = {SUCCESS: False, MESSAGE: None, DATA: None}
+
+    # extract (only) the weather stations and forecast from the xml:
+    with stage(DECODE, format='xml', bytes=len(content)) as details:
+        try:
+            xmldata = extract(content, __BRROOT,
+                              (__BRSTATIONSPATH, __BRFORECASTPATH))
+        except (ExpatError, ValueError):
+            result[MESSAGE] = "Unable to parse content as xml."
+            log.exception(result[MESSAGE])
+            details.update({SUCCESS: False, MESSAGE: result[MESSAGE]})
+            return result
+        if xmldata is None:
+            result[MESSAGE] = "Unable to parse content as xml."
+            log.error("%s Missing root element: %s", result[MESSAGE],
+                      __BRROOT)
+            details.update({SUCCESS: False, MESSAGE: result[MESSAGE]})
+            return result
+
+        stations = None
+        if __BRSTATIONSPATH in xmldata:
+            stations = xmldata[__BRSTATIONSPATH] or []
+            if isinstance(stations, dict):
+                # a single weatherstation is extracted as a dict:
+                stations = [stations]
+        details[SUCCESS] = True
+        details[STATIONS] = len(stations or ())
+
+    forecast = None
+    if __BRFORECASTPATH in xmldata:
+        forecast = xmldata[__BRFORECASTPATH] or {}
+
+    coordinates = __get_ws_coordinates(stations) if stations else []
+    result[DATA] = FeedSnapshot(stations, forecast, coordinates,
+                                usexml=True)
+    result[SUCCESS] = True
+    return result
+
+
+def parse_xml_snapshot(snapshot, raincontent, latitude=52.091579,
+                       longitude=5.119734, timeframe=60, candidates=None,
+                       series=False):
+    """
+    Parse the data for a single location from a loaded FeedSnapshot.
+
+    candidates: optional positions of the stations to select the nearest
+    weatherstation from (see buienradar.spatial.batch_candidates).
+    series: include the full precipitation forecast (SERIES)
+    """
+    if timeframe < 5 or timeframe > 120:
+        raise ValueError("Timeframe must be >=5 and <=120.")
+
+    result = __parse_ws_data(snapshot, latitude, longitude, candidates)
+
+    if result[SUCCESS] and raincontent is not None:
+        with stage(PARSE_PRECIPITATION, bytes=len(raincontent)):
+            data = __parse_precipfc_data(raincontent, timeframe, series)
+        result[DATA][PRECIPITATION_FORECAST] = data
+
+    return result
+
+
+def convert_xml_stations(snapshot):
+    """
+    Convert all (valid) weather stations of a loaded FeedSnapshot.
+
+    Returns DATA: a dict with a list (column) for LATITUDE, LONGITUDE and
+    each key of SENSOR_TYPES; the values of a station are at the same
+    position in each list. Stations with invalid data (all 0's) are
+    skipped, like parse_data does.
+    """
+    result = {SUCCESS: False, MESSAGE: None, DATA: None}
+
+    if snapshot.stations is None:
+        result[MESSAGE] = 'Unable to extract weatherstation data.'
         log.error(result[MESSAGE])
+        return result
 
+    coordinates = {pos: (lat, lon) for pos, lat, lon in snapshot.coordinates}
+    columns = {key: [] for key in __COLUMNS}
+    appends = [(key, columns[key].append) for key in __COLUMNS]
+    for pos, wstation in enumerate(snapshot.stations):
+        if not wstation or not isinstance(wstation, Mapping):
+            # empty or malformed (not a record):
+            continue
+        data, valid, _missing = __convert_station(wstation)
+        if not valid:
+            continue
+        data[LATITUDE], data[LONGITUDE] = coordinates.get(pos, (None, None))
+        for key, append in appends:
+            append(data[key])
+
+    result[DATA] = columns
+    result[SUCCESS] = True
     return result
 
 
-def __get_ws_data():
+def __get_url(url, session=None, conditional=None):
+    """Load data from url and return result."""
+    log.debug("Retrieving xml weather data (%s)...", url)
+    return get_url(url, session, conditional=conditional)
+
+
+def __get_ws_data(session=None, conditional=None, cache=None):
     """Get buienradar xml data and return results."""
-    result = __get_url(XML_FEED_URL)
+    url = xml_feed_url()
+    if cache is not None:
+        return cache.fetch(url, cache.feed_ttl,
+                           __get_ws_data, session, conditional)
+
+    result = __get_url(url, session, conditional)
     if result[SUCCESS]:
         return result
 
     # try secondary url:
-    result = __get_url(XML_SECONDARY_FEED_URL)
+    url = xml_secondary_feed_url()
+    record(FALLBACK, url=url)
+    result = __get_url(url, session, conditional)
 
     return result
 
 
-def __get_precipfc_data(latitude, longitude):
+def __get_precipfc_data(latitude, longitude, session=None, conditional=None,
+                        cache=None):
     """Get buienradar forecasted precipitation."""
-    result = __get_url(xml_precipitation_forecast_url(latitude, longitude))
+    url = xml_precipitation_forecast_url(latitude, longitude)
+    if cache is not None:
+        return cache.fetch(url, cache.rain_ttl,
+                           __get_url, url, session, conditional)
+    result = __get_url(url, session, conditional)
     return result
 
 
-def __parse_ws_data(content, latitude=52.091579, longitude=5.119734):
+def __parse_ws_data(snapshot, latitude=52.091579, longitude=5.119734,
+                    candidates=None):
     """Parse the buienradar xml and rain data."""
     log.debug("Parse ws data: latitude: %s, longitude: %s",
               latitude, longitude)
     result = {SUCCESS: False, MESSAGE: None, DATA: None}
 
-    # convert the xml data into a dictionary:
-    try:
-        xmldata = xmltodict.parse(content)[__BRROOT]
-    except (xmltodict.expat.ExpatError, KeyError):
-        result[MESSAGE] = "Unable to parse content as xml."
-        log.exception(result[MESSAGE])
-        return result
-
     # select the nearest weather station
-    loc_data = __select_nearest_ws(xmldata, latitude, longitude)
+    with stage(SELECT, stations=len(snapshot.stations or ())):
+        loc_data = __select_nearest_ws(snapshot, latitude, longitude,
+                                       candidates)
     # process current weather data from selected weatherstation
     if not loc_data:
         result[MESSAGE] = 'No location selected.'
         return result
 
-    if not __is_valid(loc_data):
+    with stage(CONVERT):
+        data, valid, missing = __convert_station(loc_data)
+    if not valid:
         result[MESSAGE] = 'Location data is invalid.'
         return result
 
     # add distance to weatherstation
     log.debug("Raw location data: %s", loc_data)
     result[DISTANCE] = __get_ws_distance(loc_data, latitude, longitude)
-    result = __parse_loc_data(loc_data, result)
+    result[DATA] = data
+    if missing:
+        result[MESSAGE] = "Missing key(s) in br data: "
+        result[MESSAGE] += "".join("%s " % name for name in missing)
+    result[SUCCESS] = True
 
     # extract weather forecast
-    try:
-        fc_data = xmldata[__BRWEERGEGEVENS][__BRVERWACHTING]
-    except (xmltodict.expat.ExpatError, KeyError):
+    fc_data = snapshot.forecast
+    if fc_data is None:
         result[MESSAGE] = 'Unable to extract forecast data.'
-        log.exception(result[MESSAGE])
+        log.error(result[MESSAGE])
         return result
 
     if fc_data:
         # result = __parse_fc_data(fc_data, result)
         log.debug("Raw forecast data: %s", fc_data)
         # pylint: disable=unsupported-assignment-operation
-        result[DATA][FORECAST] = __parse_fc_data(fc_data)
+        with stage(CONVERT_FORECAST):
+            result[DATA][FORECAST] = __parse_fc_data(fc_data)
 
     return result
 
 
-def __parse_precipfc_data(data, timeframe):
+def __parse_precipfc_data(data, timeframe, series=False):
     """Parse the forecasted precipitation data."""
-    result = {AVERAGE: None, TOTAL: None, TIMEFRAME: None}
-
-    log.debug("Precipitation data: %s", data)
-    lines = data.splitlines()
-    index = 1
-    totalrain = 0
-    numberoflines = 0
-    nrlines = min(len(lines), round(float(timeframe) / 5) + 1)
-    # looping through lines of forecasted precipitation data and
-    # not using the time data (HH:MM) int the data. This is to allow for
-    # correct data in case we are running in a different timezone.
-    while index < nrlines:
-        line = lines[index]
-        log.debug("__parse_precipfc_data: line: %s", line)
-        # pylint: disable=unused-variable
-        (val, key) = line.split("|")
-        # See buienradar documentation for this api, attribution
-        # https://www.buienradar.nl/overbuienradar/gratis-weerdata
-        #
-        # Op basis van de door u gewenste coordinaten (latitude en longitude)
-        # kunt u de neerslag tot twee uur vooruit ophalen in tekstvorm. De
-        # data wordt iedere 5 minuten geupdatet. Op deze pagina kunt u de
-        # neerslag in tekst vinden. De waarde 0 geeft geen neerslag aan (droog)
-        # de waarde 255 geeft zware neerslag aan. Gebruik de volgende formule
-        # voor het omrekenen naar de neerslagintensiteit in de eenheid
-        # millimeter per uur (mm/u):
-        #
-        # Neerslagintensiteit = 10^((waarde-109)/32)
-        #
-        # Ter controle: een waarde van 77 is gelijk aan een neerslagintensiteit
-        # van 0,1 mm/u.
-        val = float(val.replace(',', '.'))
-        mmu = 10 ** ((val - 109) / 32)
-        totalrain = totalrain + float(mmu)
-        numberoflines = numberoflines + 1
-        index += 1
-
-    if numberoflines > 0:
-        result[AVERAGE] = round((totalrain / numberoflines), 2)
-    else:
-        result[AVERAGE] = 0
-    result[TOTAL] = round(totalrain / 12, 2)
-    result[TIMEFRAME] = timeframe
-
-    return result
+    return parse_precipitation(data, timeframe, series)
 
 
-def __is_valid(loc_data):
+def __is_valid(loc_data, data):
     """Determine if this can be valid data (not all 0's)."""
-    for key, [value, func] in SENSOR_TYPES.items():
-        if (key != CONDITION and key != STATIONNAME and key != MEASURED):
-            if (func is not None):
-                sens_data = loc_data.get(value)
-                if func(sens_data) != 0:
-                    return True
-
-
-def __parse_loc_data(loc_data, result):
-    """Parse the xml data from selected weatherstation."""
-    result[DATA] = {ATTRIBUTION: ATTRIBUTION_INFO,
-                    FORECAST: [],
-                    PRECIPITATION_FORECAST: None}
-
-    for key, [value, func] in SENSOR_TYPES.items():
-        result[DATA][key] = None
-        try:
-            from buienradar.buienradar import condition_from_code
-            sens_data = loc_data[value]
-            if key == CONDITION:
-                # update weather symbol & status text
-                code = sens_data[__BRID][:1].lower()
-                result[DATA][CONDITION] = condition_from_code(code)
-                if result[DATA][CONDITION]:
-                    result[DATA][CONDITION][IMAGE] = sens_data[__BRTEXT]
-            else:
-                if key == STATIONNAME:
-                    name = sens_data[__BRTEXT].replace("Meetstation", "")
-                    name = name.strip()
-                    name += " (%s)" % loc_data[__BRSTATIONCODE]
-                    result[DATA][key] = name
-                else:
-                    # update all other data
-                    if func is not None:
-                        result[DATA][key] = func(sens_data)
-                    else:
-                        result[DATA][key] = sens_data
-        except KeyError:
-            if result[MESSAGE] is None:
-                result[MESSAGE] = "Missing key(s) in br data: "
-            result[MESSAGE] += "%s " % value
-            log.debug("Data element with key='%s' not loaded from br data!",
-                      key)
-    result[SUCCESS] = True
-    return result
+    for key, name in __CONVERTER.valid_fields:
+        # a missing field converts to 0:
+        if name in loc_data and data[key] != 0:
+            return True
+    return False
+
+
+def __convert_station(loc_data):
+    """
+    Convert a station record in a single pass.
+
+    Returns the converted data, whether the record is valid and the names
+    of the missing fields.
+    """
+    data, missing = __CONVERTER.convert(loc_data)
+    return data, __is_valid(loc_data, data), missing
 
 
 def __parse_fc_data(fc_data):
     """Parse the forecast data from the xml section."""
-    from buienradar.buienradar import condition_from_code
     fc = []
     for daycnt in range(1, 6):
         daysection = __BRDAYFC % daycnt
         if daysection in fc_data:
             tmpsect = fc_data[daysection]
-            fcdatetime = datetime.now(__PYTZ_TIMEZONE)
+            fcdatetime = datetime.now(timezone())
             fcdatetime = fcdatetime.replace(hour=12,
                                             minute=0,
                                             second=0,
@@ -408,8 +484,9 @@ def __parse_fc_data(fc_data):
             # add daycnt days
             fcdatetime = fcdatetime + timedelta(days=daycnt)
             code = tmpsect.get(__BRICOON, []).get(__BRID).lower()
+            image = tmpsect.get(__BRICOON, []).get(__BRTEXT)
             fcdata = {
-                CONDITION: condition_from_code(code),
+                CONDITION: with_image(code, image),
                 TEMPERATURE: __get_float(tmpsect, __BRMAXTEMP),
                 MIN_TEMP: __get_float(tmpsect, __BRMINTEMP),
                 MAX_TEMP: __get_float(tmpsect, __BRMAXTEMP),
@@ -420,8 +497,6 @@ def __parse_fc_data(fc_data):
                 WINDFORCE: __get_int(tmpsect, __BRWINDKRACHT),
                 DATETIME: fcdatetime,
             }
-            fcdata[CONDITION][IMAGE] = tmpsect.get(__BRICOON, []).get(__BRTEXT)
-
             fc.append(fcdata)
     return fc
 
@@ -467,7 +542,7 @@ def __get_ws_distance(wstation, latitude, longitude):
         return None
 
 
-def __select_nearest_ws(xmldata, latitude, longitude):
+def __select_nearest_ws(snapshot, latitude, longitude, candidates=None):
     """Select the nearest weatherstation."""
     log.debug("__select_nearest_ws: latitude: %s, longitude: %s",
               latitude, longitude)
@@ -475,16 +550,21 @@ def __select_nearest_ws(xmldata, latitude, longitude):
     dist2 = 0
     loc_data = None
 
-    try:
-        ws_xml = xmldata[__BRWEERGEGEVENS][__BRACTUEELWEER]
-        ws_xml = ws_xml[__BRWEERSTATIONS][__BRWEERSTATION]
-    except (KeyError, TypeError):
+    ws_xml = snapshot.stations
+    if ws_xml is None:
         log.warning("Missing section in Buienradar xmldata (%s)."
                     "Can happen 00:00-01:00 CE(S)T",
                     __BRWEERSTATION)
         return None
 
-    for wstation in ws_xml:
+    # only calculate the exact distance for the candidates from the index:
+    if candidates is None:
+        if snapshot.index is None:
+            snapshot.index = build_index(snapshot.coordinates)
+        candidates = nearest_candidates(snapshot.index, latitude, longitude)
+    candidates = [ws_xml[pos] for pos in candidates]
+
+    for wstation in candidates:
         dist2 = __get_ws_distance(wstation, latitude, longitude)
 
         if dist2 is not None:
@@ -492,6 +572,16 @@ def __select_nearest_ws(xmldata, latitude, longitude):
                 dist = dist2
                 loc_data = wstation
 
+    if loc_data is None and candidates:
+        # no (converging) distance for the candidates, check all stations:
+        for wstation in ws_xml:
+            dist2 = __get_ws_distance(wstation, latitude, longitude)
+
+            if dist2 is not None:
+                if ((loc_data is None) or (dist2 < dist)):
+                    dist = dist2
+                    loc_data = wstation
+
     if loc_data is None:
         log.warning("No weatherstation selected; aborting...")
         return None
@@ -506,3 +596,17 @@ def __select_nearest_ws(xmldata, latitude, longitude):
         except KeyError:
             log.debug("Selected weatherstation")
         return loc_data
+
+
+def __get_ws_coordinates(wstations):
+    """Get (position, latitude, longitude) of all weatherstations."""
+    coordinates = []
+    for pos, wstation in enumerate(wstations):
+        try:
+            coordinates.append((pos,
+                                float(wstation[__BRLAT]),
+                                float(wstation[__BRLON])))
+        except (ValueError, TypeError, KeyError):
+            # value does not exist, or is not a float
+            continue
+    return coordinates
@@ -0,0 +1,167 @@
+"""In-process cache for the weather feed and precipitation data."""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+
+from buienradar.constants import HEADERS, SUCCESS
+from buienradar.instrument import CACHE, COALESCED, HIT, MISS, record
+
+# the feed is updated about every 10 minutes, rain data every 5 minutes:
+FEED_TTL = 600
+RAIN_TTL = 300
+# never cache shorter than (avoid hammering when the data is not updated):
+MIN_TTL = 30
+
+log = logging.getLogger(__name__)
+
+
+def expires_at(result, ttl, now, min_ttl=MIN_TTL):
+    """
+    Determine when a retrieved result expires.
+
+    When the response has a Last-Modified header, the result expires ttl
+    seconds after the data was last modified (but not before min_ttl);
+    otherwise ttl seconds after now.
+    """
+    try:
+        modified = parsedate_to_datetime(result[HEADERS]['Last-Modified'])
+        expires = modified.timestamp() + ttl
+    except (KeyError, TypeError, ValueError, IndexError, AttributeError):
+        return now + ttl
+    return min(max(expires, now + min_ttl), now + ttl)
+
+
+class FeedCache:
+    """
+    LRU cache with time-to-live for the results of data requests.
+
+    Pass the cache to get_data (cache=...) to share the retrieved feed and
+    precipitation data between calls within this process. The precipitation
+    data is keyed on its url, which uses coordinates rounded to 2 decimals;
+    nearby locations share the same request.
+    """
+
+    def __init__(self, maxsize=1024, feed_ttl=FEED_TTL, rain_ttl=RAIN_TTL,
+                 min_ttl=MIN_TTL, clock=time.time):
+        """
+        Initialize an empty cache.
+
+        maxsize: max number of results in the cache
+        feed_ttl: max time (seconds) to cache the (json/xml) feed
+        rain_ttl: max time (seconds) to cache the precipitation forecast
+        min_ttl: min time (seconds) to cache a result
+        clock: function returning the current (unix) time
+        """
+        self.maxsize = maxsize
+        self.feed_ttl = feed_ttl
+        self.rain_ttl = rain_ttl
+        self.min_ttl = min_ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Return the number of results in the cache."""
+        return len(self._entries)
+
+    def stats(self):
+        """Return the hit/miss counters and size of the cache."""
+        return {'hits': self.hits, 'misses': self.misses,
+                'coalesced': self.coalesced,
+                'size': len(self._entries), 'maxsize': self.maxsize}
+
+    def clear(self):
+        """Remove all results from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, key):
+        """Get a (non expired) result from the cache, or None."""
+        with self._lock:
+            result = self._lookup(key)
+            if result is None:
+                self.misses += 1
+            return result
+
+    def _lookup(self, key):
+        """
+        Get a (non expired) result; the lock must be held.
+
+        Counts the hits; the caller counts a miss (not when coalesced).
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > self.clock():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        if entry is not None:
+            del self._entries[key]
+        return None
+
+    def set(self, key, result, ttl):
+        """Store a result in the cache."""
+        expires = expires_at(result, ttl, self.clock(), self.min_ttl)
+        with self._lock:
+            self._entries[key] = (expires, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def fetch(self, key, ttl, func, *args):
+        """
+        Get the result from the cache, or call func(*args) to retrieve it.
+
+        Concurrent calls for the same key are coalesced: only the first
+        caller retrieves the data, the others wait for (and share) its
+        result. Only successful results are stored in the cache.
+
+        Records a CACHE event (see buienradar.instrument) with the lookup:
+        HIT, MISS or COALESCED.
+        """
+        with self._lock:
+            result = self._lookup(key)
+            if result is not None:
+                log.debug("Using cached data (%s).", key)
+            else:
+                flight = self._inflight.get(key)
+                leader = flight is None
+                if leader:
+                    flight = (threading.Event(), [])
+                    self._inflight[key] = flight
+                    self.misses += 1
+                else:
+                    self.coalesced += 1
+
+        if result is not None:
+            record(CACHE, url=key, lookup=HIT)
+            return result
+        record(CACHE, url=key, lookup=MISS if leader else COALESCED)
+
+        event, results = flight
+        if not leader:
+            log.debug("Waiting for data being retrieved (%s).", key)
+            event.wait()
+            if results:
+                return results[0]
+            # the retrieval failed with an exception; try ourselves:
+            with self._lock:
+                self.misses += 1
+            record(CACHE, url=key, lookup=MISS)
+            return func(*args)
+
+        try:
+            result = func(*args)
+            if result[SUCCESS]:
+                self.set(key, result, ttl)
+            results.append(result)
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            event.set()
+        return result
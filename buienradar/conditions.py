@@ -0,0 +1,61 @@
+"""Interned (read-only) weather conditions by buienradar condition code."""
+from types import MappingProxyType
+
+from buienradar.constants import (
+    __BRCONDITIONS,
+    CONDCODE,
+    CONDITION,
+    DETAILED,
+    EXACT,
+    EXACTNL,
+    IMAGE,
+    NIGHTTIME
+)
+
+
+def __record(code, night):
+    """Create the read-only condition of code (without NIGHTTIME if None)."""
+    cond_data = __BRCONDITIONS[code]
+    record = {CONDCODE: code,
+              CONDITION: cond_data[0],
+              DETAILED: cond_data[1],
+              EXACT: cond_data[2],
+              EXACTNL: cond_data[3],
+              }
+    if night is not None:
+        record[NIGHTTIME] = night
+    return MappingProxyType(record)
+
+
+# the conditions by (code, nighttime), created once for all results:
+CONDITIONS = {(code, night): __record(code, night)
+              for code in __BRCONDITIONS
+              for night in (None, False, True)}
+
+
+def lookup(code, night=None):
+    """
+    Get the shared, read-only condition of code.
+
+    night: True/False to include NIGHTTIME, None to leave it out
+
+    Returns None when the code is unknown.
+    """
+    return CONDITIONS.get((code, night))
+
+
+def with_image(code, image, night=None):
+    """
+    Get the condition of code with its IMAGE, as a new dict.
+
+    The results of parse_data are plain dicts (mutable, serializable with
+    json and pickle, converted by models.Result), so the shared condition is
+    copied (not shared) per result; use lookup to get the shared, read-only
+    condition. Returns None when the code is unknown.
+    """
+    record = CONDITIONS.get((code, night))
+    if record is None:
+        return None
+    data = record.copy()
+    data[IMAGE] = image
+    return data
@@ -4,9 +4,11 @@ SUCCESS = 'success'
 STATUS_CODE = 'status_code'
 HEADERS = 'headers'
 CONTENT = 'content'
+NOT_MODIFIED = 'not_modified'
 RAINCONTENT = 'raincontent'
 MESSAGE = 'msg'
 DATA = 'data'
+TIMINGS = 'timings'
 
 ATTRIBUTION_INFO = "Data provided by buienradar.nl"
 
@@ -28,6 +30,8 @@ GROUNDTEMP = 'groundtemperature'
 HUMIDITY = 'humidity'
 IMAGE = 'image'
 IRRADIANCE = 'irradiance'
+LATITUDE = 'latitude'
+LONGITUDE = 'longitude'
 MEASURED = 'measured'
 NIGHTTIME = 'night'
 PRECIPITATION = 'precipitation'
@@ -56,6 +60,7 @@ MAX_RAIN = 'maxrain'                    # new in json API
 
 # keys in forecasted precipitation data:
 AVERAGE = 'average'
+SERIES = 'series'
 TIMEFRAME = 'timeframe'
 TOTAL = 'total'
 
@@ -0,0 +1,236 @@
+"""Retrieve data from the buienradar api's using (shared) http sessions."""
+import contextvars
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from buienradar.constants import (
+    CONTENT,
+    HEADERS,
+    MESSAGE,
+    NOT_MODIFIED,
+    STATUS_CODE,
+    SUCCESS
+)
+from buienradar.instrument import BYTES, FETCH, stage
+
+# http status codes to retry a request on:
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+# max number of threads used to run requests concurrently; when they are all
+# busy, the request is run in the calling thread (see submit):
+MAX_WORKERS = 10
+
+__EXECUTOR = None
+__EXECUTOR_SIZE = 0
+__EXECUTOR_LOCK = threading.Lock()
+__RUNNING = 0
+
+log = logging.getLogger(__name__)
+
+
+class ConditionalStore:
+    """
+    Remember the ETag/Last-Modified validators and content per url.
+
+    When passed to get_url (or get_data), requests are sent with the
+    If-None-Match/If-Modified-Since headers; on a 304 (not modified)
+    response the previously retrieved content is returned.
+    """
+
+    def __init__(self, maxsize=256):
+        """Initialize the store; remember at most maxsize urls."""
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Return the number of urls in the store."""
+        return len(self._entries)
+
+    def request_headers(self, url):
+        """Get the conditional request headers for the url."""
+        return self.lookup(url)[0]
+
+    def lookup(self, url):
+        """
+        Get the conditional request headers and the stored content of url.
+
+        Returns (None, None) when nothing is stored for the url. Use the
+        returned content on a 304 response: it may be removed from the store
+        while the request is sent.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None, None
+            self._entries.move_to_end(url)
+        etag, modified, content = entry
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if modified:
+            headers['If-Modified-Since'] = modified
+        return headers, content
+
+    def content(self, url):
+        """Get the content previously retrieved from the url (or None)."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            self._entries.move_to_end(url)
+            return entry[2]
+
+    def update(self, url, headers, content):
+        """Store the validators and content of a (200) response."""
+        etag = headers.get('ETag')
+        modified = headers.get('Last-Modified')
+        with self._lock:
+            if not etag and not modified:
+                # nothing to validate against:
+                self._entries.pop(url, None)
+                return
+            self._entries[url] = (etag, modified, content)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+def create_session(pool_connections=10, pool_maxsize=10, retries=0,
+                   backoff_factor=0.5, timeout=None):
+    """
+    Create a http session to share between (many) calls to get_data.
+
+    The connections in the session are kept alive and reused for
+    subsequent requests to the same host.
+
+    pool_connections: number of hosts to keep connections to
+    pool_maxsize: max number of connections to keep per host
+    retries: number of retries on connection errors and 5xx responses
+    backoff_factor: factor for the delay (seconds) between the retries
+    timeout: timeout (seconds) for all requests; a (connect, read) tuple
+             is also allowed
+    """
+    # requests is imported on first use (it is slow to import):
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    from buienradar.session import BuienradarSession
+
+    session = BuienradarSession(timeout=timeout)
+    retry = Retry(total=retries,
+                  backoff_factor=backoff_factor,
+                  status_forcelist=RETRY_STATUS_CODES,
+                  raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=pool_connections,
+                          pool_maxsize=pool_maxsize,
+                          max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_url(url, session=None, fetch=True, conditional=None):
+    """
+    Load data from url and return result.
+
+    session: optional requests.Session to use for the request
+    fetch: include the content in the result
+    conditional: optional ConditionalStore; the request is sent with the
+                 stored validators and on a 304 response the stored content
+                 is returned, with NOT_MODIFIED set in the result
+    """
+    import requests
+
+    result = {SUCCESS: False, MESSAGE: None}
+    headers = stored = None
+    if conditional is not None:
+        headers, stored = conditional.lookup(url)
+    with stage(FETCH, url=url) as details:
+        try:
+            if session is None:
+                r = requests.get(url, headers=headers)
+            else:
+                r = session.get(url, headers=headers)
+            result[STATUS_CODE] = r.status_code
+            result[HEADERS] = r.headers
+            details[STATUS_CODE] = r.status_code
+            details[BYTES] = len(r.content)
+            if (304 == r.status_code and stored is not None):
+                log.debug("Not modified, using stored content (%s).", url)
+                if fetch:
+                    result[CONTENT] = stored
+                result[NOT_MODIFIED] = True
+                result[SUCCESS] = True
+                details.update({SUCCESS: True, NOT_MODIFIED: True})
+                return result
+            if fetch:
+                result[CONTENT] = r.text
+            if (200 == r.status_code):
+                result[SUCCESS] = True
+                if conditional is not None:
+                    conditional.update(url, r.headers, r.text)
+            else:
+                result[MESSAGE] = "Got http statuscode: %d." % (
+                    r.status_code)
+            details[SUCCESS] = result[SUCCESS]
+            return result
+        except requests.RequestException as ose:
+            result[MESSAGE] = 'Error getting url data. %s' % ose
+            log.error(result[MESSAGE])
+            details.update({SUCCESS: False, MESSAGE: result[MESSAGE]})
+
+    return result
+
+
+def submit(func, *args, executor=None):
+    """
+    Run func(*args) in a background thread; returns a Future.
+
+    Used to request the feed and the precipitation forecast concurrently.
+    The context (variables) of the caller is used to run func, so the
+    stages are collected by the caller (see instrument.collect).
+
+    executor: optional concurrent.futures.Executor to run func; by default a
+              shared pool of (at most) MAX_WORKERS threads is used, and when
+              all its threads are busy (many concurrent callers) func is run
+              in the calling thread, so callers never wait for each other's
+              requests
+    """
+    global __EXECUTOR, __EXECUTOR_SIZE, __RUNNING
+    if executor is not None:
+        return executor.submit(contextvars.copy_context().run, func, *args)
+
+    with __EXECUTOR_LOCK:
+        if __EXECUTOR is None or __EXECUTOR_SIZE != MAX_WORKERS:
+            # (re)create the pool when MAX_WORKERS is changed:
+            if __EXECUTOR is not None:
+                __EXECUTOR.shutdown(wait=False)
+            __EXECUTOR = ThreadPoolExecutor(max_workers=MAX_WORKERS,
+                                            thread_name_prefix='buienradar')
+            __EXECUTOR_SIZE = MAX_WORKERS
+        pooled = __RUNNING < __EXECUTOR_SIZE
+        if pooled:
+            __RUNNING += 1
+            future = __EXECUTOR.submit(contextvars.copy_context().run, func,
+                                       *args)
+    if pooled:
+        future.add_done_callback(__done)
+        return future
+
+    # the pool is saturated; run in the calling thread:
+    future = Future()
+    future.set_running_or_notify_cancel()
+    try:
+        future.set_result(func(*args))
+    except Exception as exc:
+        future.set_exception(exc)
+    return future
+
+
+def __done(future):
+    """Count a request run in the shared pool as done."""
+    global __RUNNING
+    with __EXECUTOR_LOCK:
+        __RUNNING -= 1
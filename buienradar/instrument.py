@@ -0,0 +1,197 @@
+"""
+Opt-in timing of the stages of get_data and parse_data.
+
+Each stage records an event: a dict with the STAGE, its DURATION (seconds)
+and details like the URL, STATUS_CODE and BYTES of a request, or the
+number of STATIONS in the feed. The CACHE lookups and the FALLBACK to the
+secondary xml feed are recorded as single events (without a DURATION).
+The events are passed to the added hooks
+(in the thread running the stage) and collected by collect():
+
+    from buienradar import instrument
+
+    with instrument.collect(attach=True) as timings:
+        result = get_data(latitude, longitude)
+        result = parse_data(result[CONTENT], result[RAINCONTENT])
+
+    for event in timings:
+        print(event[instrument.STAGE], event[instrument.DURATION])
+
+The collector is kept in a context variable, so it is also used by the
+requests run concurrently by fetch.submit (and by asyncio tasks). With
+attach=True, get_data and parse_data add the events of the call to their
+result, in TIMINGS. Without hooks or a collector, the stages are not timed.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from urllib.parse import urlsplit
+
+from buienradar.constants import TIMINGS
+
+# the stages:
+GET_DATA = 'get_data'           # get_data (requesting all data)
+FETCH = 'fetch'                 # a http request
+PARSE_DATA = 'parse_data'       # parse_data (parsing all data)
+DECODE = 'decode'               # decoding the json/xml feed (load_feed)
+SELECT = 'select'               # selecting the nearest weatherstation
+CONVERT = 'convert'             # converting the data of the station
+CONVERT_FORECAST = 'convert_forecast'  # converting the forecast days
+PARSE_PRECIPITATION = 'parse_precipitation'  # the precipitation forecast
+# single events (without a duration):
+CACHE = 'cache'                 # a lookup in cache.FeedCache (LOOKUP)
+FALLBACK = 'fallback'           # requesting the secondary xml feed (URL)
+
+# the LOOKUP of a CACHE event:
+HIT = 'hit'
+MISS = 'miss'
+COALESCED = 'coalesced'         # waited for the same (concurrent) request
+
+# keys in the events (besides SUCCESS, MESSAGE, STATUS_CODE and
+# NOT_MODIFIED of constants):
+STAGE = 'stage'
+DURATION = 'duration'
+URL = 'url'
+HOST = 'host'
+BYTES = 'bytes'
+STATIONS = 'stations'
+FORMAT = 'format'
+LOOKUP = 'lookup'
+
+__COLLECTOR = ContextVar('buienradar_collector', default=None)
+__HOOKS = ()
+
+log = logging.getLogger(__name__)
+
+
+class Timings:
+    """Collects the events of the stages (see collect)."""
+
+    def __init__(self, attach=False):
+        """Initialize; attach: add the events to the results (TIMINGS)."""
+        self.attach = attach
+        self.events = []
+
+    def __iter__(self):
+        """Iterate over the events."""
+        return iter(list(self.events))
+
+    def __len__(self):
+        """Return the number of events."""
+        return len(self.events)
+
+    def add(self, event):
+        """Add an event (list.append is thread-safe)."""
+        self.events.append(event)
+
+    def totals(self):
+        """Get the total duration (seconds) per stage."""
+        totals = {}
+        for event in self.events:
+            if event[DURATION] is not None:
+                totals[event[STAGE]] = (totals.get(event[STAGE], 0) +
+                                        event[DURATION])
+        return totals
+
+
+def add_hook(hook):
+    """
+    Call hook(event) for every event of a stage.
+
+    The hooks are called in the thread running the stage; exceptions raised
+    by a hook are logged (and ignored).
+    """
+    global __HOOKS
+    __HOOKS = __HOOKS + (hook,)
+
+
+def remove_hook(hook):
+    """Remove a hook added using add_hook."""
+    global __HOOKS
+    __HOOKS = tuple(item for item in __HOOKS if item != hook)
+
+
+def enabled():
+    """Whether the stages are timed (there are hooks or a collector)."""
+    return bool(__HOOKS) or __COLLECTOR.get() is not None
+
+
+@contextmanager
+def collect(attach=False):
+    """
+    Collect the events of the stages run within the context.
+
+    attach: get_data and parse_data add the events of the call to their
+            result (TIMINGS)
+
+    Yields the Timings collector.
+    """
+    timings = Timings(attach)
+    token = __COLLECTOR.set(timings)
+    try:
+        yield timings
+    finally:
+        __COLLECTOR.reset(token)
+
+
+@contextmanager
+def stage(name, **details):
+    """
+    Time the stage run within the context.
+
+    details: details of the event (named like the keys, like url=...)
+
+    Yields the dict with the details of the event, to be completed by the
+    stage (like BYTES or STATIONS); the event is recorded when the stage
+    ends (also on an exception).
+    """
+    if not __HOOKS and __COLLECTOR.get() is None:
+        yield details
+        return
+
+    start = time.perf_counter()
+    try:
+        yield details
+    finally:
+        record(name, time.perf_counter() - start, **details)
+
+
+def record(name, duration=None, **details):
+    """Record an event of a stage (without a duration: a single event)."""
+    hooks = __HOOKS
+    timings = __COLLECTOR.get()
+    if not hooks and timings is None:
+        return
+
+    event = {STAGE: name, DURATION: duration}
+    event.update(details)
+    if URL in event and HOST not in event:
+        event[HOST] = urlsplit(event[URL]).hostname
+    if timings is not None:
+        timings.add(event)
+    for hook in hooks:
+        try:
+            hook(event)
+        except Exception:
+            log.exception("Error in instrumentation hook %r.", hook)
+
+
+def mark():
+    """
+    Get the number of collected events, when they are attached to results.
+
+    Returns None when not collecting with attach; pass the mark to attach
+    to add the events since the mark to a result.
+    """
+    timings = __COLLECTOR.get()
+    if timings is None or not timings.attach:
+        return None
+    return len(timings.events)
+
+
+def attach(result, position):
+    """Add the events collected since position (see mark) to result."""
+    if position is not None:
+        result[TIMINGS] = __COLLECTOR.get().events[position:]
+    return result
@@ -0,0 +1,81 @@
+"""Pluggable decoders of the json feed, selecting the used sections."""
+import json
+
+try:
+    import orjson
+except ImportError:     # pragma: no cover
+    # install orjson for the (faster) ORJSON decoder
+    orjson = None  # type: ignore[assignment]
+
+# decode the complete document using json.loads (default):
+JSON = 'json'
+# decode the complete document using orjson (when installed):
+ORJSON = 'orjson'
+
+
+def extract(content, paths, decoder=None):
+    """
+    Decode the json content and return the values at paths.
+
+    paths: tuples with the keys from the document root, like
+           ('actual', 'stationmeasurements')
+    decoder: name of a registered decoder (see get_decoder)
+
+    Returns a dict with the value of each path found in the content.
+    Raises ValueError when the content is not valid json.
+    """
+    return get_decoder(decoder)(content, paths)
+
+
+def get_decoder(name=None):
+    """
+    Get a decoder function(content, paths) by name.
+
+    name: JSON (default), ORJSON (when installed) or a name added using
+          register_decoder
+    """
+    if name is None:
+        name = JSON
+    try:
+        return DECODERS[name]
+    except KeyError:
+        raise ValueError("Unknown json decoder: %s." % name) from None
+
+
+def register_decoder(name, loads):
+    """
+    Register a decoder; loads(content) must return the decoded document.
+
+    The decoder can be used by name in extract and load_json_feed, like:
+    register_decoder('ujson', ujson.loads).
+    """
+    DECODERS[name] = lambda content, paths: __select(loads(content), paths)
+
+
+def __decode_json(content, paths):
+    """Decode the complete document (json.loads) and select the paths."""
+    return __select(json.loads(content), paths)
+
+
+def __decode_orjson(content, paths):
+    """Decode the complete document (orjson) and select the paths."""
+    return __select(orjson.loads(content), paths)
+
+
+def __select(data, paths):
+    """Select the values at paths from the decoded document."""
+    found = {}
+    for path in paths:
+        value = data
+        try:
+            for key in path:
+                value = value[key]
+        except (KeyError, TypeError, IndexError):
+            continue
+        found[path] = value
+    return found
+
+
+DECODERS = {JSON: __decode_json}
+if orjson is not None:
+    DECODERS[ORJSON] = __decode_orjson
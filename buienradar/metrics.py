@@ -0,0 +1,237 @@
+"""
+Metrics of the requests, parsing and cache in the Prometheus text format.
+
+The metrics are updated from the events of buienradar.instrument:
+
+    from buienradar import metrics
+
+    metrics.enable()
+    ...
+    text = metrics.render()     # serve it, or write it using write()
+
+No server or client library is needed: render() returns the metrics in the
+Prometheus text exposition format (for a /metrics endpoint of the
+application) and write() writes them to a file (for the textfile collector
+of the node exporter).
+"""
+import math
+import os
+import tempfile
+import threading
+from bisect import bisect_left
+
+from buienradar.constants import STATUS_CODE, SUCCESS
+from buienradar.instrument import (
+    BYTES,
+    CACHE,
+    DECODE,
+    DURATION,
+    FALLBACK,
+    FETCH,
+    FORMAT,
+    HOST,
+    LOOKUP,
+    PARSE_DATA,
+    STAGE,
+    add_hook,
+    remove_hook
+)
+
+COUNTER = 'counter'
+HISTOGRAM = 'histogram'
+
+REQUEST_DURATION = 'buienradar_request_duration_seconds'
+RESPONSES = 'buienradar_responses_total'
+RESPONSE_BYTES = 'buienradar_response_bytes_total'
+XML_FALLBACKS = 'buienradar_xml_fallbacks_total'
+PARSE_DURATION = 'buienradar_parse_duration_seconds'
+PARSE_FAILURES = 'buienradar_parse_failures_total'
+CACHE_LOOKUPS = 'buienradar_cache_lookups_total'
+
+# the metrics: name: (type, help, label names)
+METRICS = {
+    REQUEST_DURATION: (HISTOGRAM, "Duration of the requests to the "
+                                  "buienradar api's.", ('host',)),
+    RESPONSES: (COUNTER, "Responses of the buienradar api's per status "
+                         "code (error: no response).", ('host', 'status')),
+    RESPONSE_BYTES: (COUNTER, "Size of the responses of the buienradar "
+                              "api's.", ('host',)),
+    XML_FALLBACKS: (COUNTER, "Requests of the secondary xml feed after the "
+                             "primary failed.", ()),
+    PARSE_DURATION: (HISTOGRAM, "Duration of parsing the data (parse_data).",
+                     ('format',)),
+    PARSE_FAILURES: (COUNTER, "Feeds that could not be decoded.",
+                     ('format',)),
+    CACHE_LOOKUPS: (COUNTER, "Lookups in the cache (hit, miss or "
+                             "coalesced).", ('lookup',)),
+}
+
+# upper bounds (seconds) of the buckets of the histograms:
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metrics:
+    """
+    Counters and histograms updated from instrumentation events.
+
+    Use enable (or instrument.add_hook(metrics.observe)) to update them.
+    """
+
+    def __init__(self, buckets=BUCKETS):
+        """Initialize the (empty) metrics."""
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._values = {name: {} for name in METRICS}
+
+    def observe(self, event):
+        """Update the metrics from an event (an instrumentation hook)."""
+        stage = event[STAGE]
+        if stage == FETCH:
+            host = event.get(HOST) or ''
+            status = event.get(STATUS_CODE)
+            with self._lock:
+                self._observe(REQUEST_DURATION, (host,), event[DURATION])
+                self._increase(RESPONSES, (host, 'error' if status is None
+                                           else str(status)))
+                self._increase(RESPONSE_BYTES, (host,), event.get(BYTES, 0))
+        elif stage == FALLBACK:
+            with self._lock:
+                self._increase(XML_FALLBACKS, ())
+        elif stage == PARSE_DATA:
+            with self._lock:
+                self._observe(PARSE_DURATION, (event.get(FORMAT, ''),),
+                              event[DURATION])
+        elif stage == DECODE and not event.get(SUCCESS, True):
+            with self._lock:
+                self._increase(PARSE_FAILURES, (event.get(FORMAT, ''),))
+        elif stage == CACHE:
+            with self._lock:
+                self._increase(CACHE_LOOKUPS, (event[LOOKUP],))
+
+    def value(self, name, *labels):
+        """
+        Get the value of a counter, or the (count, sum) of a histogram.
+
+        Returns 0 (or (0, 0)) when nothing is counted for the labels.
+        """
+        with self._lock:
+            value = self._values[name].get(labels)
+            if METRICS[name][0] == HISTOGRAM:
+                return (0, 0) if value is None else (value[-1], value[-2])
+            return value or 0
+
+    def reset(self):
+        """Reset all metrics."""
+        with self._lock:
+            self._values = {name: {} for name in METRICS}
+
+    def samples(self):
+        """
+        Get (a copy of) the values of the metrics: {name: {labels: value}}.
+
+        The value of a histogram is a list with the count per bucket (and
+        +Inf, not cumulative), the sum and the count.
+        """
+        with self._lock:
+            return {name: {labels: (list(value) if isinstance(value, list)
+                                    else value)
+                           for labels, value in values.items()}
+                    for name, values in self._values.items()}
+
+    def _increase(self, name, labels, amount=1):
+        """Increase a counter; the lock must be held."""
+        values = self._values[name]
+        values[labels] = values.get(labels, 0) + amount
+
+    def _observe(self, name, labels, value):
+        """Add a value to a histogram; the lock must be held."""
+        values = self._values[name]
+        # a count per bucket (and +Inf), the sum and the count:
+        counts = values.get(labels)
+        if counts is None:
+            counts = values[labels] = [0] * (len(self.buckets) + 3)
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-2] += value
+        counts[-1] += 1
+
+
+# the metrics updated by enable:
+REGISTRY = Metrics()
+
+
+def enable(metrics=REGISTRY):
+    """Update the metrics from the instrumentation events."""
+    disable(metrics)
+    add_hook(metrics.observe)
+
+
+def disable(metrics=REGISTRY):
+    """Stop updating the metrics."""
+    remove_hook(metrics.observe)
+
+
+def render(metrics=REGISTRY):
+    """Get the metrics in the Prometheus text exposition format."""
+    samples = metrics.samples()
+    bounds = metrics.buckets + (math.inf,)
+    lines = []
+    for name, (kind, text, names) in METRICS.items():
+        lines.append('# HELP %s %s' % (name, text))
+        lines.append('# TYPE %s %s' % (name, kind))
+        values = samples[name]
+        if not values and not names:
+            lines.append('%s 0' % name)
+        for labels in sorted(values):
+            value = values[labels]
+            if kind == COUNTER:
+                lines.append('%s%s %s' % (name, __labels(names, labels),
+                                          __number(value)))
+                continue
+            cumulative = 0
+            for bound, count in zip(bounds, value):
+                cumulative += count
+                lines.append('%s_bucket%s %d' % (
+                    name, __labels(names + ('le',),
+                                   labels + (__number(bound),)),
+                    cumulative))
+            lines.append('%s_sum%s %s' % (name, __labels(names, labels),
+                                          __number(value[-2])))
+            lines.append('%s_count%s %d' % (name, __labels(names, labels),
+                                            value[-1]))
+    return '\n'.join(lines) + '\n'
+
+
+def write(path, metrics=REGISTRY):
+    """Write the metrics to the file at path (replacing it atomically)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temp = tempfile.mkstemp(dir=directory, prefix='.metrics-')
+    try:
+        with os.fdopen(handle, 'w') as file:
+            file.write(render(metrics))
+        # readable for the (node exporter) collector:
+        os.chmod(temp, 0o644)
+        os.replace(temp, path)
+    except BaseException:
+        os.unlink(temp)
+        raise
+
+
+def __labels(names, values):
+    """Format the labels of a sample: {name="value",...}."""
+    if not names:
+        return ''
+    return '{%s}' % ','.join('%s="%s"' % (name, __escape(value))
+                             for name, value in zip(names, values))
+
+
+def __escape(value):
+    """Escape a label value."""
+    return (str(value).replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+def __number(value):
+    """Format a sample value (or bucket bound)."""
+    if value == math.inf:
+        return '+Inf'
+    return repr(value)
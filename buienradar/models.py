@@ -0,0 +1,196 @@
+"""
+Typed (slotted) models of the parsed weather data.
+
+The models hold the same data as the (nested) dicts returned by parse_data,
+using less memory when many results are kept:
+
+    result = Result.from_dict(parse_data(content, raincontent))
+    result.data.temperature
+    result.to_dict()  # the dict returned by parse_data
+
+The attributes are named after the keys (constants) of the dicts. Keys that
+are not in a dict (like the json only sensors in the xml data) are unset and
+left out by to_dict.
+"""
+from typing import Dict, Type
+
+from buienradar.constants import (
+    ATTRIBUTION,
+    AVERAGE,
+    BAROMETERFC,
+    BAROMETERFCNAME,
+    BAROMETERFCNAMENL,
+    CONDCODE,
+    CONDITION,
+    DATA,
+    DATETIME,
+    DETAILED,
+    DISTANCE,
+    EXACT,
+    EXACTNL,
+    FEELTEMPERATURE,
+    FORECAST,
+    GROUNDTEMP,
+    HUMIDITY,
+    IMAGE,
+    IRRADIANCE,
+    MAX_RAIN,
+    MAX_TEMP,
+    MEASURED,
+    MESSAGE,
+    MIN_RAIN,
+    MIN_TEMP,
+    NIGHTTIME,
+    PRECIPITATION,
+    PRECIPITATION_FORECAST,
+    PRESSURE,
+    RAIN,
+    RAIN_CHANCE,
+    RAINLAST24HOUR,
+    RAINLASTHOUR,
+    SERIES,
+    SNOW,
+    STATIONNAME,
+    SUCCESS,
+    SUN_CHANCE,
+    TEMPERATURE,
+    TIMEFRAME,
+    TIMINGS,
+    TOTAL,
+    VISIBILITY,
+    WINDAZIMUTH,
+    WINDDIRECTION,
+    WINDFORCE,
+    WINDGUST,
+    WINDSPEED
+)
+
+
+class Model:
+    """Base of the models; the slots are the keys of the dict (in order)."""
+
+    __slots__ = ()
+    # the models of nested values (a dict or a list of dicts) by key:
+    nested: Dict[str, Type['Model']] = {}
+
+    def __init__(self, **values):
+        """Initialize the model with the values by key."""
+        for key, value in values.items():
+            setattr(self, key, value)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Create the model from a dict (as returned by parse_data).
+
+        Raises AttributeError when the dict contains an unknown key.
+        """
+        model = cls.__new__(cls)
+        for key, value in data.items():
+            nested = cls.nested.get(key)
+            if nested is not None:
+                if isinstance(value, list):
+                    value = [nested.from_dict(item) for item in value]
+                elif isinstance(value, dict):
+                    value = nested.from_dict(value)
+            setattr(model, key, value)
+        return model
+
+    def to_dict(self):
+        """Convert the model into the dict returned by parse_data."""
+        data = {}
+        for key in self.__slots__:
+            try:
+                value = getattr(self, key)
+            except AttributeError:
+                # unset:
+                continue
+            if isinstance(value, Model):
+                value = value.to_dict()
+            elif isinstance(value, list):
+                value = [item.to_dict() if isinstance(item, Model) else item
+                         for item in value]
+            data[key] = value
+        return data
+
+    def __eq__(self, other):
+        """Compare the type and values of the models."""
+        if type(self) is not type(other):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        """Represent the model with its (set) values."""
+        values = ", ".join("%s=%r" % (key, getattr(self, key))
+                           for key in self.__slots__ if hasattr(self, key))
+        return "%s(%s)" % (type(self).__name__, values)
+
+
+class Condition(Model):
+    """The weather condition."""
+
+    __slots__ = (CONDCODE, CONDITION, DETAILED, EXACT, EXACTNL, NIGHTTIME,
+                 IMAGE)
+
+
+class ForecastDay(Model):
+    """The weather forecast of a day."""
+
+    __slots__ = (CONDITION, TEMPERATURE, MIN_TEMP, MAX_TEMP, SUN_CHANCE,
+                 RAIN_CHANCE, RAIN, MIN_RAIN, MAX_RAIN, SNOW, WINDFORCE,
+                 WINDSPEED, WINDDIRECTION, WINDAZIMUTH, DATETIME)
+    nested = {CONDITION: Condition}
+
+
+class PrecipitationForecast(Model):
+    """
+    The forecasted precipitation.
+
+    The series is kept as a tuple of (datetime, precipitation) tuples.
+    """
+
+    __slots__ = (AVERAGE, TOTAL, TIMEFRAME, SERIES)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create the model from a dict (as returned by parse_data)."""
+        model = super().from_dict(data)
+        series = data.get(SERIES)
+        if series is not None:
+            model.series = tuple((item[DATETIME], item[PRECIPITATION])
+                                 for item in series)
+        return model
+
+    def to_dict(self):
+        """Convert the model into the dict returned by parse_data."""
+        data = super().to_dict()
+        if data.get(SERIES) is not None:
+            data[SERIES] = [{DATETIME: dt, PRECIPITATION: value}
+                            for dt, value in data[SERIES]]
+        return data
+
+
+class WeatherData(Model):
+    """The weather data of a location (DATA of the result)."""
+
+    __slots__ = (ATTRIBUTION, FORECAST, PRECIPITATION_FORECAST,
+                 BAROMETERFC, BAROMETERFCNAME, BAROMETERFCNAMENL, HUMIDITY,
+                 GROUNDTEMP, IRRADIANCE, MEASURED, PRECIPITATION, PRESSURE,
+                 STATIONNAME, CONDITION, RAINLAST24HOUR, RAINLASTHOUR,
+                 TEMPERATURE, FEELTEMPERATURE, VISIBILITY, WINDSPEED,
+                 WINDFORCE, WINDDIRECTION, WINDAZIMUTH, WINDGUST)
+    nested = {FORECAST: ForecastDay,
+              PRECIPITATION_FORECAST: PrecipitationForecast,
+              CONDITION: Condition}
+
+
+class Result(Model):
+    """The result of parse_data (TIMINGS: see buienradar.instrument)."""
+
+    __slots__ = (SUCCESS, MESSAGE, DATA, DISTANCE, TIMINGS)
+    nested = {DATA: WeatherData}
+
+
+def from_results(results):
+    """Create the models of a list of results (like parse_for_locations)."""
+    return [Result.from_dict(result) for result in results]
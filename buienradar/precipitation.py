@@ -0,0 +1,136 @@
+"""Parse the forecasted precipitation data (getrr.php) of buienradar."""
+import logging
+from datetime import datetime, timedelta
+
+import pytz
+
+from buienradar.constants import (
+    AVERAGE,
+    DATETIME,
+    PRECIPITATION,
+    SERIES,
+    TIMEFRAME,
+    TOTAL
+)
+from buienradar.timestamps import localize, timezone
+
+log = logging.getLogger(__name__)
+
+
+# See buienradar documentation for this api, attribution
+# https://www.buienradar.nl/overbuienradar/gratis-weerdata
+#
+# Op basis van de door u gewenste coordinaten (latitude en longitude)
+# kunt u de neerslag tot twee uur vooruit ophalen in tekstvorm. De
+# data wordt iedere 5 minuten geupdatet. Op deze pagina kunt u de
+# neerslag in tekst vinden. De waarde 0 geeft geen neerslag aan (droog)
+# de waarde 255 geeft zware neerslag aan. Gebruik de volgende formule
+# voor het omrekenen naar de neerslagintensiteit in de eenheid
+# millimeter per uur (mm/u):
+#
+# Neerslagintensiteit = 10^((waarde-109)/32)
+#
+# Ter controle: een waarde van 77 is gelijk aan een neerslagintensiteit
+# van 0,1 mm/u.
+INTENSITY = tuple(10 ** ((float(val) - 109) / 32) for val in range(256))
+
+
+def intensity(val):
+    """Convert a raw value (string, 0..255) into precipitation in mm/h."""
+    try:
+        index = int(val)
+        if 0 <= index < 256:
+            return INTENSITY[index]
+    except ValueError:
+        pass
+    # not a plain integer in range (like '77,5'):
+    val = float(val.replace(',', '.'))
+    return 10 ** ((val - 109) / 32)
+
+
+def parse_precipitation(data, timeframe, series=False, now=None):
+    """
+    Parse the forecasted precipitation data.
+
+    Returns the average (mm/h) and total (mm) precipitation within the
+    timeframe (minutes). When series is True, SERIES contains the full
+    forecast: a list of {DATETIME: local datetime, PRECIPITATION: mm/h}
+    for each (5 minute) line in the data.
+
+    now: datetime to anchor the (HH:MM) times of the series to; defaults
+    to the current time.
+    """
+    result = {AVERAGE: None, TOTAL: None, TIMEFRAME: None}
+
+    log.debug("Precipitation data: %s", data)
+    lines = data.splitlines()
+    totalrain = 0
+    numberoflines = 0
+    nrlines = min(len(lines), round(float(timeframe) / 5) + 1)
+    # looping through lines of forecasted precipitation data and
+    # not using the time data (HH:MM) int the data. This is to allow for
+    # correct data in case we are running in a different timezone.
+    for line in lines[1:nrlines]:
+        # pylint: disable=unused-variable
+        (val, key) = line.split("|")
+        totalrain = totalrain + intensity(val)
+        numberoflines = numberoflines + 1
+
+    if numberoflines > 0:
+        result[AVERAGE] = round((totalrain / numberoflines), 2)
+    else:
+        result[AVERAGE] = 0
+    result[TOTAL] = round(totalrain / 12, 2)
+    result[TIMEFRAME] = timeframe
+
+    if series:
+        result[SERIES] = __parse_series(lines, now)
+
+    return result
+
+
+def __parse_series(lines, now):
+    """Parse all lines into a list of (local) datetimes and mm/h."""
+    if now is None:
+        now = datetime.now(pytz.utc)
+    now = now.astimezone(timezone()).replace(tzinfo=None)
+
+    series = []
+    previous = None
+    for line in lines:
+        try:
+            (val, key) = line.split("|")
+            mmu = intensity(val)
+        except ValueError:
+            log.warning("Unable to parse precipitation line: %s", line)
+            continue
+
+        dt = __to_datetime(key, now, previous)
+        if dt is not None:
+            previous = dt
+            dt = localize(dt)
+        series.append({DATETIME: dt, PRECIPITATION: round(mmu, 2)})
+
+    return series
+
+
+def __to_datetime(key, now, previous):
+    """Convert HH:MM into a (naive, local) datetime following previous."""
+    try:
+        (hour, minute) = key.strip().split(":")
+        dt = now.replace(hour=int(hour), minute=int(minute),
+                         second=0, microsecond=0)
+    except ValueError:
+        return None
+
+    if previous is None:
+        # the forecast starts around now; correct around midnight:
+        if dt - now > timedelta(hours=12):
+            dt -= timedelta(days=1)
+        elif now - dt > timedelta(hours=12):
+            dt += timedelta(days=1)
+    else:
+        dt = previous.replace(hour=dt.hour, minute=dt.minute)
+        if dt < previous:
+            dt += timedelta(days=1)
+    return dt
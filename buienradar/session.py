@@ -0,0 +1,16 @@
+"""Http session for the buienradar api's (see fetch.create_session)."""
+import requests
+
+
+class BuienradarSession(requests.Session):
+    """requests.Session applying a default timeout to all requests."""
+
+    def __init__(self, timeout=None):
+        """Initialize the session with a default timeout (seconds)."""
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        """Send the request, using the default timeout if none is given."""
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(method, url, **kwargs)
@@ -0,0 +1,27 @@
+"""Parsed buienradar feed, to be shared between many locations."""
+
+
+class FeedSnapshot:
+    """
+    Sections of a single parsed buienradar feed (json or xml).
+
+    stations: list of raw weatherstation records (None when missing)
+    forecast: raw five-day forecast section (None when missing)
+    coordinates: list of (position, latitude, longitude) of the stations
+    usexml: True when the snapshot was loaded from the xml feed
+    index: spatial index over the stations (built on first use)
+    """
+
+    def __init__(self, stations, forecast, coordinates, usexml=False):
+        """Initialize the snapshot from the extracted feed sections."""
+        self.stations = stations
+        self.forecast = forecast
+        self.coordinates = coordinates
+        self.usexml = usexml
+        self.index = None
+
+    def __repr__(self):
+        """Return a short description of the snapshot."""
+        return "FeedSnapshot(stations=%s, usexml=%s)" % (
+            None if self.stations is None else len(self.stations),
+            self.usexml)
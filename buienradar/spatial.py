@@ -0,0 +1,149 @@
+"""Spatial index to find the nearest weatherstation(s) quickly."""
+import math
+
+# Distances on a sphere differ less than 1% from the (exact) distances on the
+# WGS84 ellipsoid; every station within this (relative) margin of the nearest
+# station on the sphere is a candidate to be the nearest on the ellipsoid.
+MARGIN = 0.02
+# absolute margin (radians) to keep (rounded) equal distances as candidates
+ABS_MARGIN = 1e-7
+# max number of elements in a (query x station) distance matrix block
+BLOCK_SIZE = 1 << 20
+
+
+def to_xyz(latitude, longitude):
+    """Convert latitude/longitude (degrees) into a point on the unit sphere."""
+    lat = math.radians(latitude)
+    lon = math.radians(longitude)
+    return (math.cos(lat) * math.cos(lon),
+            math.cos(lat) * math.sin(lon),
+            math.sin(lat))
+
+
+def __chord2(p1, p2):
+    """Squared chord length between two points on the unit sphere."""
+    return ((p1[0] - p2[0]) ** 2 +
+            (p1[1] - p2[1]) ** 2 +
+            (p1[2] - p2[2]) ** 2)
+
+
+def __build(points, depth=0):
+    """Build a k-d tree node: (point, position, axis, left, right)."""
+    if not points:
+        return None
+    axis = depth % 3
+    points.sort(key=lambda point: point[0][axis])
+    median = len(points) // 2
+    return (points[median][0], points[median][1], axis,
+            __build(points[:median], depth + 1),
+            __build(points[median + 1:], depth + 1))
+
+
+def __nearest(node, target, best):
+    """Find the squared chord distance to the nearest point in the tree."""
+    if node is None:
+        return best
+    point, _pos, axis, left, right = node
+    dist = __chord2(point, target)
+    if dist < best:
+        best = dist
+    diff = target[axis] - point[axis]
+    near, far = (left, right) if diff < 0 else (right, left)
+    best = __nearest(near, target, best)
+    if diff * diff < best:
+        best = __nearest(far, target, best)
+    return best
+
+
+def __within(node, target, limit, found):
+    """Collect the positions of all points within a squared chord distance."""
+    if node is None:
+        return
+    point, pos, axis, left, right = node
+    if __chord2(point, target) <= limit:
+        found.append(pos)
+    diff = target[axis] - point[axis]
+    if diff < 0 or diff * diff <= limit:
+        __within(left, target, limit, found)
+    if diff >= 0 or diff * diff <= limit:
+        __within(right, target, limit, found)
+
+
+def build_index(coordinates):
+    """
+    Build a k-d tree over the weatherstations (on the unit sphere).
+
+    coordinates: iterable of (position, latitude, longitude) where
+    position is the position of the station in the feed.
+
+    The index is used to select the candidates for the nearest station;
+    the exact (vincenty) distance is only calculated for these candidates.
+    """
+    points = [(to_xyz(lat, lon), pos) for pos, lat, lon in coordinates]
+    return __build(points)
+
+
+def nearest_candidates(index, latitude, longitude):
+    """
+    Get the positions of the stations that may be the nearest station.
+
+    The positions are returned in feed order.
+    """
+    if index is None:
+        return []
+    target = to_xyz(latitude, longitude)
+    best = __nearest(index, target, float('inf'))
+
+    # convert the chord into an angle, add the margin and convert back:
+    angle = 2 * math.asin(min(math.sqrt(best) / 2, 1.0))
+    angle = min(angle * (1 + MARGIN) + ABS_MARGIN, math.pi)
+    limit = (2 * math.sin(angle / 2)) ** 2
+
+    found = []
+    __within(index, target, limit, found)
+    found.sort()
+    return found
+
+
+def batch_candidates(coordinates, locations):
+    """
+    Get the candidates for the nearest station for many locations at once.
+
+    coordinates: list of (position, latitude, longitude) of the stations
+    locations: list of (latitude, longitude) tuples
+
+    Uses numpy to calculate the (haversine) distance from every location to
+    every station; returns a list with the candidate positions (feed order)
+    per location, or None when numpy is not installed.
+    """
+    try:
+        # imported on first use (it is slow to import):
+        import numpy
+    except ImportError:
+        # install buienradar[fast] for the vectorized batch selection
+        return None
+    if not coordinates:
+        return [[] for _ in locations]
+
+    positions = numpy.array([pos for pos, _lat, _lon in coordinates])
+    ws_lat = numpy.radians([lat for _pos, lat, _lon in coordinates])
+    ws_lon = numpy.radians([lon for _pos, _lat, lon in coordinates])
+    ws_cos = numpy.cos(ws_lat)
+
+    result = []
+    rows = max(1, BLOCK_SIZE // len(coordinates))
+    for start in range(0, len(locations), rows):
+        block = numpy.radians(numpy.array(locations[start:start + rows],
+                                          dtype=float).reshape(-1, 2))
+        lat = block[:, :1]
+        lon = block[:, 1:]
+
+        # central angle (haversine) between all locations and stations:
+        hav = (numpy.sin((ws_lat - lat) / 2) ** 2 +
+               numpy.cos(lat) * ws_cos * numpy.sin((ws_lon - lon) / 2) ** 2)
+        angle = 2 * numpy.arcsin(numpy.sqrt(numpy.clip(hav, 0, 1)))
+
+        limit = angle.min(axis=1, keepdims=True) * (1 + MARGIN) + ABS_MARGIN
+        for row in angle <= limit:
+            result.append(positions[row].tolist())
+    return result
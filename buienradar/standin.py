@@ -0,0 +1,205 @@
+"""
+Local stand-in for the buienradar api's, serving (test) files.
+
+Run as python -m buienradar.standin.
+
+Usage:
+  standin [options]
+  standin (-h | --help)
+
+ Options:
+  -h --help                 Show this screen.
+  --host=<host>             Host (address) to listen on [default: 127.0.0.1]
+  --port=<port>             Port to listen on [default: 8080]
+  --fixtures=<dir>          Directory with the json/, xml/ and raindata/
+                            files to serve [default: tests]
+  --latency=<seconds>       Delay of every response [default: 0]
+  --error-rate=<rate>       Fraction (0..1) of requests answered with a 500
+                            error [default: 0]
+  --no-conditional          Do not answer conditional requests with a 304
+
+Use the stand-in by setting BUIENRADAR_BASE_URL (see buienradar.urls), like:
+
+  BUIENRADAR_BASE_URL=http://127.0.0.1:8080 python -m buienradar
+"""
+import email.utils
+import hashlib
+import logging
+import os
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from buienradar.urls import (
+    JSON_FEED_PATH,
+    PRECIPITATION_PATH,
+    XML_FEED_PATH,
+    XML_SECONDARY_FEED_PATH
+)
+
+# the files (in the fixtures directory) served per path:
+FILES = {
+    JSON_FEED_PATH: ('json/buienradar.json', 'application/json'),
+    XML_FEED_PATH: ('xml/buienradar.xml', 'text/xml'),
+    XML_SECONDARY_FEED_PATH: ('xml/buienradar.xml', 'text/xml'),
+    urlsplit(PRECIPITATION_PATH).path: ('raindata/raindata.txt',
+                                        'text/plain'),
+}
+
+log = logging.getLogger(__name__)
+
+
+class StandinServer(ThreadingHTTPServer):
+    """
+    Http server serving the files of the buienradar api's.
+
+    Responses have an ETag and Last-Modified header; conditional requests
+    get a 304 (not modified) response, unless conditional is False.
+    The number of responses per status code is counted in stats.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, fixtures='tests', host='127.0.0.1', port=0,
+                 latency=0.0, error_rate=0.0, conditional=True, seed=None):
+        """
+        Initialize the server; port 0 selects a free port.
+
+        fixtures: directory with the json/, xml/ and raindata/ files
+        latency: delay (seconds) of every response
+        error_rate: fraction (0..1) of requests answered with a 500 error
+        seed: seed for selecting the failing requests
+        """
+        super().__init__((host, port), StandinHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.conditional = conditional
+        self.modified = email.utils.formatdate(time.time(), usegmt=True)
+        self.stats = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+        self.files = {}
+        for path, (name, content_type) in FILES.items():
+            with open(os.path.join(fixtures, name), 'rb') as file:
+                content = file.read()
+            etag = '"%s"' % hashlib.md5(content).hexdigest()
+            self.files[path] = (content, content_type, etag)
+
+    @property
+    def base_url(self):
+        """Get the url to use as BUIENRADAR_BASE_URL."""
+        host, port = self.server_address[:2]
+        return 'http://%s:%d' % (host, port)
+
+    def start(self):
+        """Serve the requests in a background thread; returns base_url."""
+        self._thread = threading.Thread(target=self.serve_forever,
+                                        name='buienradar-standin',
+                                        daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        """Stop serving and close the server."""
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        """Start the server."""
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop the server."""
+        self.stop()
+
+    def failing(self):
+        """Whether to answer the next request with an error."""
+        if not self.error_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def count(self, status):
+        """Count a response with status."""
+        with self._lock:
+            self.stats[status] += 1
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """Handle the requests of the stand-in server."""
+
+    # keep the connections alive (like the buienradar servers do):
+    protocol_version = 'HTTP/1.1'
+    # send the headers and content without delay (TCP_NODELAY):
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        """Serve the file of the requested path."""
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+
+        entry = server.files.get(urlsplit(self.path).path)
+        if entry is None:
+            self.respond(404)
+        elif server.failing():
+            self.respond(500)
+        else:
+            content, content_type, etag = entry
+            headers = {'ETag': etag, 'Last-Modified': server.modified}
+            if (server.conditional and
+                    self.headers.get('If-None-Match') == etag):
+                self.respond(304, headers=headers)
+            else:
+                self.respond(200, content, content_type, headers)
+
+    def respond(self, status, content=b'', content_type='text/plain',
+                headers=None):
+        """Send the response."""
+        self.server.count(status)
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        """Log the requests (at debug level)."""
+        log.debug("%s - %s", self.address_string(), format % args)
+
+
+def main(argv=None):
+    """Run the stand-in server until interrupted."""
+    from docopt import docopt
+
+    args = docopt(__doc__, argv=argv)
+    logging.basicConfig(level=logging.INFO)
+    server = StandinServer(fixtures=args['--fixtures'],
+                           host=args['--host'],
+                           port=int(args['--port']),
+                           latency=float(args['--latency']),
+                           error_rate=float(args['--error-rate']),
+                           conditional=not args['--no-conditional'])
+    log.info("Serving at %s (BUIENRADAR_BASE_URL)", server.base_url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        log.info("Responses: %s", dict(server.stats))
+
+
+if __name__ == '__main__':
+    main()
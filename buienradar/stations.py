@@ -0,0 +1,78 @@
+"""Convert the weatherstation records of the json and xml feed."""
+import logging
+
+from buienradar.constants import (
+    ATTRIBUTION,
+    ATTRIBUTION_INFO,
+    FORECAST,
+    MEASURED,
+    PRECIPITATION_FORECAST
+)
+
+log = logging.getLogger(__name__)
+
+
+class StationConverter:
+    """
+    Converts a station record in a single pass, using compiled steps.
+
+    The SENSOR_TYPES of a feed ({key: [name, func]}) are compiled once into
+    a tuple of (key, name, step); each step(loc_data, data) converts one
+    field of a station record into data, and raises KeyError when the
+    field is missing.
+
+    steps: the steps (by key) not converting a plain value, like CONDITION;
+           functions creating the step from the name of the field
+    valid_fields: the (key, name) of the converted (plain) values, except
+                  MEASURED; these determine if a record is valid (not all
+                  0's, see the is_valid of the json and xml modules)
+    """
+
+    def __init__(self, sensor_types, steps):
+        """Compile the sensor types (and steps) of a feed."""
+        compiled = []
+        valid_fields = []
+        for key, [name, func] in sensor_types.items():
+            create = steps.get(key)
+            if create is not None:
+                step = create(name)
+            else:
+                step = value_step(key, name, func)
+                if func is not None and key != MEASURED:
+                    valid_fields.append((key, name))
+            compiled.append((key, name, step))
+        self.steps = tuple(compiled)
+        self.valid_fields = tuple(valid_fields)
+        self.template = {ATTRIBUTION: ATTRIBUTION_INFO,
+                         FORECAST: None,
+                         PRECIPITATION_FORECAST: None,
+                         **dict.fromkeys(sensor_types)}
+
+    def convert(self, loc_data):
+        """
+        Convert a station record.
+
+        Returns the converted data and the names of the missing fields.
+        """
+        data = dict(self.template)
+        data[FORECAST] = []
+        missing = []
+        for key, name, step in self.steps:
+            try:
+                step(loc_data, data)
+            except KeyError:
+                missing.append(name)
+                log.debug("Data element with key='%s' not loaded from br "
+                          "data!", key)
+        return data, missing
+
+
+def value_step(key, name, func):
+    """Create the step converting a (plain) value of a station record."""
+    if func is None:
+        def step(loc_data, data):
+            data[key] = loc_data[name]
+    else:
+        def step(loc_data, data):
+            data[key] = func(loc_data[name])
+    return step
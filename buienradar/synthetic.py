@@ -0,0 +1,372 @@
+"""
+Generate synthetic buienradar feeds (for tests and scaling benchmarks).
+
+Run as python -m buienradar.synthetic.
+
+Usage:
+  synthetic [options] <directory>
+  synthetic (-h | --help)
+
+ Options:
+  -h --help             Show this screen.
+  --stations=<n>        Number of weather stations [default: 10000]
+  --days=<n>            Number of forecast days [default: 5]
+  --invalid=<rate>      Fraction (0..1) of the values that is invalid
+                        [default: 0]
+  --missing=<rate>      Fraction (0..1) of the values that is missing
+                        [default: 0]
+  --seed=<seed>         Seed of the random data [default: 6252]
+
+Writes json/buienradar.json, xml/buienradar.xml and raindata/raindata.txt
+to the directory (the layout of tests/), so the files can be served by the
+stand-in server (python -m buienradar.standin --fixtures=<directory>).
+"""
+import json
+import os
+import random
+from datetime import datetime, timedelta
+from xml.sax.saxutils import escape, quoteattr
+
+from buienradar.constants import __BRCONDITIONS
+
+# bounds (latitude, longitude) of the generated station locations:
+BOUNDS = ((50.75, 53.55), (3.35, 7.25))
+
+__ICONURL = ('https://www.buienradar.nl/resources/images/icons/weather/'
+             '30x30/%s.png')
+__GRAPHURL = ('https://www.buienradar.nl/nederland/weerbericht/'
+              'weergrafieken/%s')
+__DIRECTIONS = ('N', 'NNO', 'NO', 'ONO', 'O', 'OZO', 'ZO', 'ZZO',
+                'Z', 'ZZW', 'ZW', 'WZW', 'W', 'WNW', 'NW', 'NNW')
+__CODES = sorted(__BRCONDITIONS)
+# the values of a station (or forecast day) that may be invalid or missing:
+__STATION_VALUES = ('lat', 'lon', 'temperature', 'groundtemperature',
+                    'feeltemperature', 'humidity', 'pressure', 'visibility',
+                    'windspeed', 'windforce', 'windazimuth', 'windgusts',
+                    'precipitation', 'sunpower', 'rainlasthour',
+                    'rainlast24hour')
+__DAY_VALUES = ('mintempmin', 'mintempmax', 'maxtempmin', 'maxtempmax',
+                'rainchance', 'sunchance', 'rainmin', 'rainmax', 'wind')
+
+# station values: (key in the json feed, element in the xml feed)
+__FIELDS = {
+    'lat': ('lat', 'lat'),
+    'lon': ('lon', 'lon'),
+    'temperature': ('temperature', 'temperatuurGC'),
+    'groundtemperature': ('groundtemperature', 'temperatuur10cm'),
+    'feeltemperature': ('feeltemperature', None),
+    'humidity': ('humidity', 'luchtvochtigheid'),
+    'pressure': ('airpressure', 'luchtdruk'),
+    'visibility': ('visibility', 'zichtmeters'),
+    'windspeed': ('windspeed', 'windsnelheidMS'),
+    'windforce': ('windspeedBft', 'windsnelheidBF'),
+    'windazimuth': ('winddirectiondegrees', 'windrichtingGR'),
+    'winddirection': ('winddirection', 'windrichting'),
+    'windgusts': ('windgusts', 'windstotenMS'),
+    'precipitation': ('precipitation', 'regenMMPU'),
+    'sunpower': ('sunpower', 'zonintensiteitWM2'),
+    'rainlasthour': ('rainFallLastHour', None),
+    'rainlast24hour': ('rainFallLast24Hour', None),
+}
+
+# marks an invalid value (null in the json feed, '-' in the xml feed):
+INVALID = object()
+
+
+def generate_stations(stations=50, invalid=0.0, missing=0.0, seed=None,
+                      now=None):
+    """
+    Generate the (neutral) data of the weather stations.
+
+    invalid: fraction (0..1) of the values that is INVALID
+    missing: fraction (0..1) of the values that is left out
+    now: datetime of the measurements; defaults to the current time
+
+    Returns a list with a dict per station; json_feed and xml_feed render
+    the same data into a feed.
+    """
+    rnd = random.Random(seed)
+    measured = __measured(now)
+    result = []
+    for index in range(stations):
+        code = rnd.choice(__CODES)
+        azimuth = rnd.randrange(360)
+        windforce = rnd.randrange(13)
+        temperature = round(rnd.uniform(-10, 35), 1)
+        station = {
+            'id': 6000 + index,
+            'name': 'Meetstation %d' % (6000 + index),
+            'region': 'Regio %d' % (index % 100),
+            'timestamp': measured,
+            'code': code,
+            'description': __BRCONDITIONS[code][3],
+            'lat': round(rnd.uniform(*BOUNDS[0]), 2),
+            'lon': round(rnd.uniform(*BOUNDS[1]), 2),
+            'temperature': temperature,
+            'groundtemperature': round(temperature + rnd.uniform(-3, 1), 1),
+            'feeltemperature': round(temperature - windforce / 2, 1),
+            'humidity': rnd.randrange(30, 101),
+            'pressure': round(rnd.uniform(970, 1045), 2),
+            'visibility': rnd.randrange(100, 60000),
+            'windspeed': round(windforce * 2.5 + rnd.random(), 2),
+            'windforce': windforce,
+            'windazimuth': azimuth,
+            'winddirection': __DIRECTIONS[round(azimuth / 22.5) % 16],
+            'windgusts': round(windforce * 3.5 + rnd.random(), 2),
+            'precipitation': round(rnd.choice((0, 0, 0, rnd.uniform(0, 8))),
+                                   1),
+            'sunpower': rnd.randrange(0, 900),
+            'rainlasthour': round(rnd.uniform(0, 3), 1),
+            'rainlast24hour': round(rnd.uniform(0, 30), 1),
+        }
+        __corrupt(rnd, station, __STATION_VALUES, invalid, missing)
+        result.append(station)
+    return result
+
+
+def generate_forecast(days=5, invalid=0.0, missing=0.0, seed=None,
+                      now=None):
+    """Generate the (neutral) data of the forecast days."""
+    rnd = random.Random(seed)
+    today = __measured(now).replace(hour=0, minute=0, second=0)
+    result = []
+    for daycnt in range(1, days + 1):
+        mintemp = rnd.randrange(-10, 20)
+        maxtemp = mintemp + rnd.randrange(2, 12)
+        rainmin = round(rnd.choice((0, rnd.uniform(0, 10))), 1)
+        day = {
+            'day': today + timedelta(days=daycnt),
+            'code': rnd.choice(__CODES),
+            'mintempmin': mintemp,
+            'mintempmax': mintemp + rnd.randrange(3),
+            'maxtempmin': maxtemp,
+            'maxtempmax': maxtemp + rnd.randrange(3),
+            'rainchance': rnd.randrange(0, 101),
+            'sunchance': rnd.randrange(0, 101),
+            'rainmin': rainmin,
+            'rainmax': round(rainmin * rnd.uniform(1, 2), 1),
+            'wind': rnd.randrange(1, 9),
+            'winddirection': rnd.choice(__DIRECTIONS).lower(),
+        }
+        __corrupt(rnd, day, __DAY_VALUES, invalid, missing)
+        result.append(day)
+    return result
+
+
+def json_feed(stations=50, days=5, invalid=0.0, missing=0.0, seed=None,
+              now=None):
+    """Generate a json feed (like api.buienradar.nl/data/public/2.0)."""
+    measured = __measured(now)
+    measurements = []
+    for station in generate_stations(stations, invalid, missing, seed, now):
+        record = {
+            'stationid': station['id'],
+            'stationname': station['name'],
+            'regio': station['region'],
+            'timestamp': station['timestamp'].isoformat(),
+            'graphurl': __GRAPHURL % station['id'],
+            'iconurl': __ICONURL % station['code'],
+            'weatherdescription': station['description'],
+        }
+        for name, (key, _) in __FIELDS.items():
+            if name in station:
+                record[key] = __json_value(station[name])
+        measurements.append(record)
+
+    forecast = []
+    for day in generate_forecast(days, invalid, missing, seed, now):
+        record = {
+            'day': day['day'].isoformat(),
+            'mintemperature': __json_text(day.get('mintempmin')),
+            'maxtemperature': __json_text(day.get('maxtempmax')),
+            'iconurl': __ICONURL % day['code'],
+            'weatherdescription': __BRCONDITIONS[day['code']][3],
+            'windDirection': day['winddirection'],
+        }
+        for name, key in (('mintempmax', 'mintemperatureMax'),
+                          ('mintempmin', 'mintemperatureMin'),
+                          ('maxtempmax', 'maxtemperatureMax'),
+                          ('maxtempmin', 'maxtemperatureMin'),
+                          ('rainchance', 'rainChance'),
+                          ('sunchance', 'sunChance'),
+                          ('wind', 'wind'),
+                          ('rainmin', 'mmRainMin'),
+                          ('rainmax', 'mmRainMax')):
+            if name in day:
+                record[key] = __json_value(day[name])
+        forecast.append(record)
+
+    return json.dumps({
+        'buienradar': {'copyright': '(C)opyright Buienradar / RTL. Alle '
+                                    'rechten voorbehouden',
+                       'terms': 'Synthetic feed.'},
+        'actual': {
+            'actualradarurl': 'https://api.buienradar.nl/image/1.0/'
+                              'RadarMapNL?w=500&h=512',
+            'sunrise': measured.replace(hour=7, minute=30).isoformat(),
+            'sunset': measured.replace(hour=18, minute=30).isoformat(),
+            'stationmeasurements': measurements,
+        },
+        'forecast': {
+            'weatherreport': {'published': measured.isoformat(),
+                              'title': 'Synthetisch weer',
+                              'summary': 'Synthetische verwachting.',
+                              'text': 'Synthetische verwachting.'},
+            'fivedayforecast': forecast,
+        },
+    }, indent=1)
+
+
+def xml_feed(stations=50, days=5, invalid=0.0, missing=0.0, seed=None,
+             now=None):
+    """
+    Generate an xml feed (like xml.buienradar.nl).
+
+    The xml feed has (at most) 5 forecast days: dag-plus1 .. dag-plus5;
+    more days are generated, but not read by the parser.
+    """
+    lines = ['<buienradarnl>', '<weergegevens>',
+             '<titel>Synthetic feed</titel>', '<actueel_weer>',
+             '<weerstations>']
+    for station in generate_stations(stations, invalid, missing, seed, now):
+        lines.append('<weerstation id="%d">' % station['id'])
+        lines.append('<stationcode>%d</stationcode>' % station['id'])
+        lines.append('<stationnaam regio=%s>%s</stationnaam>'
+                     % (quoteattr(station['region']),
+                        escape(station['name'])))
+        lines.append('<datum>%s</datum>'
+                     % station['timestamp'].strftime('%m/%d/%Y %H:%M:%S'))
+        for name, (_, element) in __FIELDS.items():
+            if element is not None and name in station:
+                lines.append(__xml_element(element, station[name]))
+        lines.append('<icoonactueel ID="%s" zin=%s>%s</icoonactueel>'
+                     % (station['code'], quoteattr(station['description']),
+                        __ICONURL % station['code']))
+        lines.append('<url>%s</url>' % (__GRAPHURL % station['id']))
+        lines.append('</weerstation>')
+    lines.extend(['</weerstations>', '</actueel_weer>',
+                  '<verwachting_meerdaags>'])
+
+    for daycnt, day in enumerate(
+            generate_forecast(days, invalid, missing, seed, now), 1):
+        lines.append('<dag-plus%d>' % daycnt)
+        lines.append('<datum>%s</datum>' % day['day'].strftime('%d-%m-%Y'))
+        for name, element in (('sunchance', 'kanszon'),
+                              ('rainchance', 'kansregen'),
+                              ('rainmin', 'minmmregen'),
+                              ('rainmax', 'maxmmregen'),
+                              ('mintempmin', 'mintemp'),
+                              ('mintempmax', 'mintempmax'),
+                              ('maxtempmin', 'maxtemp'),
+                              ('maxtempmax', 'maxtempmax'),
+                              ('wind', 'windkracht')):
+            if name in day:
+                lines.append(__xml_element(element, day[name]))
+        lines.append('<windrichting>%s</windrichting>'
+                     % day['winddirection'].upper())
+        lines.append('<icoon ID="%s">%s</icoon>'
+                     % (day['code'], __ICONURL % day['code']))
+        lines.append('<sneeuwcms>0</sneeuwcms>')
+        lines.append('</dag-plus%d>' % daycnt)
+    lines.extend(['</verwachting_meerdaags>', '</weergegevens>',
+                  '</buienradarnl>'])
+    return '\n'.join(lines)
+
+
+def precipitation_data(intervals=25, seed=None, now=None):
+    """
+    Generate the precipitation forecast (like gpsgadget.buienradar.nl).
+
+    Returns intervals lines of 'value|HH:MM' (value 0..255), 5 minutes
+    apart, with a shower somewhere in the forecast.
+    """
+    rnd = random.Random(seed)
+    start = __measured(now)
+    peak = rnd.randrange(intervals)
+    width = rnd.randrange(1, 8)
+    top = rnd.randrange(0, 256)
+    lines = []
+    for index in range(intervals):
+        value = max(0, int(top * (1 - abs(index - peak) / width)))
+        time = start + timedelta(minutes=5 * index)
+        lines.append('%03d|%s' % (value, time.strftime('%H:%M')))
+    return '\r\n'.join(lines) + '\r\n'
+
+
+def write_feeds(directory, stations=10000, days=5, invalid=0.0,
+                missing=0.0, seed=None, now=None):
+    """
+    Write the feeds into directory (with the layout of tests/).
+
+    Returns a dict with the path of each written file.
+    """
+    files = {
+        os.path.join(directory, 'json', 'buienradar.json'):
+            json_feed(stations, days, invalid, missing, seed, now),
+        os.path.join(directory, 'xml', 'buienradar.xml'):
+            xml_feed(stations, days, invalid, missing, seed, now),
+        os.path.join(directory, 'raindata', 'raindata.txt'):
+            precipitation_data(seed=seed, now=now),
+    }
+    for path, content in files.items():
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            file.write(content)
+    return {os.path.basename(os.path.dirname(path)): path for path in files}
+
+
+def __measured(now):
+    """Get the (naive, local) time of the measurements."""
+    if now is None:
+        now = datetime.now()
+    return now.replace(minute=now.minute - now.minute % 10, second=0,
+                       microsecond=0, tzinfo=None)
+
+
+def __corrupt(rnd, record, names, invalid, missing):
+    """Make a fraction of the values in record invalid or missing."""
+    if not invalid and not missing:
+        return
+    for name in names:
+        chance = rnd.random()
+        if chance < missing:
+            del record[name]
+        elif chance < missing + invalid:
+            record[name] = INVALID
+
+
+def __json_value(value):
+    """Get the value in the json feed."""
+    return None if value is INVALID else value
+
+
+def __json_text(value):
+    """Get the value as text (or None) in the json feed."""
+    value = __json_value(value)
+    return None if value is None else str(value)
+
+
+def __xml_element(element, value):
+    """Get the element with the value in the xml feed."""
+    if value is INVALID:
+        value = '-'
+    return '<%s>%s</%s>' % (element, value, element)
+
+
+def main(argv=None):
+    """Write the synthetic feeds."""
+    from docopt import docopt
+
+    args = docopt(__doc__, argv=argv)
+    paths = write_feeds(args['<directory>'],
+                        stations=int(args['--stations']),
+                        days=int(args['--days']),
+                        invalid=float(args['--invalid']),
+                        missing=float(args['--missing']),
+                        seed=int(args['--seed']))
+    for path in paths.values():
+        print("%s: %d bytes" % (path, os.path.getsize(path)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""Export the converted weather stations (columns) to numpy or pandas."""
+import numbers
+
+try:
+    import numpy
+except ImportError:     # pragma: no cover
+    # install buienradar[fast] to export the columns to numpy
+    numpy = None  # type: ignore[assignment]
+
+try:
+    import pandas
+except ImportError:     # pragma: no cover
+    pandas = None  # type: ignore[assignment]
+
+
+def to_numpy(columns):
+    """
+    Convert the columns (see buienradar.convert_stations) to numpy arrays.
+
+    Numeric columns become float arrays, with nan for missing values; the
+    other columns (like CONDITION and MEASURED) become object arrays.
+    """
+    if numpy is None:
+        raise ImportError("numpy is required; install buienradar[fast].")
+
+    arrays = {}
+    for key, values in columns.items():
+        if all(__is_number(value) for value in values):
+            arrays[key] = numpy.array(
+                [numpy.nan if value is None else value for value in values],
+                dtype=float)
+        else:
+            arrays[key] = numpy.empty(len(values), dtype=object)
+            arrays[key][:] = values
+    return arrays
+
+
+def to_dataframe(columns):
+    """Convert the columns (see buienradar.convert_stations) to a DataFrame."""
+    if pandas is None:
+        raise ImportError("pandas is required to export a DataFrame.")
+    return pandas.DataFrame(to_numpy(columns))
+
+
+def __is_number(value):
+    """Check if value is a number (or missing)."""
+    return value is None or (isinstance(value, numbers.Real) and
+                             not isinstance(value, bool))
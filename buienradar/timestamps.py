@@ -0,0 +1,111 @@
+"""Convert the timestamps of buienradar into local (Europe/Amsterdam) time."""
+import re
+from datetime import datetime
+from functools import lru_cache
+from types import ModuleType
+from typing import Optional
+
+import pytz
+
+zoneinfo: Optional[ModuleType]
+try:
+    import zoneinfo
+except ImportError:     # pragma: no cover
+    # python < 3.9; only the PYTZ backend is available
+    zoneinfo = None
+
+# localize using pytz (default):
+PYTZ = 'pytz'
+# localize using the zoneinfo module of the standard library:
+ZONEINFO = 'zoneinfo'
+
+ISO_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+__TIMEZONE = 'Europe/Amsterdam'
+# the (strict) timestamps that datetime.fromisoformat parses the same way
+# as datetime.strptime(val, ISO_FORMAT) does:
+__ISO_TIMESTAMP = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}'
+                             r'T[0-9]{2}:[0-9]{2}:[0-9]{2}\Z')
+
+__timezones = {PYTZ: pytz.timezone(__TIMEZONE)}
+__backend = PYTZ
+
+
+def set_backend(name):
+    """
+    Set the timezone backend used to localize the timestamps.
+
+    name: PYTZ (default) or ZONEINFO
+
+    Both give the same (aware) datetimes, except for the ambiguous hour
+    when the daylight saving time ends: PYTZ selects the standard time,
+    ZONEINFO the daylight saving time (fold=0).
+    Raises ValueError when the backend is unknown or not available.
+    """
+    global __backend
+    if name == ZONEINFO and ZONEINFO not in __timezones:
+        if zoneinfo is None:
+            raise ValueError("Timezone backend not available: %s." % name)
+        __timezones[ZONEINFO] = zoneinfo.ZoneInfo(__TIMEZONE)
+    if name not in __timezones:
+        raise ValueError("Unknown timezone backend: %s." % name)
+    __backend = name
+
+
+def get_backend():
+    """Get the name of the timezone backend in use."""
+    return __backend
+
+
+def timezone():
+    """Get the Europe/Amsterdam timezone of the backend in use."""
+    return __timezones[__backend]
+
+
+def localize(dt):
+    """Localize the naive (Europe/Amsterdam) datetime dt."""
+    return __localize(dt, __backend)
+
+
+def to_localdatetime(val, fmt=ISO_FORMAT):
+    """
+    Convert val (formatted as fmt) into a local datetime.
+
+    The conversions are cached: the same timestamp is used by most weather
+    stations in the feed. Returns None when val is not a valid timestamp.
+    """
+    try:
+        return __convert(val, fmt, __backend)
+    except TypeError:
+        # not hashable:
+        return None
+
+
+def cache_info():
+    """Get the statistics of the cached conversions."""
+    return __convert.cache_info()
+
+
+def cache_clear():
+    """Clear the cached conversions."""
+    __convert.cache_clear()
+
+
+@lru_cache(maxsize=512)
+def __convert(val, fmt, backend):
+    """Convert val into a local datetime (None when invalid)."""
+    try:
+        if fmt == ISO_FORMAT and __ISO_TIMESTAMP.match(val):
+            dt = datetime.fromisoformat(val)
+        else:
+            dt = datetime.strptime(val, fmt)
+    except (AttributeError, ValueError, TypeError):
+        return None
+    return __localize(dt, backend)
+
+
+def __localize(dt, backend):
+    """Localize the naive datetime dt using backend."""
+    if backend == PYTZ:
+        return __timezones[PYTZ].localize(dt)
+    return dt.replace(tzinfo=__timezones[backend])
@@ -1,4 +1,6 @@
 """(functions that generate) URL's to access the buienradar api."""
+import os
+
 JSON_FEED_URL = 'https://data.buienradar.nl/2.0/feed/json'
 XML_FEED_URL = 'https://xml.buienradar.nl/'
 XML_SECONDARY_FEED_URL = 'https://api.buienradar.nl/'
@@ -9,14 +11,47 @@ JSON_PRECIPITATION_URL_TEMPLATE = (
 XML_PRECIPITATION_URL_TEMPLATE = (
     'https://gps.buienradar.nl/getrr.php?lat={lat}&lon={lon}'
 )
+
+# environment variables to use other url's (like a local stand-in server,
+# see buienradar.standin); read on every call:
+BASE_URL_ENV = 'BUIENRADAR_BASE_URL'
+JSON_FEED_URL_ENV = 'BUIENRADAR_JSON_FEED_URL'
+XML_FEED_URL_ENV = 'BUIENRADAR_XML_FEED_URL'
+XML_SECONDARY_FEED_URL_ENV = 'BUIENRADAR_XML_SECONDARY_FEED_URL'
+PRECIPITATION_URL_ENV = 'BUIENRADAR_PRECIPITATION_URL'
+
+# paths of the api's on the server at BUIENRADAR_BASE_URL:
+JSON_FEED_PATH = '/2.0/feed/json'
+XML_FEED_PATH = '/xml/'
+XML_SECONDARY_FEED_PATH = '/api/'
+PRECIPITATION_PATH = '/getrr.php?lat={lat}&lon={lon}'
+
 RADAR_URL_TEMPLATE = (
     'https://api.buienradar.nl/image/1.0/RadarMapNL?w={w}&h={h}'
 )
 
 
+def json_feed_url() -> str:
+    """Get the URL of the json feed."""
+    return __configured(JSON_FEED_URL_ENV, JSON_FEED_PATH, JSON_FEED_URL)
+
+
+def xml_feed_url() -> str:
+    """Get the URL of the xml feed."""
+    return __configured(XML_FEED_URL_ENV, XML_FEED_PATH, XML_FEED_URL)
+
+
+def xml_secondary_feed_url() -> str:
+    """Get the URL of the secondary xml feed."""
+    return __configured(XML_SECONDARY_FEED_URL_ENV, XML_SECONDARY_FEED_PATH,
+                        XML_SECONDARY_FEED_URL)
+
+
 def xml_precipitation_forecast_url(latitude: float, longitude: float) -> str:
     """Build URL to precipation forecast URL."""
-    return XML_PRECIPITATION_URL_TEMPLATE.format(
+    template = __configured(PRECIPITATION_URL_ENV, PRECIPITATION_PATH,
+                            XML_PRECIPITATION_URL_TEMPLATE)
+    return template.format(
         lat=round(latitude, 2),
         lon=round(longitude, 2)
     )
@@ -25,7 +60,9 @@ def xml_precipitation_forecast_url(latitude: float, longitude: float) -> str:
 def json_precipitation_forecast_url(latitude: float, longitude: float) \
         -> str:
     """Build URL to precipation forecast URL (used from json)."""
-    return JSON_PRECIPITATION_URL_TEMPLATE.format(
+    template = __configured(PRECIPITATION_URL_ENV, PRECIPITATION_PATH,
+                            JSON_PRECIPITATION_URL_TEMPLATE)
+    return template.format(
         lat=round(latitude, 2),
         lon=round(longitude, 2)
     )
@@ -44,3 +81,18 @@ def radar_url(width: int = 500, height: int = 512) -> str:
         raise ValueError("Illegal height, valid rang: 120-765")
 
     return RADAR_URL_TEMPLATE.format(w=width, h=height)
+
+
+def __configured(name, path, default):
+    """
+    Get the URL configured in environment variable name.
+
+    Otherwise path on the server in BUIENRADAR_BASE_URL, or the default.
+    """
+    url = os.environ.get(name)
+    if url:
+        return url
+    base = os.environ.get(BASE_URL_ENV)
+    if base:
+        return base.rstrip('/') + path
+    return default
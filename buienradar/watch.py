@@ -0,0 +1,81 @@
+"""
+Keep the weather data of a location up to date (cli watch mode).
+
+The data is refreshed on a schedule aligned to the updates of buienradar:
+the precipitation forecast is updated every 5 minutes, the feed about every
+10 minutes. The session (connections), the conditional requests and the
+cache are reused between the refreshes; only changed results are emitted.
+"""
+import logging
+import time
+
+from buienradar.buienradar import get_data, parse_data
+from buienradar.cache import FeedCache
+from buienradar.constants import CONTENT, MESSAGE, RAINCONTENT, SUCCESS
+from buienradar.fetch import ConditionalStore, create_session
+
+# the precipitation forecast (getrr.php) is updated every 5 minutes:
+RAIN_INTERVAL = 300
+# the feed is updated about every 10 minutes:
+FEED_INTERVAL = 600
+# seconds to wait after an update, before refreshing:
+DELAY = 30
+
+log = logging.getLogger(__name__)
+
+
+def next_refresh(now, interval=RAIN_INTERVAL, delay=DELAY):
+    """Get the (unix) time of the next refresh: delay after an interval."""
+    return ((now - delay) // interval + 1) * interval + delay
+
+
+def watch(latitude, longitude, emit, usexml=False, timeframe=60,
+          interval=RAIN_INTERVAL, delay=DELAY, iterations=None,
+          session=None, sleep=time.sleep, clock=time.time):
+    """
+    Refresh the weather data of the location until stopped.
+
+    emit: function called with the (parsed) result when it changed
+    interval: seconds between the refreshes (aligned to the clock)
+    delay: seconds to wait after the aligned time, for the data to update
+    iterations: max number of refreshes (None: forever)
+    session: optional requests.Session (see fetch.create_session)
+    sleep, clock: functions to wait and get the current (unix) time
+
+    The feed is cached for FEED_INTERVAL seconds after it was last modified
+    and requested using conditional requests; the (small) precipitation
+    forecast is requested at every refresh. Returns the number of emitted
+    results.
+    """
+    if session is None:
+        session = create_session()
+    conditional = ConditionalStore()
+    cache = FeedCache(maxsize=4, feed_ttl=FEED_INTERVAL,
+                      rain_ttl=interval / 2, clock=clock)
+
+    contents = None
+    previous = None
+    emitted = 0
+    count = 0
+    while iterations is None or count < iterations:
+        if count:
+            sleep(max(0, next_refresh(clock(), interval, delay) - clock()))
+        count += 1
+
+        data = get_data(latitude, longitude, usexml, session=session,
+                        conditional=conditional, cache=cache)
+        if not data[SUCCESS]:
+            log.warning("Refreshing the data failed: %s", data[MESSAGE])
+            continue
+        if (data[CONTENT], data[RAINCONTENT]) == contents:
+            log.debug("Data not changed.")
+            continue
+        contents = (data[CONTENT], data[RAINCONTENT])
+
+        result = parse_data(data[CONTENT], data[RAINCONTENT], latitude,
+                            longitude, timeframe, usexml)
+        if result != previous:
+            emit(result)
+            emitted += 1
+            previous = result
+    return emitted
@@ -0,0 +1,128 @@
+"""Streaming extraction of elements from the buienradar xml feed."""
+from xml.parsers import expat
+
+ExpatError = expat.ExpatError
+
+# number of characters of a str encoded (and parsed) at a time:
+CHUNK_SIZE = 65536
+
+__ATTR_PREFIX = '@'
+__TEXT_KEY = '#text'
+
+
+def extract(content, root, paths):
+    """
+    Parse the xml content, only materializing the elements at paths.
+
+    root: expected name of the root element
+    paths: tuples with the element names from the root, like
+           ('buienradarnl', 'weergegevens', 'verwachting_meerdaags')
+
+    Returns a dict with the value of each path found in the content, or
+    None when the root element is not named root. The values are built the
+    same way as xmltodict.parse does: attributes as '@name', the (stripped)
+    text as '#text' or the value itself, a list for repeated elements and
+    None for empty elements. All other elements are skipped while parsing.
+
+    Raises ExpatError when the content is not valid xml and ValueError when
+    it declares entities.
+    """
+    targets = set(paths)
+    prefixes = {path[:i] for path in targets for i in range(1, len(path) + 1)}
+    found = {}
+    roots = []
+    path = []
+    stack = []
+    # number of leading elements of path that are (a prefix of) a target:
+    matched = 0
+    # depth of the target being materialized (0 when skipping elements):
+    capture = 0
+    item = None
+    data = []
+
+    def start(name, attrs):
+        nonlocal matched, capture, item, data
+        path.append(name)
+        depth = len(path)
+        if depth == 1:
+            roots.append(name)
+        if not capture:
+            if matched != depth - 1:
+                return
+            current = tuple(path)
+            if current not in prefixes:
+                return
+            matched = depth
+            if current not in targets:
+                return
+            capture = depth
+
+        stack.append((item, data))
+        item = {__ATTR_PREFIX + attrs[i]: attrs[i + 1]
+                for i in range(0, len(attrs), 2)} or None
+        data = []
+
+    def end(name):
+        nonlocal matched, capture, item, data
+        depth = len(path)
+        if capture:
+            text = (''.join(data).strip() or None) if data else None
+            value = item
+            item, data = stack.pop()
+            if value is None:
+                value = text
+            elif text:
+                __push(value, __TEXT_KEY, text)
+
+            if depth == capture:
+                found.setdefault(tuple(path), []).append(value)
+                capture = 0
+            else:
+                item = __push(item, name, value)
+
+        if matched == depth:
+            matched -= 1
+        path.pop()
+
+    def characters(text):
+        if capture:
+            data.append(text)
+
+    def forbid_entities(*args):
+        raise ValueError("entities are disabled")
+
+    encoding = 'utf-8' if isinstance(content, str) else None
+    parser = expat.ParserCreate(encoding)
+    parser.ordered_attributes = True
+    parser.buffer_text = True
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = characters
+    parser.EntityDeclHandler = forbid_entities
+    if encoding is None:
+        parser.Parse(content, True)
+    else:
+        # encode a chunk at a time, not a copy of the complete document:
+        for pos in range(0, len(content), CHUNK_SIZE):
+            parser.Parse(content[pos:pos + CHUNK_SIZE].encode(encoding),
+                         False)
+        parser.Parse(b'', True)
+
+    if roots != [root]:
+        return None
+    return {key: values[0] if len(values) == 1 else values
+            for key, values in found.items()}
+
+
+def __push(item, key, value):
+    """Add value to item, turning repeated keys into a list."""
+    if item is None:
+        item = {}
+    if key in item:
+        if isinstance(item[key], list):
+            item[key].append(value)
+        else:
+            item[key] = [item[key], value]
+    else:
+        item[key] = value
+    return item
@@ -73,18 +73,18 @@ setup(
         'docopt',
         'pytz',
         'requests',
-        'xmltodict',
         'vincenty',
     ],
 
-    # # List additional groups of dependencies here (e.g. development
-    # # dependencies). You can install these using the following syntax,
-    # # for example:
-    # # $ pip install -e .[dev,test]
-    # extras_require={
-    #     'dev': ['check-manifest'],
-    #     'test': ['coverage'],
-    # },
+    # List additional groups of dependencies here (e.g. development
+    # dependencies). You can install these using the following syntax,
+    # for example:
+    # $ pip install -e .[fast,async]
+    extras_require={
+        'async': ['aiohttp'],
+        'fast': ['numpy', 'orjson'],
+        'pandas': ['numpy', 'pandas'],
+    },
 
     # # If there are data files included in your packages that need to be
     # # installed, specify them here.  If using Python 2.6 or less, then these
@@ -0,0 +1,207 @@
+"""Testing the asyncio variants of get_data."""
+import asyncio
+
+import pytest
+
+from buienradar.constants import (
+    CONTENT,
+    MESSAGE,
+    NOT_MODIFIED,
+    RAINCONTENT,
+    SUCCESS
+)
+from buienradar.fetch import ConditionalStore
+from buienradar.urls import (
+    JSON_FEED_URL,
+    XML_FEED_URL,
+    XML_SECONDARY_FEED_URL,
+    json_precipitation_forecast_url
+)
+
+aiohttp = pytest.importorskip('aiohttp')
+
+from buienradar.buienradar_async import async_get_data  # noqa: E402
+
+
+def load_file(name):
+    """Load a file with test data."""
+    file = open(name, 'r')
+    data = file.read()
+    file.close()
+    return data
+
+
+class FakeResponse:
+    """Fake aiohttp response."""
+
+    def __init__(self, status, body, headers=None):
+        """Initialize the response."""
+        self.status = status
+        self.headers = headers or {}
+        self.body = body
+
+    async def __aenter__(self):
+        """Enter the response context."""
+        return self
+
+    async def __aexit__(self, *args):
+        """Exit the response context."""
+
+    async def text(self):
+        """Return the body of the response."""
+        return self.body
+
+
+class FakeSession:
+    """Fake aiohttp session, returning responses per url."""
+
+    def __init__(self):
+        """Initialize the session without responses."""
+        self.responses = {}
+        self.requested = []
+
+    def add(self, url, body='', status=200, exception=None, headers=None):
+        """Add the response (or exception) for an url."""
+        self.responses[url] = (status, body, exception, headers)
+
+    def get(self, url, headers=None):
+        """Return the response for the url."""
+        self.requested.append((url, headers))
+        status, body, exception, response_headers = self.responses.get(
+            url, (404, '', None, None))
+        if exception is not None:
+            raise exception
+        if headers and headers.get('If-None-Match') == \
+                (response_headers or {}).get('ETag'):
+            return FakeResponse(304, '', response_headers)
+        return FakeResponse(status, body, response_headers)
+
+
+class FakeSessionContext:
+    """Context manager returning the fake session."""
+
+    def __init__(self, session):
+        """Initialize the context with the session."""
+        self.session = session
+
+    async def __aenter__(self):
+        """Return the session."""
+        return self.session
+
+    async def __aexit__(self, *args):
+        """Close the (fake) session."""
+
+
+def test_async_get_json_data():
+    """Test getting json and rain data."""
+    latitude = 52.091579
+    longitude = 5.119734
+    data = load_file('tests/json/buienradar.json')
+    raindata = load_file('tests/raindata/raindata.txt')
+
+    session = FakeSession()
+    session.add(JSON_FEED_URL, body=data)
+    session.add(json_precipitation_forecast_url(latitude, longitude),
+                body=raindata)
+
+    result = asyncio.run(async_get_data(latitude, longitude,
+                                        session=session))
+
+    assert (result == {SUCCESS: True, MESSAGE: None,
+                       CONTENT: data, RAINCONTENT: raindata})
+
+
+def test_async_get_xml_data():
+    """Test getting xml data, falling back on the secondary url."""
+    latitude = 52.091579
+    longitude = 5.119734
+    data = load_file('tests/xml/buienradar.xml')
+
+    session = FakeSession()
+    session.add(XML_FEED_URL, status=500)
+    session.add(XML_SECONDARY_FEED_URL, body=data)
+
+    result = asyncio.run(async_get_data(latitude, longitude,
+                                        usexml=True, session=session))
+
+    assert (result[SUCCESS])
+    assert (result[CONTENT] == data)
+    assert (result[RAINCONTENT] is None)
+    assert (result[MESSAGE] == 'Status: 404, Msg: Got http statuscode: 404.')
+    requested = [url for url, _headers in session.requested]
+    assert (requested.index(XML_FEED_URL) <
+            requested.index(XML_SECONDARY_FEED_URL))
+
+
+def test_async_get_data_errors():
+    """Test getting data when the requests fail."""
+    session = FakeSession()
+    session.add(JSON_FEED_URL,
+                exception=aiohttp.ClientConnectionError('no connection'))
+    session.add(json_precipitation_forecast_url(52.1, 5.1),
+                exception=asyncio.TimeoutError())
+
+    result = asyncio.run(async_get_data(52.1, 5.1, session=session))
+
+    assert (result[SUCCESS] is False)
+    assert (result[CONTENT] is None and result[RAINCONTENT] is None)
+    assert (result[MESSAGE] == 'Msg: Error getting url data. ')
+
+    # without session, a session is created for the call:
+    session.add(json_precipitation_forecast_url(52.1, 5.1), body='rain')
+    created = []
+
+    def client_session():
+        created.append(session)
+        return FakeSessionContext(session)
+
+    client = aiohttp.ClientSession
+    aiohttp.ClientSession = client_session
+    try:
+        result = asyncio.run(async_get_data(52.1, 5.1))
+    finally:
+        aiohttp.ClientSession = client
+    assert (created == [session])
+    assert (result[MESSAGE] == 'Msg: Error getting url data. no connection')
+    assert (result[RAINCONTENT] == 'rain')
+
+
+def test_async_get_data_concurrent():
+    """Test getting data for many locations on one event loop."""
+    locations = [(52.0 + i / 100, 5.0 + i / 100) for i in range(50)]
+
+    session = FakeSession()
+    session.add(JSON_FEED_URL, body='{}')
+    for latitude, longitude in locations:
+        session.add(json_precipitation_forecast_url(latitude, longitude),
+                    body='%s|%s' % (latitude, longitude))
+
+    async def get_all():
+        return await asyncio.gather(*[
+            async_get_data(latitude, longitude, session=session)
+            for latitude, longitude in locations])
+
+    results = asyncio.run(get_all())
+
+    for (latitude, longitude), result in zip(locations, results):
+        assert (result[SUCCESS])
+        assert (result[RAINCONTENT] == '%s|%s' % (latitude, longitude))
+
+
+def test_async_get_data_conditional():
+    """Test conditional requests return the stored content on a 304."""
+    session = FakeSession()
+    session.add(JSON_FEED_URL, body='{}', headers={'ETag': '"v1"'})
+    session.add(json_precipitation_forecast_url(52.1, 5.1), body='rain')
+    conditional = ConditionalStore()
+
+    result = asyncio.run(async_get_data(52.1, 5.1, session=session,
+                                        conditional=conditional))
+    assert (result[SUCCESS] and result[NOT_MODIFIED] is False)
+    assert (result[CONTENT] == '{}')
+
+    result = asyncio.run(async_get_data(52.1, 5.1, session=session,
+                                        conditional=conditional))
+    assert (result[SUCCESS] and result[NOT_MODIFIED] is True)
+    assert (result[CONTENT] == '{}')
+    assert ((JSON_FEED_URL, {'If-None-Match': '"v1"'}) in session.requested)
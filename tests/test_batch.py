@@ -0,0 +1,152 @@
+"""Testing the batch mode for many locations."""
+import io
+import json
+import re
+import sys
+
+import requests_mock
+
+from buienradar.__main__ import main
+from buienradar.batch import (
+    CSV,
+    NDJSON,
+    process_locations,
+    read_locations,
+    to_json,
+    write_ndjson
+)
+from buienradar.buienradar import parse_data
+from buienradar.constants import (
+    DATA,
+    DISTANCE,
+    LATITUDE,
+    LONGITUDE,
+    MEASURED,
+    MESSAGE,
+    STATIONNAME,
+    SUCCESS
+)
+from buienradar.urls import JSON_FEED_URL, XML_FEED_URL
+
+RAIN_URL = re.compile(r'https://gps\.buienradar\.nl/getrr\.php')
+
+
+def load_file(name):
+    """Load a file with test data."""
+    file = open(name, 'r')
+    data = file.read()
+    file.close()
+    return data
+
+
+def test_read_locations():
+    """Test reading the locations from csv and ndjson."""
+    file = io.StringIO("52.1,5.1\n\n 53.1 , 6.1 \nx,5.1\n")
+    locations = list(read_locations(file))
+    assert (locations[:2] == [{LATITUDE: 52.1, LONGITUDE: 5.1},
+                              {LATITUDE: 53.1, LONGITUDE: 6.1}])
+    assert (locations[2][LATITUDE] is None)
+    assert (locations[2][SUCCESS] is False and locations[2][MESSAGE])
+
+    file = io.StringIO("id,Longitude,Latitude\na,5.1,52.1\nb,6.1,53.1\n")
+    locations = list(read_locations(file, CSV))
+    assert (locations == [{'id': 'a', LATITUDE: 52.1, LONGITUDE: 5.1},
+                          {'id': 'b', LATITUDE: 53.1, LONGITUDE: 6.1}])
+
+    file = io.StringIO('{"id": 1, "latitude": 52.1, "longitude": "5.1"}\n'
+                       '{"latitude": 52.1}\n'
+                       'invalid\n'
+                       '[52.1, 5.1]\n')
+    locations = list(read_locations(file))
+    assert (locations[0] == {'id': 1, LATITUDE: 52.1, LONGITUDE: 5.1})
+    assert (all(location[SUCCESS] is False and location[LATITUDE] is None
+                for location in locations[1:]))
+
+    assert (list(read_locations(io.StringIO("52.1,5.1\n"), NDJSON))[0][
+        SUCCESS] is False)
+    assert (list(read_locations(io.StringIO(""))) == [])
+
+
+def test_process_locations():
+    """Test the feed is retrieved once and the rain once per location."""
+    feed = load_file('tests/json/buienradar.json')
+    raindata = load_file('tests/raindata/raindata77.txt')
+    locations = [{LATITUDE: 52.1, LONGITUDE: 5.1},
+                 {LATITUDE: 53.1, LONGITUDE: 6.1},
+                 {LATITUDE: 52.101, LONGITUDE: 5.099},
+                 {LATITUDE: None, LONGITUDE: None, SUCCESS: False},
+                 {LATITUDE: 51.5, LONGITUDE: 4.0}] * 10
+
+    with requests_mock.Mocker() as m:
+        m.get(JSON_FEED_URL, text=feed)
+        m.get(RAIN_URL, text=raindata)
+        results = list(process_locations(locations, workers=4))
+
+        # the feed once, the rain for each (rounded) location once:
+        assert (m.call_count == 4)
+
+    assert (len(results) == 50)
+    for location, result in zip(locations, results):
+        if location[LATITUDE] is None:
+            assert (result[SUCCESS] is False)
+            continue
+        expected = parse_data(feed, raindata, location[LATITUDE],
+                              location[LONGITUDE])
+        assert (result[SUCCESS] is True)
+        assert (result[DATA][STATIONNAME] == expected[DATA][STATIONNAME])
+        assert (result[DISTANCE] == expected[DISTANCE])
+        assert (result[LATITUDE] == location[LATITUDE])
+
+
+def test_process_locations_failed():
+    """Test the results when the feed can not be retrieved."""
+    locations = [{LATITUDE: 52.1, LONGITUDE: 5.1}]
+    with requests_mock.Mocker() as m:
+        m.get(JSON_FEED_URL, status_code=500)
+        m.get(RAIN_URL, text='')
+        results = list(process_locations(locations))
+
+    assert (results[0][SUCCESS] is False and results[0][DATA] is None)
+    assert ('500' in results[0][MESSAGE])
+
+
+def test_write_ndjson():
+    """Test writing the results as ndjson."""
+    feed = load_file('tests/json/buienradar.json')
+    result = parse_data(feed, None)
+    file = io.StringIO()
+
+    write_ndjson([result, {SUCCESS: False}], file)
+
+    lines = file.getvalue().splitlines()
+    assert (len(lines) == 2)
+    data = json.loads(lines[0])[DATA]
+    assert (data[MEASURED] == result[DATA][MEASURED].isoformat())
+    assert (json.loads(lines[1]) == {SUCCESS: False})
+    assert (to_json({'name': 'Zuid-Limburg é'}) ==
+            '{"name": "Zuid-Limburg é"}')
+
+
+def test_main_batch(tmpdir, monkeypatch, capsys):
+    """Test the batch mode of the cli (xml feed)."""
+    feed = load_file('tests/xml/buienradar.xml')
+    raindata = load_file('tests/raindata/raindata77.txt')
+    name = str(tmpdir.join('locations.csv'))
+    with open(name, 'w') as file:
+        file.write("latitude,longitude\n52.1,5.1\n53.1,6.1\n")
+
+    with requests_mock.Mocker() as m:
+        m.get(XML_FEED_URL, text=feed)
+        m.get(RAIN_URL, text=raindata)
+        main(['--batch=' + name, '--usexml', '--workers=2'])
+
+        monkeypatch.setattr(sys, 'stdin', io.StringIO(
+            '{"latitude": 52.1, "longitude": 5.1}\n'))
+        main(['--batch=-', '--usexml', '--timeframe=30'])
+
+    lines = capsys.readouterr().out.splitlines()
+    results = [json.loads(line) for line in lines]
+    assert (len(results) == 3)
+    assert (all(result[SUCCESS] for result in results))
+    assert ([result[LATITUDE] for result in results] == [52.1, 53.1, 52.1])
+    assert (results[2][DATA]['precipitation_forecast']['timeframe'] == 30)
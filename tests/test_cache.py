@@ -0,0 +1,237 @@
+"""Testing the cache for the feed and precipitation data."""
+import threading
+
+import requests_mock
+
+from buienradar import buienradar_json
+from buienradar.buienradar import get_data
+from buienradar.cache import FeedCache, expires_at
+from buienradar.constants import (
+    CONTENT,
+    HEADERS,
+    MESSAGE,
+    RAINCONTENT,
+    SUCCESS
+)
+from buienradar.urls import (
+    JSON_FEED_URL,
+    XML_FEED_URL,
+    XML_SECONDARY_FEED_URL,
+    json_precipitation_forecast_url
+)
+
+# Sat, 18 Oct 2025 10:00:00 GMT
+MODIFIED = 1760781600
+
+
+class Clock:
+    """Fake clock for testing."""
+
+    def __init__(self, now):
+        """Initialize the clock."""
+        self.now = now
+
+    def __call__(self):
+        """Return the current time."""
+        return self.now
+
+
+def test_expires_at():
+    """Test determining the expiry time of a result."""
+    headers = {'Last-Modified': 'Sat, 18 Oct 2025 10:00:00 GMT'}
+    result = {SUCCESS: True, HEADERS: headers}
+
+    # no (valid) Last-Modified header:
+    assert (expires_at({SUCCESS: True}, 600, MODIFIED) == MODIFIED + 600)
+    assert (expires_at({SUCCESS: True, HEADERS: {'Last-Modified': 'x'}},
+                       600, MODIFIED) == MODIFIED + 600)
+
+    # expires ttl seconds after the data was modified:
+    assert (expires_at(result, 600, MODIFIED + 100) == MODIFIED + 600)
+    # but at least min_ttl seconds from now:
+    assert (expires_at(result, 600, MODIFIED + 590) == MODIFIED + 620)
+    assert (expires_at(result, 600, MODIFIED + 900, 10) == MODIFIED + 910)
+    # and at most ttl seconds from now:
+    assert (expires_at(result, 600, MODIFIED - 100) == MODIFIED + 500)
+
+
+def test_feed_cache():
+    """Test the time to live and lru eviction of the cache."""
+    clock = Clock(MODIFIED)
+    cache = FeedCache(maxsize=2, clock=clock)
+    calls = []
+
+    def func(name):
+        calls.append(name)
+        return {SUCCESS: name != 'failed', CONTENT: name}
+
+    assert (cache.fetch('a', 60, func, 'a')[CONTENT] == 'a')
+    assert (cache.fetch('a', 60, func, 'a')[CONTENT] == 'a')
+    assert (calls == ['a'])
+    assert (cache.stats() == {'hits': 1, 'misses': 1, 'coalesced': 0,
+                              'size': 1,
+                              'maxsize': 2})
+
+    # failed results are not cached:
+    cache.fetch('failed', 60, func, 'failed')
+    cache.fetch('failed', 60, func, 'failed')
+    assert (calls == ['a', 'failed', 'failed'])
+
+    # expired results are retrieved again:
+    clock.now += 61
+    cache.fetch('a', 60, func, 'a')
+    assert (calls == ['a', 'failed', 'failed', 'a'])
+
+    # the least recently used result is removed:
+    cache.fetch('b', 60, func, 'b')
+    cache.fetch('a', 60, func, 'a')
+    cache.fetch('c', 60, func, 'c')
+    assert (len(cache) == 2)
+    assert (cache.get('b') is None)
+    assert (cache.get('a')[CONTENT] == 'a')
+
+    cache.clear()
+    assert (len(cache) == 0)
+
+
+def test_get_data_cache():
+    """Test get_data shares the retrieved data using the cache."""
+    cache = FeedCache()
+    with requests_mock.Mocker() as m:
+        m.get(JSON_FEED_URL, text='json')
+        m.get(XML_FEED_URL, status_code=500)
+        m.get(XML_SECONDARY_FEED_URL, text='xml')
+        m.get(json_precipitation_forecast_url(52.1, 5.1), text='rain1')
+        m.get(json_precipitation_forecast_url(53.1, 6.1), text='rain2')
+
+        for _ in range(3):
+            result = get_data(52.1, 5.1, cache=cache)
+            assert (result == {SUCCESS: True, MESSAGE: None,
+                               CONTENT: 'json', RAINCONTENT: 'rain1'})
+        assert (m.call_count == 2)
+
+        result = get_data(53.1, 6.1, cache=cache)
+        assert (result[CONTENT] == 'json' and result[RAINCONTENT] == 'rain2')
+        assert (m.call_count == 3)
+
+        # the (secondary) xml feed is cached, including the fallback:
+        for _ in range(2):
+            result = get_data(52.1, 5.1, usexml=True, cache=cache)
+            assert (result[CONTENT] == 'xml')
+            assert (result[RAINCONTENT] == 'rain1')
+        assert (m.call_count == 5)
+
+    assert (cache.stats()['hits'] == 8)
+
+
+def test_fetch_coalesced():
+    """Test concurrent fetches for the same key share one request."""
+    cache = FeedCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def func(name):
+        calls.append(name)
+        started.set()
+        release.wait(5)
+        return {SUCCESS: True, CONTENT: name}
+
+    results = []
+
+    def fetch():
+        results.append(cache.fetch('a', 60, func, 'a'))
+
+    leader = threading.Thread(target=fetch)
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=fetch) for _ in range(5)]
+    for thread in followers:
+        thread.start()
+    # wait for the followers to join the request in flight:
+    while cache.stats()['coalesced'] < 5:
+        threading.Event().wait(0.001)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert (calls == ['a'])
+    assert (len(results) == 6)
+    assert (all(result is results[0] for result in results))
+    # only the request in flight is a miss:
+    stats = cache.stats()
+    assert ((stats['hits'], stats['misses'], stats['coalesced']) ==
+            (0, 1, 5))
+
+
+def test_fetch_coalesced_exception():
+    """Test waiting callers retry when the request in flight raises."""
+    cache = FeedCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def func(name):
+        calls.append(name)
+        if len(calls) == 1:
+            started.set()
+            release.wait(5)
+            raise RuntimeError(name)
+        return {SUCCESS: True, CONTENT: name}
+
+    errors = []
+
+    def lead():
+        try:
+            cache.fetch('a', 60, func, 'a')
+        except RuntimeError as err:
+            errors.append(err)
+
+    results = []
+    leader = threading.Thread(target=lead)
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(
+        target=lambda: results.append(cache.fetch('a', 60, func, 'a')))
+    follower.start()
+    while cache.stats()['coalesced'] < 1:
+        threading.Event().wait(0.001)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert (len(errors) == 1)
+    assert (results == [{SUCCESS: True, CONTENT: 'a'}])
+    assert (calls == ['a', 'a'])
+
+
+def test_get_data_coalesced(monkeypatch):
+    """Test nearby locations share the precipitation request."""
+    cache = FeedCache()
+    requested = []
+    lock = threading.Lock()
+
+    def get_url(url, session=None, fetch=True, conditional=None):
+        with lock:
+            requested.append(url)
+        threading.Event().wait(0.05)
+        return {SUCCESS: True, MESSAGE: None, CONTENT: url}
+
+    monkeypatch.setattr(buienradar_json, 'get_url', get_url)
+
+    # all locations round to the same grid cell (52.09, 5.12):
+    locations = [(52.091 + i / 10000, 5.119 + i / 10000) for i in range(8)]
+    results = []
+    threads = [threading.Thread(
+        target=lambda lat, lon: results.append(
+            get_data(lat, lon, cache=cache)),
+        args=location) for location in locations]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    rain_url = json_precipitation_forecast_url(52.09, 5.12)
+    assert (sorted(requested) == sorted([JSON_FEED_URL, rain_url]))
+    assert (len(results) == 8)
+    assert (all(result[RAINCONTENT] == rain_url for result in results))
@@ -1,4 +1,10 @@
 """Basic testing for CLI."""
+import subprocess
+import sys
+from importlib.metadata import version
+
+import pytest
+
 from buienradar.__main__ import main
 
 
@@ -27,3 +33,29 @@ def test_main_usexml():
 
     # test calling results in the loop close cleanly
     assert main(args) is None
+
+
+def test_main_version(capsys):
+    """Test printing the version of the installed package."""
+    with pytest.raises(SystemExit):
+        main(['--version'])
+
+    assert (capsys.readouterr().out.strip() == version('buienradar'))
+
+
+def test_lazy_imports():
+    """Test the slow (optional) dependencies are imported on first use."""
+    code = ("import sys\n"
+            "import buienradar.__main__\n"
+            "import buienradar.buienradar\n"
+            "print(' '.join(sorted(sys.modules)))\n")
+    output = subprocess.run([sys.executable, '-c', code], check=True,
+                            stdout=subprocess.PIPE,
+                            universal_newlines=True).stdout
+    modules = output.split()
+
+    assert ('buienradar.buienradar_json' in modules)
+    # (not importlib.metadata: site hooks of the environment may import it)
+    for name in ('buienradar.buienradar_xml', 'requests', 'numpy',
+                 'pkg_resources'):
+        assert (name not in modules)
@@ -0,0 +1,73 @@
+"""Testing the interned weather conditions."""
+import pytest
+
+from buienradar.buienradar import condition_from_code, parse_data
+from buienradar.conditions import CONDITIONS, lookup, with_image
+from buienradar.constants import (
+    CONDCODE,
+    CONDITION,
+    DATA,
+    DETAILED,
+    EXACT,
+    EXACTNL,
+    FORECAST,
+    IMAGE,
+    NIGHTTIME
+)
+
+
+def load_file(name):
+    """Load a file with test data."""
+    file = open(name, 'r')
+    data = file.read()
+    file.close()
+    return data
+
+
+def test_lookup():
+    """Test the shared conditions are read-only and interned."""
+    record = lookup('a', True)
+    assert (record == {CONDCODE: 'a', CONDITION: 'clear',
+                       DETAILED: 'clear',
+                       EXACT: 'Almost fully clear (sunny/clear)',
+                       EXACTNL: 'Vrijwel onbewolkt (zonnig/helder)',
+                       NIGHTTIME: True})
+    assert (record is lookup('a', True) is CONDITIONS[('a', True)])
+    assert (NIGHTTIME not in lookup('a'))
+    assert (lookup('a', False)[NIGHTTIME] is False)
+    assert (lookup('?') is None)
+
+    with pytest.raises(TypeError):
+        record[IMAGE] = 'a.png'
+
+
+def test_with_image():
+    """Test each result gets its own dict with the image."""
+    first = with_image('b', 'b.png', False)
+    second = with_image('b', 'bb.png', True)
+    assert (type(first) is dict)
+    assert (first == dict(lookup('b', False), **{IMAGE: 'b.png'}))
+    assert (second[IMAGE] == 'bb.png' and second[NIGHTTIME] is True)
+    assert (IMAGE not in lookup('b', False))
+    assert (with_image('?', 'x.png') is None)
+
+    result = condition_from_code('b')
+    result[IMAGE] = 'changed'
+    assert (condition_from_code('b') == dict(lookup('b')))
+
+
+def test_parsed_conditions():
+    """Test changing a parsed condition does not affect other results."""
+    for usexml, name in ((False, 'tests/json/buienradar.json'),
+                         (True, 'tests/xml/buienradar.xml')):
+        data = load_file(name)
+        first = parse_data(data, None, usexml=usexml)[DATA]
+        first[CONDITION][CONDITION] = 'changed'
+        for day in first[FORECAST]:
+            day[CONDITION][CONDITION] = 'changed'
+
+        second = parse_data(data, None, usexml=usexml)[DATA]
+        assert (second[CONDITION][CONDITION] != 'changed')
+        assert (all(day[CONDITION][CONDITION] != 'changed'
+                    for day in second[FORECAST]))
+        assert (all(day[CONDITION][IMAGE] for day in second[FORECAST]))
@@ -0,0 +1,275 @@
+"""Testing the retrieval of data using (shared) http sessions."""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import requests_mock
+
+from buienradar import buienradar_json, buienradar_xml, fetch
+from buienradar.buienradar import get_data
+from buienradar.constants import (
+    CONTENT,
+    MESSAGE,
+    NOT_MODIFIED,
+    RAINCONTENT,
+    STATUS_CODE,
+    SUCCESS
+)
+from buienradar.fetch import ConditionalStore, create_session, get_url, submit
+from buienradar.urls import (
+    JSON_FEED_URL,
+    XML_FEED_URL,
+    XML_SECONDARY_FEED_URL,
+    json_precipitation_forecast_url,
+    xml_precipitation_forecast_url
+)
+
+
+def test_create_session():
+    """Test the configuration of the created session."""
+    session = create_session(pool_connections=2, pool_maxsize=4, retries=3,
+                             timeout=(3.05, 10))
+
+    assert (session.timeout == (3.05, 10))
+    for prefix in ('http://', 'https://'):
+        adapter = session.get_adapter(prefix + 'data.buienradar.nl/')
+        assert (adapter._pool_connections == 2)
+        assert (adapter._pool_maxsize == 4)
+        assert (adapter.max_retries.total == 3)
+        assert (500 in adapter.max_retries.status_forcelist)
+
+
+def test_session_timeout():
+    """Test the default timeout of the session is used."""
+    session = create_session(timeout=5)
+    with requests_mock.Mocker() as m:
+        m.get(JSON_FEED_URL, text='{}')
+        session.get(JSON_FEED_URL)
+        assert (m.last_request.timeout == 5)
+
+        session.get(JSON_FEED_URL, timeout=1)
+        assert (m.last_request.timeout == 1)
+
+
+def test_get_url():
+    """Test retrieving data from an url."""
+    session = create_session()
+    with requests_mock.Mocker() as m:
+        m.get(JSON_FEED_URL, text='{}')
+        result = get_url(JSON_FEED_URL, session)
+        assert (result[SUCCESS] and result[CONTENT] == '{}')
+
+        result = get_url(JSON_FEED_URL, session, fetch=False)
+        assert (result[SUCCESS] and CONTENT not in result)
+
+        m.get(JSON_FEED_URL, status_code=404)
+        result = get_url(JSON_FEED_URL, session)
+        assert (result[SUCCESS] is False and result[STATUS_CODE] == 404)
+        assert (result[MESSAGE] == 'Got http statuscode: 404.')
+
+        m.get(JSON_FEED_URL, exc=requests.exceptions.ConnectTimeout)
+        result = get_url(JSON_FEED_URL, session)
+        assert (result[SUCCESS] is False)
+        assert (result[MESSAGE].startswith('Error getting url data.'))
+
+
+def test_get_data_session():
+    """Test get_data uses the given session for all requests."""
+    latitude = 52.091579
+    longitude = 5.119734
+    session = create_session()
+    sent = []
+
+    def send(request, **kwargs):
+        sent.append(request.url)
+        return requests.Session.send(session, request, **kwargs)
+    session.send = send
+
+    with requests_mock.Mocker() as m:
+        m.get(JSON_FEED_URL, text='json')
+        m.get(json_precipitation_forecast_url(latitude, longitude),
+              text='rain')
+        m.get(XML_FEED_URL, status_code=500)
+        m.get(XML_SECONDARY_FEED_URL, text='xml')
+
+        result = get_data(latitude, longitude, session=session)
+        assert (result[SUCCESS])
+        assert (result[CONTENT] == 'json')
+        assert (result[RAINCONTENT] == 'rain')
+
+        result = get_data(latitude, longitude, usexml=True, session=session)
+        assert (result[SUCCESS])
+        assert (result[CONTENT] == 'xml')
+        assert (result[RAINCONTENT] == 'rain')
+
+    # the feed and precipitation forecast are requested concurrently:
+    assert (sorted(sent) == sorted([
+        JSON_FEED_URL,
+        json_precipitation_forecast_url(latitude, longitude),
+        XML_FEED_URL,
+        XML_SECONDARY_FEED_URL,
+        xml_precipitation_forecast_url(latitude, longitude)]))
+    assert (sent.index(XML_FEED_URL) < sent.index(XML_SECONDARY_FEED_URL))
+
+
+def test_get_data_concurrent(monkeypatch):
+    """Test the feed and precipitation forecast are requested in parallel."""
+    latitude = 52.091579
+    longitude = 5.119734
+    # both requests must be in progress at the same time to pass the barrier:
+    barrier = threading.Barrier(2, timeout=5)
+    contents = {JSON_FEED_URL: 'json', XML_FEED_URL: 'xml'}
+
+    def get_url(url, session=None, fetch=True, conditional=None):
+        barrier.wait()
+        return {SUCCESS: True, MESSAGE: None,
+                CONTENT: contents.get(url, 'rain')}
+
+    monkeypatch.setattr(buienradar_json, 'get_url', get_url)
+    monkeypatch.setattr(buienradar_xml, 'get_url', get_url)
+
+    for usexml, content in ((False, 'json'), (True, 'xml')):
+        result = get_data(latitude, longitude, usexml)
+        assert (result == {SUCCESS: True, MESSAGE: None,
+                           CONTENT: content, RAINCONTENT: 'rain'})
+
+
+def test_get_data_many_callers(monkeypatch):
+    """Test more concurrent callers than MAX_WORKERS use at most that."""
+    monkeypatch.setattr(fetch, 'MAX_WORKERS', 2)
+    release = threading.Event()
+    busy = threading.Semaphore(0)
+    threads = {}
+    lock = threading.Lock()
+
+    def get_url(url, session=None, fetch=True, conditional=None):
+        if url != JSON_FEED_URL:
+            name = threading.current_thread().name
+            with lock:
+                threads[name] = threads.get(name, 0) + 1
+            if name.startswith('buienradar'):
+                # keep the pool busy:
+                busy.release()
+                release.wait(5)
+        return {SUCCESS: True, MESSAGE: None, CONTENT: url}
+
+    monkeypatch.setattr(buienradar_json, 'get_url', get_url)
+    results = []
+
+    def caller(name):
+        thread = threading.Thread(
+            target=lambda: results.append(get_data(52.091579, 5.119734)),
+            name=name)
+        thread.start()
+        return thread
+
+    # the first callers saturate the pool:
+    first = [caller('first-%d' % i) for i in range(2)]
+    assert (busy.acquire(timeout=5) and busy.acquire(timeout=5))
+    # the next callers do not wait for the pool:
+    for thread in [caller('next-%d' % i) for i in range(4)]:
+        thread.join(5)
+        assert (not thread.is_alive())
+    release.set()
+    for thread in first:
+        thread.join(5)
+
+    assert (len(results) == 6)
+    assert (all(result[SUCCESS] for result in results))
+    pooled = [name for name in threads if name.startswith('buienradar')]
+    assert (len(pooled) <= 2)
+    assert (sorted(name for name in threads if name not in pooled) ==
+            ['next-0', 'next-1', 'next-2', 'next-3'])
+
+
+def test_submit_executor():
+    """Test running the requests in the executor of the caller."""
+    with ThreadPoolExecutor(max_workers=1,
+                            thread_name_prefix='caller') as executor:
+        future = submit(lambda: threading.current_thread().name,
+                        executor=executor)
+        assert (future.result().startswith('caller'))
+
+    def failing():
+        raise ValueError("failed")
+
+    future = submit(failing)
+    assert (isinstance(future.exception(timeout=5), ValueError))
+
+
+def test_conditional_store():
+    """Test storing validators and content per url."""
+    store = ConditionalStore(maxsize=2)
+    assert (store.request_headers('a') is None)
+    assert (store.content('a') is None)
+
+    store.update('a', {'ETag': '"1"'}, 'content-a')
+    store.update('b', {'Last-Modified': 'Sat, 18 Oct 2025 10:00:00 GMT'},
+                 'content-b')
+    assert (store.request_headers('a') == {'If-None-Match': '"1"'})
+    assert (store.request_headers('b') == {
+        'If-Modified-Since': 'Sat, 18 Oct 2025 10:00:00 GMT'})
+    assert (store.content('a') == 'content-a')
+
+    # least recently used url is removed:
+    store.update('c', {'ETag': '"3"'}, 'content-c')
+    assert (len(store) == 2)
+    assert (store.content('b') is None)
+    assert (store.content('a') == 'content-a')
+
+    # without validators the url is not stored:
+    store.update('a', {}, 'content-a2')
+    assert (store.content('a') is None)
+
+
+def test_get_data_conditional():
+    """Test conditional requests return the stored content on a 304."""
+    latitude = 52.091579
+    longitude = 5.119734
+    conditional = ConditionalStore()
+
+    def respond(request, context):
+        if request.headers.get('If-None-Match') == '"v1"':
+            context.status_code = 304
+            return ''
+        context.headers['ETag'] = '"v1"'
+        return 'json'
+
+    with requests_mock.Mocker() as m:
+        m.get(JSON_FEED_URL, text=respond)
+        m.get(json_precipitation_forecast_url(latitude, longitude),
+              text='rain',
+              headers={'Last-Modified': 'Sat, 18 Oct 2025 10:00:00 GMT'})
+
+        result = get_data(latitude, longitude, conditional=conditional)
+        assert (result == {SUCCESS: True, MESSAGE: None, CONTENT: 'json',
+                           RAINCONTENT: 'rain', NOT_MODIFIED: False})
+
+        result = get_data(latitude, longitude, conditional=conditional)
+        assert (result == {SUCCESS: True, MESSAGE: None, CONTENT: 'json',
+                           RAINCONTENT: 'rain', NOT_MODIFIED: True})
+        assert (m.call_count == 4)
+
+        # the rain request was sent with If-Modified-Since:
+        rain = [r for r in m.request_history if r.url != JSON_FEED_URL]
+        assert ('If-Modified-Since' not in rain[0].headers)
+        assert (rain[1].headers['If-Modified-Since'] ==
+                'Sat, 18 Oct 2025 10:00:00 GMT')
+
+        # not modified, while the content is removed from the store:
+        store = ConditionalStore(maxsize=1)
+        store.update(JSON_FEED_URL, {'ETag': '"v1"'}, 'json')
+
+        def evict(request, context):
+            store.update('other', {'ETag': '"v2"'}, 'other')
+            return respond(request, context)
+
+        m.get(JSON_FEED_URL, text=evict)
+        result = get_url(JSON_FEED_URL, conditional=store)
+        assert (result[SUCCESS] and result[NOT_MODIFIED])
+        assert (result[CONTENT] == 'json')
+
+        # without stored content, no conditional headers are sent:
+        result = get_url(JSON_FEED_URL, conditional=store)
+        assert (result[SUCCESS] and NOT_MODIFIED not in result)
+        assert ('If-None-Match' not in m.last_request.headers)
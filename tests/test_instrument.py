@@ -0,0 +1,142 @@
+"""Testing the timing of the stages of get_data and parse_data."""
+import re
+
+import requests_mock
+
+from buienradar import instrument
+from buienradar.buienradar import get_data, parse_data
+from buienradar.constants import MESSAGE, STATUS_CODE, SUCCESS, TIMINGS
+from buienradar.instrument import (
+    BYTES,
+    CONVERT,
+    CONVERT_FORECAST,
+    DECODE,
+    DURATION,
+    FETCH,
+    FORMAT,
+    GET_DATA,
+    HOST,
+    PARSE_DATA,
+    PARSE_PRECIPITATION,
+    SELECT,
+    STAGE,
+    STATIONS
+)
+from buienradar.urls import JSON_FEED_URL
+
+RAIN_URL = re.compile(r'https://gps\.buienradar\.nl/getrr\.php')
+
+
+def load_file(name):
+    """Load a file with test data."""
+    file = open(name, 'r')
+    data = file.read()
+    file.close()
+    return data
+
+
+def stages(events):
+    """Get the stages of the events."""
+    return [event[STAGE] for event in events]
+
+
+def test_not_instrumented():
+    """Test the stages are not timed without hooks or a collector."""
+    assert (not instrument.enabled())
+    with instrument.stage(FETCH, url='https://example.org/') as details:
+        details[BYTES] = 0
+
+    with instrument.collect() as timings:
+        assert (instrument.enabled())
+    assert (len(timings) == 0)
+    assert (not instrument.enabled())
+
+
+def test_get_data():
+    """Test timing the requests (also those run in another thread)."""
+    content = load_file('tests/json/buienradar.json')
+    with requests_mock.Mocker() as m:
+        m.get(JSON_FEED_URL, text=content)
+        m.get(RAIN_URL, text='000|12:00\n', status_code=500)
+
+        with instrument.collect() as timings:
+            result = get_data(52.1, 5.1)
+        assert (TIMINGS not in result)
+
+    events = list(timings)
+    assert (sorted(stages(events)) == [FETCH, FETCH, GET_DATA])
+    fetched = {event[HOST]: event for event in events
+               if event[STAGE] == FETCH}
+    feed = fetched['data.buienradar.nl']
+    assert (feed[STATUS_CODE] == 200 and feed[SUCCESS])
+    assert (feed[BYTES] == len(content.encode('utf-8')))
+    rain = fetched['gps.buienradar.nl']
+    assert (rain[STATUS_CODE] == 500 and not rain[SUCCESS])
+    assert (events[-1][STAGE] == GET_DATA)
+    assert (events[-1][FORMAT] == 'json')
+    assert (events[-1][DURATION] >= feed[DURATION])
+
+
+def test_parse_data_attach():
+    """Test attaching the timings to the results."""
+    raincontent = load_file('tests/raindata/raindata.txt')
+    expected = [DECODE, SELECT, CONVERT, CONVERT_FORECAST,
+                PARSE_PRECIPITATION, PARSE_DATA]
+    for usexml, name, stations in ((False, 'tests/json/buienradar.json', 52),
+                                   (True, 'tests/xml/buienradar.xml', 41)):
+        content = load_file(name)
+        with instrument.collect(attach=True) as timings:
+            first = parse_data(content, raincontent, 52.1, 5.1, usexml=usexml)
+            second = parse_data(content, None, 52.1, 5.1, usexml=usexml)
+
+        assert (stages(first[TIMINGS]) == expected)
+        assert (stages(second[TIMINGS]) == [DECODE, SELECT, CONVERT,
+                                            CONVERT_FORECAST, PARSE_DATA])
+        assert (len(timings) == 11)
+        decode = first[TIMINGS][0]
+        assert (decode[SUCCESS] and decode[STATIONS] == stations)
+        assert (decode[BYTES] == len(content))
+        assert (first[TIMINGS][1][STATIONS] == stations)
+        assert (all(event[DURATION] >= 0 for event in first[TIMINGS]))
+
+        totals = timings.totals()
+        assert (totals[DECODE] == (first[TIMINGS][0][DURATION] +
+                                   second[TIMINGS][0][DURATION]))
+
+
+def test_parse_failure():
+    """Test the decode stage of invalid content."""
+    for usexml in (False, True):
+        with instrument.collect(attach=True):
+            result = parse_data('<invalid', None, usexml=usexml)
+        assert (not result[SUCCESS])
+        decode, parsed = result[TIMINGS]
+        assert (decode[STAGE] == DECODE and not decode[SUCCESS])
+        assert (decode[MESSAGE] == result[MESSAGE])
+        assert (parsed[STAGE] == PARSE_DATA and not parsed[SUCCESS])
+
+
+def test_hooks():
+    """Test calling the hooks for every event."""
+    events = []
+
+    def failing(event):
+        raise RuntimeError("hook failed")
+
+    instrument.add_hook(failing)
+    instrument.add_hook(events.append)
+    try:
+        assert (instrument.enabled())
+        result = parse_data(load_file('tests/json/buienradar.json'), None)
+        assert (result[SUCCESS])
+        assert (TIMINGS not in result)
+    finally:
+        instrument.remove_hook(failing)
+        instrument.remove_hook(events.append)
+
+    assert (not instrument.enabled())
+    assert (stages(events)[-1] == PARSE_DATA)
+    assert (len(events) == 5)
+
+    parse_data(None, None)
+    assert (len(events) == 5)
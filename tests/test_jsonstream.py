@@ -0,0 +1,120 @@
+"""Testing the json decoders extracting selected sections."""
+import glob
+import json
+
+import pytest
+
+from buienradar import jsonstream
+from buienradar.buienradar import load_feed, parse_for_locations
+from buienradar.constants import DATA, MESSAGE, SUCCESS
+from buienradar.jsonstream import (
+    DECODERS,
+    JSON,
+    extract,
+    get_decoder,
+    register_decoder
+)
+
+STATIONS = ('actual', 'stationmeasurements')
+FORECAST = ('forecast', 'fivedayforecast')
+
+
+def load_file(name):
+    """Load a file with test data."""
+    file = open(name, 'r')
+    data = file.read()
+    file.close()
+    return data
+
+
+def expected_paths(content, paths):
+    """Select the paths from the document decoded using json.loads."""
+    data = json.loads(content)
+    found = {}
+    for path in paths:
+        value = data
+        try:
+            for key in path:
+                value = value[key]
+        except (KeyError, TypeError):
+            continue
+        found[path] = value
+    return found
+
+
+def test_decoders_same_result():
+    """Test all decoders extract the same sections from the test files."""
+    for name in sorted(glob.glob('tests/json/*.json')):
+        content = load_file(name)
+        try:
+            expected = expected_paths(content, (STATIONS, FORECAST))
+        except ValueError:
+            for decoder in DECODERS:
+                with pytest.raises(ValueError):
+                    extract(content, (STATIONS, FORECAST), decoder)
+            continue
+
+        for decoder in DECODERS:
+            result = extract(content, (STATIONS, FORECAST), decoder)
+            assert (result == expected), (name, decoder)
+
+
+def test_extract():
+    """Test extracting the paths from documents."""
+    content = ' {"a": {"b": [1, {"c": 2}], "c": null}, "x": "}{", ' \
+              '"d": {"e": 1.5, "a": {}}, "f": 3, "d": {"e": 2}} '
+    paths = [('a', 'b'), ('a', 'c'), ('d', 'e'), ('f', 'g'), ('x', 'y')]
+    for decoder in DECODERS:
+        assert (extract(content, paths, decoder) ==
+                expected_paths(content, paths) ==
+                {('a', 'b'): [1, {'c': 2}], ('a', 'c'): None,
+                 ('d', 'e'): 2})
+        assert (extract('{}', paths, decoder) == {})
+        assert (extract('[{"a": 1}]', paths, decoder) == {})
+
+        for invalid in ('', '{', '{"a": 1', '{"a" 1}', '{a: 1}',
+                        '{"a": 1} x'):
+            with pytest.raises(ValueError):
+                extract(invalid, paths, decoder)
+
+
+def test_register_decoder():
+    """Test registering and selecting decoders."""
+    calls = []
+
+    def loads(content):
+        calls.append(content)
+        return json.loads(content)
+
+    register_decoder('test', loads)
+    try:
+        assert (extract('{"a": {"b": 1}}', [('a', 'b')], 'test') ==
+                {('a', 'b'): 1})
+        assert (calls == ['{"a": {"b": 1}}'])
+    finally:
+        del DECODERS['test']
+
+    assert (get_decoder() is DECODERS[JSON])
+    with pytest.raises(ValueError):
+        get_decoder('unknown')
+    if jsonstream.orjson is not None:
+        assert (jsonstream.ORJSON in DECODERS)
+
+
+def test_load_feed_decoders():
+    """Test the parsed weather data is the same using each decoder."""
+    content = load_file('tests/json/buienradar.json')
+    locations = [(52.1, 5.1), (53.2, 6.5), (51.4, 3.6)]
+
+    expected = parse_for_locations(load_feed(content)[DATA], locations)
+    for decoder in DECODERS:
+        feed = load_feed(content, decoder=decoder)
+        assert (feed[SUCCESS])
+        assert (parse_for_locations(feed[DATA], locations) == expected)
+
+        feed = load_feed('{"actual": ', decoder=decoder)
+        assert (feed[SUCCESS] is False)
+        assert (feed[MESSAGE] == 'Unable to parse content as json.')
+
+    with pytest.raises(ValueError):
+        load_feed(content, decoder='unknown')
@@ -0,0 +1,158 @@
+"""Testing the metrics (in the Prometheus text format)."""
+import re
+
+import pytest
+import requests
+import requests_mock
+
+from buienradar import metrics
+from buienradar.buienradar import get_data, parse_data
+from buienradar.cache import FeedCache
+from buienradar.constants import STATUS_CODE, SUCCESS
+from buienradar.instrument import BYTES, DURATION, FETCH, HOST, STAGE, record
+from buienradar.metrics import (
+    CACHE_LOOKUPS,
+    PARSE_DURATION,
+    PARSE_FAILURES,
+    REQUEST_DURATION,
+    RESPONSE_BYTES,
+    RESPONSES,
+    XML_FALLBACKS,
+    Metrics
+)
+from buienradar.urls import JSON_FEED_URL, XML_FEED_URL, XML_SECONDARY_FEED_URL
+
+RAIN_URL = re.compile(r'https://gps\.buienradar\.nl/getrr\.php')
+
+
+def load_file(name):
+    """Load a file with test data."""
+    file = open(name, 'r')
+    data = file.read()
+    file.close()
+    return data
+
+
+@pytest.fixture
+def registry():
+    """Update a new Metrics from the instrumentation events."""
+    registry = Metrics()
+    metrics.enable(registry)
+    try:
+        yield registry
+    finally:
+        metrics.disable(registry)
+
+
+def test_get_data(registry):
+    """Test the metrics of the requests, fallback and cache."""
+    content = load_file('tests/xml/buienradar.xml')
+    with requests_mock.Mocker() as m:
+        m.get(XML_FEED_URL, status_code=503)
+        m.get(XML_SECONDARY_FEED_URL, text=content)
+        m.get(RAIN_URL, text='000|12:00\n')
+
+        cache = FeedCache()
+        for latitude in (52.1, 52.1, 53.1):
+            result = get_data(latitude, 5.1, usexml=True, cache=cache)
+            assert (result[SUCCESS])
+
+    assert (registry.value(XML_FALLBACKS) == 1)
+    assert (registry.value(RESPONSES, 'xml.buienradar.nl', '503') == 1)
+    assert (registry.value(RESPONSES, 'api.buienradar.nl', '200') == 1)
+    assert (registry.value(RESPONSES, 'gps.buienradar.nl', '200') == 2)
+    assert (registry.value(RESPONSE_BYTES, 'api.buienradar.nl') ==
+            len(content.encode('utf-8')))
+    assert (registry.value(REQUEST_DURATION, 'gps.buienradar.nl')[0] == 2)
+    # the feed is cached, the precipitation of 52.1 too:
+    assert (registry.value(CACHE_LOOKUPS, 'miss') == 3)
+    assert (registry.value(CACHE_LOOKUPS, 'hit') == 3)
+
+
+def test_json_data(registry):
+    """Test the metrics of a failing request."""
+    with requests_mock.Mocker() as m:
+        m.get(JSON_FEED_URL, exc=requests.exceptions.ConnectTimeout)
+        m.get(RAIN_URL, text='000|12:00\n')
+        result = get_data(52.1, 5.1)
+    assert (not result[SUCCESS])
+    assert (registry.value(RESPONSES, 'data.buienradar.nl', 'error') == 1)
+    assert (registry.value(XML_FALLBACKS) == 0)
+
+
+def test_parse(registry):
+    """Test the metrics of parsing the data."""
+    content = load_file('tests/json/buienradar.json')
+    assert (parse_data(content, None)[SUCCESS])
+    assert (not parse_data('invalid', None)[SUCCESS])
+    assert (not parse_data('<invalid', None, usexml=True)[SUCCESS])
+
+    assert (registry.value(PARSE_DURATION, 'json')[0] == 2)
+    assert (registry.value(PARSE_DURATION, 'xml')[0] == 1)
+    assert (registry.value(PARSE_FAILURES, 'json') == 1)
+    assert (registry.value(PARSE_FAILURES, 'xml') == 1)
+
+    metrics.disable(registry)
+    parse_data('invalid', None)
+    assert (registry.value(PARSE_FAILURES, 'json') == 1)
+
+
+def test_render(registry):
+    """Test rendering the metrics in the Prometheus text format."""
+    for duration in (0.003, 0.2, 20):
+        record(FETCH, duration, url='https://a.example/', status_code=200,
+               bytes=10)
+    registry.observe({STAGE: FETCH, DURATION: 0.01, HOST: 'b"\\\n',
+                      STATUS_CODE: None, BYTES: 0})
+
+    text = metrics.render(registry)
+    lines = text.splitlines()
+    assert (text.endswith('\n'))
+    assert ('# TYPE buienradar_request_duration_seconds histogram' in lines)
+    assert ('# TYPE buienradar_responses_total counter' in lines)
+    assert ('buienradar_request_duration_seconds_bucket'
+            '{host="a.example",le="0.005"} 1' in lines)
+    assert ('buienradar_request_duration_seconds_bucket'
+            '{host="a.example",le="0.25"} 2' in lines)
+    assert ('buienradar_request_duration_seconds_bucket'
+            '{host="a.example",le="10.0"} 2' in lines)
+    assert ('buienradar_request_duration_seconds_bucket'
+            '{host="a.example",le="+Inf"} 3' in lines)
+    assert ('buienradar_request_duration_seconds_count'
+            '{host="a.example"} 3' in lines)
+    assert ('buienradar_request_duration_seconds_sum'
+            '{host="a.example"} 20.203' in lines)
+    assert ('buienradar_responses_total{host="a.example",status="200"} 3'
+            in lines)
+    assert ('buienradar_responses_total{host="b\\"\\\\\\n",status="error"} 1'
+            in lines)
+    assert ('buienradar_response_bytes_total{host="a.example"} 30' in lines)
+    assert ('buienradar_xml_fallbacks_total 0' in lines)
+
+    registry.reset()
+    assert ('a.example' not in metrics.render(registry))
+
+
+def test_write(tmpdir, registry):
+    """Test writing the metrics to a file."""
+    record(FETCH, 0.1, url='https://a.example/', status_code=200)
+    path = str(tmpdir.join('buienradar.prom'))
+    metrics.write(path, registry)
+    assert (load_file(path) == metrics.render(registry))
+    assert (tmpdir.listdir() == [tmpdir.join('buienradar.prom')])
+
+
+def test_enable():
+    """Test enabling the (default) metrics once."""
+    metrics.enable()
+    metrics.enable()
+    try:
+        before = metrics.REGISTRY.value(RESPONSES, 'c.example', '200')
+        record(FETCH, 0.1, url='https://c.example/', status_code=200)
+        assert (metrics.REGISTRY.value(RESPONSES, 'c.example', '200') ==
+                before + 1)
+    finally:
+        metrics.disable()
+    record(FETCH, 0.1, url='https://c.example/', status_code=200)
+    assert (metrics.REGISTRY.value(RESPONSES, 'c.example', '200') ==
+            before + 1)
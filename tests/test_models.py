@@ -0,0 +1,134 @@
+"""Testing the typed models of the weather data."""
+import pickle
+
+import pytest
+
+from buienradar import instrument
+from buienradar.buienradar import load_feed, parse_data, parse_for_locations
+from buienradar.constants import (
+    CONDITION,
+    DATA,
+    DATETIME,
+    FEELTEMPERATURE,
+    MESSAGE,
+    NIGHTTIME,
+    PRECIPITATION,
+    SERIES,
+    SUCCESS,
+    TIMINGS
+)
+from buienradar.models import (
+    Condition,
+    ForecastDay,
+    PrecipitationForecast,
+    Result,
+    WeatherData,
+    from_results
+)
+
+
+def load_file(name):
+    """Load a file with test data."""
+    file = open(name, 'r')
+    data = file.read()
+    file.close()
+    return data
+
+
+def items(value):
+    """Get the (nested) items of value, to compare the order of the keys."""
+    if isinstance(value, dict):
+        return [(key, items(item)) for key, item in value.items()]
+    if isinstance(value, list):
+        return [items(item) for item in value]
+    return value
+
+
+def test_to_dict():
+    """Test the models reproduce the dicts of parse_data."""
+    raindata = load_file('tests/raindata/raindata77.txt')
+    for usexml, name in ((False, 'tests/json/buienradar.json'),
+                         (True, 'tests/xml/buienradar.xml'),
+                         (False, 'tests/json/buienradar_nows3.json'),
+                         (True, 'tests/xml/buienradar_nows.xml')):
+        data = load_file(name)
+        for series in (False, True):
+            result = parse_data(data, raindata, usexml=usexml, series=series)
+            model = Result.from_dict(result)
+
+            assert (items(model.to_dict()) == items(result))
+            assert (pickle.loads(pickle.dumps(model)) == model)
+
+        result = parse_data(data, None, usexml=usexml)
+        assert (items(Result.from_dict(result).to_dict()) == items(result))
+
+
+def test_models():
+    """Test the attributes of the models."""
+    data = load_file('tests/json/buienradar.json')
+    raindata = load_file('tests/raindata/raindata77.txt')
+    result = parse_data(data, raindata, series=True)
+
+    model = Result.from_dict(result)
+    assert (model.success is True)
+    assert (isinstance(model.data, WeatherData))
+    assert (model.data.temperature == result[DATA]['temperature'])
+    assert (isinstance(model.data.condition, Condition))
+    assert (model.data.condition.night is True)
+    assert (all(isinstance(day, ForecastDay) for day in model.data.forecast))
+    assert (model.data.forecast[0].condition.condcode == 'c')
+
+    forecast = model.data.precipitation_forecast
+    assert (isinstance(forecast, PrecipitationForecast))
+    assert (forecast.series[0] ==
+            (result[DATA]['precipitation_forecast'][SERIES][0][DATETIME],
+             result[DATA]['precipitation_forecast'][SERIES][0][PRECIPITATION]))
+
+    # slotted; no attributes other than the keys:
+    with pytest.raises(AttributeError):
+        model.data.unknown = 1
+    assert (not hasattr(model.data, '__dict__'))
+
+    # the json only sensors are unset in the xml data:
+    result = parse_data(load_file('tests/xml/buienradar.xml'), None,
+                        usexml=True)
+    model = Result.from_dict(result)
+    assert (not hasattr(model.data, FEELTEMPERATURE))
+    assert (FEELTEMPERATURE not in model.to_dict()[DATA])
+    assert (NIGHTTIME not in model.to_dict()[DATA][CONDITION])
+
+
+def test_timings():
+    """Test the models of results with the timings attached."""
+    data = load_file('tests/json/buienradar.json')
+    with instrument.collect(attach=True):
+        result = parse_data(data, None)
+        model = Result.from_dict(result)
+
+    assert (model.timings == result[TIMINGS])
+    assert (items(model.to_dict()) == items(result))
+
+
+def test_init():
+    """Test creating and comparing models."""
+    condition = Condition(condcode='a', condition='clear')
+    assert (condition.to_dict() == {'condcode': 'a', 'condition': 'clear'})
+    assert (condition == Condition.from_dict(condition.to_dict()))
+    assert (condition != Condition(condcode='a'))
+    assert (repr(condition) == "Condition(condcode='a', condition='clear')")
+
+    result = Result(success=False, msg='failed')
+    assert (result.to_dict() == {SUCCESS: False, MESSAGE: 'failed'})
+
+    with pytest.raises(AttributeError):
+        Result.from_dict({SUCCESS: True, 'unknown': 1})
+
+
+def test_from_results():
+    """Test creating the models of parse_for_locations."""
+    data = load_file('tests/json/buienradar.json')
+    snapshot = load_feed(data)[DATA]
+    results = parse_for_locations(snapshot, [(52.1, 5.1), (53.1, 6.1)])
+
+    models = from_results(results)
+    assert ([model.to_dict() for model in models] == results)
@@ -4,7 +4,13 @@ from datetime import datetime, timedelta
 
 import requests_mock
 
-from buienradar.buienradar import get_data, parse_data
+from buienradar.buienradar import (
+    convert_stations,
+    get_data,
+    load_feed,
+    parse_data,
+    parse_for_locations
+)
 from buienradar.buienradar_json import (
     __ACTUAL,
     __LAT,
@@ -13,6 +19,7 @@ from buienradar.buienradar_json import (
     __STATIONMEASUREMENTS,
     __STATIONNAME,
     SENSOR_TYPES,
+    __convert_station,
     __get_float,
     __get_int,
     __get_str,
@@ -34,6 +41,8 @@ from buienradar.constants import (
     GROUNDTEMP,
     HUMIDITY,
     IRRADIANCE,
+    LATITUDE,
+    LONGITUDE,
     MEASURED,
     MESSAGE,
     PRECIPITATION,
@@ -975,3 +984,132 @@ def test_iconurl2(snapshot):
     assert (result[SUCCESS] and                              # noqa: ignore=W504
            '(6391)' in result[DATA][STATIONNAME])
     assert result == snapshot
+
+
+def test_parse_for_locations():
+    """Test parsing many locations from a single loaded feed."""
+    data = load_file('tests/json/buienradar.json')
+    raindata = load_file('tests/raindata/raindata.txt')
+    locations = [(51.50, 6.20), (52.11, 5.19), (53.23, 3.23)]
+
+    feed = load_feed(data, usexml=False)
+    assert (feed[SUCCESS] and feed[MESSAGE] is None)
+    assert (feed[DATA].usexml is False)
+
+    results = parse_for_locations(feed[DATA], locations, 30,
+                                  [raindata, None, raindata])
+    assert (len(results) == len(locations))
+    for (latitude, longitude), rain, result in zip(
+            locations, [raindata, None, raindata], results):
+        expected = parse_data(data, rain, latitude, longitude, 30,
+                              usexml=False)
+        assert (result == expected)
+
+    # without raincontents:
+    results = parse_for_locations(feed[DATA], locations)
+    assert (results[0] == parse_data(data, None, 51.50, 6.20,
+                                     usexml=False))
+
+    # the forecast may be missing from the feed:
+    data = load_file('tests/json/buienradar_nofc.json')
+    feed = load_feed(data, usexml=False)
+    results = parse_for_locations(feed[DATA], locations[:1])
+    assert (results[0] == parse_data(data, None, 51.50, 6.20,
+                                     usexml=False))
+
+
+def test_parse_for_locations_invalid():
+    """Test parsing many locations with invalid arguments or content."""
+    feed = load_feed('invalid', usexml=False)
+    assert (feed[SUCCESS] is False)
+    assert (feed[MESSAGE] == 'Unable to parse content as json.')
+
+    data = load_file('tests/json/buienradar.json')
+    feed = load_feed(data, usexml=False)
+    for timeframe in (4, 121):
+        try:
+            parse_for_locations(feed[DATA], [(51.50, 6.20)], timeframe)
+            assert (False)
+        except ValueError:
+            pass
+
+    try:
+        parse_for_locations(feed[DATA], [(51.50, 6.20)], 60, [])
+        assert (False)
+    except ValueError:
+        pass
+
+
+def test_convert_station():
+    """Test converting a station record in a single pass."""
+    loc_data = {'stationname': 'Meetstation Arcen',
+                'stationid': 6391,
+                'weatherdescription': 'Zwaar bewolkt',
+                'iconurl': 'http://x/cc.png',
+                'temperature': 16.3,
+                'winddirection': 'ono',
+                'feeltemperature': None}
+
+    data, valid = __convert_station(loc_data)
+
+    assert (valid is True)
+    assert (list(data)[3:] == list(SENSOR_TYPES))
+    assert (data[STATIONNAME] == 'Arcen (6391)')
+    assert (data[CONDITION]['condcode'] == 'c')
+    assert (data[CONDITION]['image'] == 'http://x/cc.png')
+    assert (data[TEMPERATURE] == 16.3 and data[WINDDIRECTION] == 'ONO')
+    assert (data[FEELTEMPERATURE] == 0.0 and data[HUMIDITY] is None)
+
+    # all values 0, empty or None:
+    data, valid = __convert_station({'temperature': 0,
+                                     'winddirection': '',
+                                     'humidity': None})
+    assert (valid is False)
+    assert (__convert_station({})[1] is False)
+
+
+def test_convert_stations():
+    """Test converting all stations into columns."""
+    data = load_file('tests/json/buienradar.json')
+    feed = load_feed(data)
+
+    result = convert_stations(feed[DATA])
+
+    assert (result[SUCCESS] and result[MESSAGE] is None)
+    columns = result[DATA]
+    assert (list(columns) == [LATITUDE, LONGITUDE] + list(SENSOR_TYPES))
+    count = len(columns[LATITUDE])
+    assert (count > 1)
+    assert (all(len(values) == count for values in columns.values()))
+
+    # each row has the data of the station parsed at its location:
+    for row in range(count):
+        latitude = columns[LATITUDE][row]
+        longitude = columns[LONGITUDE][row]
+        parsed = parse_data(data, None, latitude, longitude)
+        for key in SENSOR_TYPES:
+            assert (columns[key][row] == parsed[DATA][key])
+
+    # without stations:
+    feed = load_feed(load_file('tests/json/buienradar_nows.json'))
+    result = convert_stations(feed[DATA])
+    assert (result[SUCCESS] and result[DATA][LATITUDE] == [])
+
+    feed = load_feed(load_file('tests/json/buienradar_nows3.json'))
+    result = convert_stations(feed[DATA])
+    assert (result[SUCCESS] is False and result[DATA] is None)
+
+
+def test_convert_stations_malformed():
+    """Test converting stations skips the entries that are not records."""
+    data = load_file('tests/json/buienradar.json')
+    expected = convert_stations(load_feed(data)[DATA])[DATA]
+
+    content = json.loads(data)
+    content['actual']['stationmeasurements'][1:1] = [1, 'junk', [2]]
+    data = json.dumps(content)
+    assert (parse_data(data, None)[SUCCESS])
+
+    result = convert_stations(load_feed(data)[DATA])
+    assert (result[SUCCESS])
+    assert (result[DATA] == expected)
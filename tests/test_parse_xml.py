@@ -4,7 +4,13 @@ from datetime import datetime, timedelta
 import requests_mock
 import xmltodict
 
-from buienradar.buienradar import get_data, parse_data
+from buienradar.buienradar import (
+    convert_stations,
+    get_data,
+    load_feed,
+    parse_data,
+    parse_for_locations
+)
 from buienradar.buienradar_xml import (
     __BRACTUEELWEER,
     __BRLAT,
@@ -18,6 +24,7 @@ from buienradar.buienradar_xml import (
     __BRWEERSTATIONS,
     __BRZIN,
     SENSOR_TYPES,
+    __convert_station,
     __get_ws_distance,
     __parse_precipfc_data,
     __to_localdatetime
@@ -30,6 +37,8 @@ from buienradar.constants import (
     GROUNDTEMP,
     HUMIDITY,
     IRRADIANCE,
+    LATITUDE,
+    LONGITUDE,
     MEASURED,
     MESSAGE,
     PRECIPITATION,
@@ -764,3 +773,129 @@ def test_id_upper1(snapshot):
     # check the selected weatherstation:
     assert (result[SUCCESS] and                              # noqa: ignore=W504
            '(6391)' in result[DATA][STATIONNAME])
+
+
+def test_parse_for_locations():
+    """Test parsing many locations from a single loaded feed."""
+    data = load_file('tests/xml/buienradar.xml')
+    raindata = load_file('tests/raindata/raindata.txt')
+    locations = [(51.50, 6.20), (52.11, 5.19), (53.23, 3.23)]
+
+    feed = load_feed(data, usexml=True)
+    assert (feed[SUCCESS] and feed[MESSAGE] is None)
+    assert (feed[DATA].usexml is True)
+
+    results = parse_for_locations(feed[DATA], locations, 30,
+                                  [raindata, None, raindata])
+    assert (len(results) == len(locations))
+    for (latitude, longitude), rain, result in zip(
+            locations, [raindata, None, raindata], results):
+        expected = parse_data(data, rain, latitude, longitude, 30,
+                              usexml=True)
+        assert (result == expected)
+
+    # without raincontents:
+    results = parse_for_locations(feed[DATA], locations)
+    assert (results[0] == parse_data(data, None, 51.50, 6.20,
+                                     usexml=True))
+
+    # the forecast may be missing from the feed:
+    data = load_file('tests/xml/buienradar_nofc.xml')
+    feed = load_feed(data, usexml=True)
+    results = parse_for_locations(feed[DATA], locations[:1])
+    assert (results[0] == parse_data(data, None, 51.50, 6.20,
+                                     usexml=True))
+
+
+def test_parse_for_locations_invalid():
+    """Test parsing many locations with invalid arguments or content."""
+    feed = load_feed('invalid', usexml=True)
+    assert (feed[SUCCESS] is False)
+    assert (feed[MESSAGE] == 'Unable to parse content as xml.')
+
+    data = load_file('tests/xml/buienradar.xml')
+    feed = load_feed(data, usexml=True)
+    for timeframe in (4, 121):
+        try:
+            parse_for_locations(feed[DATA], [(51.50, 6.20)], timeframe)
+            assert (False)
+        except ValueError:
+            pass
+
+    try:
+        parse_for_locations(feed[DATA], [(51.50, 6.20)], 60, [])
+        assert (False)
+    except ValueError:
+        pass
+
+
+def test_convert_station():
+    """Test converting a station record in a single pass."""
+    loc_data = {'stationnaam': {'@regio': 'Venlo',
+                                '#text': 'Meetstation Arcen'},
+                'stationcode': '6391',
+                'icoonactueel': {'@ID': 'cc', '#text': 'http://x/cc.png'},
+                'temperatuurGC': '16.3',
+                'windrichting': 'ONO'}
+
+    data, valid, missing = __convert_station(loc_data)
+
+    assert (valid is True)
+    assert (list(data)[3:] == list(SENSOR_TYPES))
+    assert (data[STATIONNAME] == 'Arcen (6391)')
+    assert (data[CONDITION]['condcode'] == 'c')
+    assert (data[CONDITION]['image'] == 'http://x/cc.png')
+    assert (data[TEMPERATURE] == 16.3 and data[WINDDIRECTION] == 'ONO')
+    assert (data[HUMIDITY] is None and data[FORECAST] == [])
+    assert (missing == [SENSOR_TYPES[key][0] for key in SENSOR_TYPES
+                        if key not in (STATIONNAME, CONDITION, TEMPERATURE,
+                                       WINDDIRECTION)])
+
+    # all values 0 (or missing):
+    data, valid, missing = __convert_station({'temperatuurGC': '0',
+                                              'windrichting': 'N'})
+    assert (valid is False)
+    assert (__convert_station({})[1] is False)
+
+
+def test_convert_stations():
+    """Test converting all stations into columns."""
+    data = load_file('tests/xml/buienradar.xml')
+    feed = load_feed(data, usexml=True)
+
+    result = convert_stations(feed[DATA])
+
+    assert (result[SUCCESS] and result[MESSAGE] is None)
+    columns = result[DATA]
+    assert (list(columns) == [LATITUDE, LONGITUDE] + list(SENSOR_TYPES))
+    count = len(columns[LATITUDE])
+    assert (count > 1)
+    assert (all(len(values) == count for values in columns.values()))
+
+    # each row has the data of the station parsed at its location:
+    for row in range(count):
+        latitude = columns[LATITUDE][row]
+        longitude = columns[LONGITUDE][row]
+        parsed = parse_data(data, None, latitude, longitude,
+                            usexml=True)
+        for key in SENSOR_TYPES:
+            assert (columns[key][row] == parsed[DATA][key])
+
+    # without stations:
+    feed = load_feed(load_file('tests/xml/buienradar_nows.xml'), usexml=True)
+    result = convert_stations(feed[DATA])
+    assert (result[SUCCESS] is False and result[DATA] is None)
+
+
+def test_convert_stations_malformed():
+    """Test converting stations skips the entries that are not records."""
+    data = load_file('tests/xml/buienradar.xml')
+    expected = convert_stations(load_feed(data, usexml=True)[DATA])[DATA]
+
+    data = data.replace('<weerstations>', '<weerstations>'
+                        '<weerstation>junk</weerstation>', 1)
+    assert (parse_data(data, None, usexml=True)[SUCCESS])
+
+    result = convert_stations(load_feed(data, usexml=True)[DATA])
+    assert (result[SUCCESS])
+    assert (result[DATA] == expected)
@@ -0,0 +1,120 @@
+"""Testing the parsing of the precipitation forecast."""
+from datetime import datetime
+
+import pytz
+
+from buienradar.buienradar import load_feed, parse_data, parse_for_locations
+from buienradar.constants import (
+    AVERAGE,
+    DATA,
+    DATETIME,
+    PRECIPITATION,
+    PRECIPITATION_FORECAST,
+    SERIES,
+    TIMEFRAME,
+    TOTAL
+)
+from buienradar.precipitation import INTENSITY, intensity, parse_precipitation
+
+TZ = pytz.timezone('Europe/Amsterdam')
+
+
+def load_file(name):
+    """Load a file with test data."""
+    file = open(name, 'r')
+    data = file.read()
+    file.close()
+    return data
+
+
+def test_intensity():
+    """Test the lookup table matches the formula of buienradar."""
+    assert (len(INTENSITY) == 256)
+    for val in range(256):
+        expected = 10 ** ((float(val) - 109) / 32)
+        assert (INTENSITY[val] == expected)
+        assert (intensity('%03d' % val) == expected)
+
+    assert (round(intensity('077'), 2) == 0.1)
+    # decimal and out of range values use the formula:
+    assert (intensity('77,5') == 10 ** ((77.5 - 109) / 32))
+    assert (intensity('55.55') == 10 ** ((55.55 - 109) / 32))
+    assert (intensity('-1') == 10 ** ((-1.0 - 109) / 32))
+    assert (intensity('300') == 10 ** ((300.0 - 109) / 32))
+
+
+def test_series():
+    """Test the full series of the forecast."""
+    data = "000|23:50\n077|23:55\n109|00:00\n000|00:05\n"
+    now = TZ.localize(datetime(2025, 10, 18, 23, 52))
+
+    result = parse_precipitation(data, 10, series=True, now=now)
+
+    assert (result[AVERAGE] == 0.55 and result[TOTAL] == 0.09)
+    assert (result[TIMEFRAME] == 10)
+    assert (result[SERIES] == [
+        {DATETIME: TZ.localize(datetime(2025, 10, 18, 23, 50)),
+         PRECIPITATION: 0.0},
+        {DATETIME: TZ.localize(datetime(2025, 10, 18, 23, 55)),
+         PRECIPITATION: 0.1},
+        {DATETIME: TZ.localize(datetime(2025, 10, 19, 0, 0)),
+         PRECIPITATION: 1.0},
+        {DATETIME: TZ.localize(datetime(2025, 10, 19, 0, 5)),
+         PRECIPITATION: 0.0}])
+
+    # the forecast started (just) before midnight:
+    now = TZ.localize(datetime(2025, 10, 19, 0, 2))
+    result = parse_precipitation(data, 10, series=True, now=now)
+    assert (result[SERIES][0][DATETIME] ==
+            TZ.localize(datetime(2025, 10, 18, 23, 50)))
+    assert (result[SERIES][3][DATETIME] ==
+            TZ.localize(datetime(2025, 10, 19, 0, 5)))
+
+    # now in another timezone:
+    now = datetime(2025, 10, 18, 21, 52, tzinfo=pytz.utc)
+    result = parse_precipitation(data, 10, series=True, now=now)
+    assert (result[SERIES][0][DATETIME] ==
+            TZ.localize(datetime(2025, 10, 18, 23, 50)))
+
+    # without series (default):
+    result = parse_precipitation(data, 10)
+    assert (SERIES not in result)
+
+
+def test_series_invalid():
+    """Test the series of a forecast with invalid lines."""
+    data = "077|12:00\n077|xx:yy\ninvalid\n"
+    now = TZ.localize(datetime(2025, 10, 18, 12, 0))
+
+    result = parse_precipitation(data, 5, series=True, now=now)
+
+    assert (result[SERIES] == [
+        {DATETIME: TZ.localize(datetime(2025, 10, 18, 12, 0)),
+         PRECIPITATION: 0.1},
+        {DATETIME: None, PRECIPITATION: 0.1}])
+
+
+def test_parse_data_series():
+    """Test parse_data and parse_for_locations return the series."""
+    raindata = load_file('tests/raindata/raindata77.txt')
+    for usexml, name in ((False, 'tests/json/buienradar.json'),
+                         (True, 'tests/xml/buienradar.xml')):
+        data = load_file(name)
+
+        result = parse_data(data, raindata, 52.091579, 5.119734, 30,
+                            usexml, series=True)
+        forecast = result[DATA][PRECIPITATION_FORECAST]
+        assert (forecast[AVERAGE] == 0.1 and forecast[TIMEFRAME] == 30)
+        assert (len(forecast[SERIES]) == len(raindata.splitlines()))
+        assert (all(item[PRECIPITATION] == 0.1
+                    for item in forecast[SERIES]))
+
+        result = parse_data(data, raindata, 52.091579, 5.119734, 30, usexml)
+        assert (SERIES not in result[DATA][PRECIPITATION_FORECAST])
+
+        snapshot = load_feed(data, usexml)[DATA]
+        results = parse_for_locations(snapshot, [(52.1, 5.1), (53.1, 6.1)],
+                                      30, [raindata, raindata], series=True)
+        for result in results:
+            forecast = result[DATA][PRECIPITATION_FORECAST]
+            assert (len(forecast[SERIES]) == len(raindata.splitlines()))
@@ -0,0 +1,158 @@
+"""Testing the spatial index for selecting the nearest weatherstation."""
+import random
+import sys
+
+import pytest
+from vincenty import vincenty
+
+from buienradar import spatial
+from buienradar.buienradar import load_feed, parse_data, parse_for_locations
+from buienradar.constants import DATA, DISTANCE, STATIONNAME, SUCCESS
+from buienradar.spatial import (
+    batch_candidates,
+    build_index,
+    nearest_candidates
+)
+
+
+def load_file(name):
+    """Load a file with test data."""
+    file = open(name, 'r')
+    data = file.read()
+    file.close()
+    return data
+
+
+def brute_force(coordinates, latitude, longitude):
+    """Select the nearest station by calculating all distances."""
+    nearest = None
+    dist = 0
+    for pos, lat, lon in coordinates:
+        dist2 = vincenty((latitude, longitude), (lat, lon))
+        if nearest is None or dist2 < dist:
+            nearest = pos
+            dist = dist2
+    return nearest
+
+
+def test_empty_index():
+    """Test an index without stations."""
+    index = build_index([])
+    assert (index is None)
+    assert (nearest_candidates(index, 52.1, 5.1) == [])
+
+
+def test_nearest_candidates():
+    """Test the nearest station is always one of the candidates."""
+    rnd = random.Random(4791)
+    coordinates = [(pos, rnd.uniform(50.5, 53.7), rnd.uniform(3.0, 7.3))
+                   for pos in range(200)]
+    index = build_index(coordinates)
+
+    for _ in range(200):
+        latitude = rnd.uniform(50.0, 54.0)
+        longitude = rnd.uniform(2.5, 7.5)
+        candidates = nearest_candidates(index, latitude, longitude)
+
+        assert (candidates == sorted(candidates))
+        assert (0 < len(candidates) < 10)
+        assert (brute_force(coordinates, latitude, longitude) in candidates)
+
+
+def test_equal_distances():
+    """Test stations at the same distance are all candidates."""
+    coordinates = [(0, 52.0, 5.0), (1, 52.0, 5.2), (2, 53.0, 5.1),
+                   (3, 52.0, 5.0)]
+    index = build_index(coordinates)
+
+    assert (nearest_candidates(index, 52.0, 5.0) == [0, 3])
+    assert (nearest_candidates(index, 52.0, 5.1) == [0, 1, 3])
+
+
+def check_selected_stations(data, usexml):
+    """Compare the selected stations with a linear search."""
+    feed = load_feed(data, usexml)
+    coordinates = []
+    for pos, wstation in enumerate(feed[DATA].stations):
+        coordinates.append((pos, float(wstation['lat']),
+                            float(wstation['lon'])))
+
+    rnd = random.Random(6260)
+    for _ in range(100):
+        latitude = rnd.uniform(50.5, 53.7)
+        longitude = rnd.uniform(3.0, 7.3)
+
+        result = parse_data(data, None, latitude, longitude, usexml=usexml)
+        assert (result[SUCCESS])
+
+        pos = brute_force(coordinates, latitude, longitude)
+        lat, lon = coordinates[pos][1:]
+        assert (result[DISTANCE] == vincenty((latitude, longitude),
+                                             (lat, lon)))
+        if usexml:
+            code = feed[DATA].stations[pos]['stationcode']
+        else:
+            code = feed[DATA].stations[pos]['stationid']
+        assert (result[DATA][STATIONNAME].endswith("(%s)" % code))
+
+
+def test_select_nearest_json():
+    """Test selecting the nearest station from the json feed."""
+    check_selected_stations(load_file('tests/json/buienradar.json'), False)
+
+
+def test_select_nearest_xml():
+    """Test selecting the nearest station from the xml feed."""
+    check_selected_stations(load_file('tests/xml/buienradar.xml'), True)
+
+
+def test_batch_candidates():
+    """Test the vectorized candidates contain the nearest station."""
+    pytest.importorskip('numpy')
+    rnd = random.Random(6391)
+    coordinates = [(pos, rnd.uniform(50.5, 53.7), rnd.uniform(3.0, 7.3))
+                   for pos in range(200)]
+    locations = [(rnd.uniform(50.0, 54.0), rnd.uniform(2.5, 7.5))
+                 for _ in range(200)]
+
+    # use small blocks to test the results are combined correctly:
+    blocksize = spatial.BLOCK_SIZE
+    spatial.BLOCK_SIZE = 1000
+    try:
+        result = batch_candidates(coordinates, locations)
+    finally:
+        spatial.BLOCK_SIZE = blocksize
+
+    assert (len(result) == len(locations))
+    for (latitude, longitude), candidates in zip(locations, result):
+        assert (candidates == sorted(candidates))
+        assert (0 < len(candidates) < 10)
+        assert (brute_force(coordinates, latitude, longitude) in candidates)
+
+    assert (batch_candidates([], locations[:2]) == [[], []])
+
+
+def test_batch_candidates_without_numpy(monkeypatch):
+    """Test the batch selection is skipped without numpy."""
+    coordinates = [(0, 52.0, 5.0), (1, 52.0, 5.2)]
+    # importing numpy raises ImportError:
+    monkeypatch.setitem(sys.modules, 'numpy', None)
+    assert (batch_candidates(coordinates, [(52.0, 5.0)]) is None)
+
+
+def test_parse_for_locations_batch(monkeypatch):
+    """Test the vectorized and scalar selection give identical results."""
+    pytest.importorskip('numpy')
+    for name, usexml in (('tests/json/buienradar.json', False),
+                         ('tests/xml/buienradar.xml', True)):
+        feed = load_feed(load_file(name), usexml)
+        rnd = random.Random(6252)
+        locations = [(rnd.uniform(50.5, 53.7), rnd.uniform(3.0, 7.3))
+                     for _ in range(50)]
+
+        result = parse_for_locations(feed[DATA], locations)
+
+        with monkeypatch.context() as patch:
+            patch.setitem(sys.modules, 'numpy', None)
+            expected = parse_for_locations(feed[DATA], locations)
+        assert (result == expected)
@@ -0,0 +1,78 @@
+"""Testing the library against the local stand-in server."""
+import pytest
+import requests
+
+from buienradar.buienradar import get_data, parse_data
+from buienradar.constants import (
+    CONTENT,
+    DATA,
+    NOT_MODIFIED,
+    RAINCONTENT,
+    STATIONNAME,
+    SUCCESS
+)
+from buienradar.fetch import ConditionalStore, create_session
+from buienradar.standin import StandinServer
+from buienradar.urls import BASE_URL_ENV
+
+
+def load_file(name):
+    """Load a file with test data."""
+    file = open(name, 'r')
+    data = file.read()
+    file.close()
+    return data
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Run a stand-in server and use it as base url."""
+    with StandinServer() as server:
+        monkeypatch.setenv(BASE_URL_ENV, server.base_url)
+        yield server
+
+
+def test_get_data(server):
+    """Test getting and parsing the data from the stand-in server."""
+    for usexml, name in ((False, 'tests/json/buienradar.json'),
+                         (True, 'tests/xml/buienradar.xml')):
+        result = get_data(52.1, 5.1, usexml)
+
+        assert (result[SUCCESS])
+        assert (result[CONTENT] == load_file(name))
+        assert (result[RAINCONTENT].splitlines() ==
+                load_file('tests/raindata/raindata.txt').splitlines())
+
+        result = parse_data(result[CONTENT], result[RAINCONTENT],
+                            52.1, 5.1, usexml=usexml)
+        assert (result[SUCCESS] and result[DATA][STATIONNAME])
+
+    assert (server.stats == {200: 4})
+
+
+def test_conditional(server):
+    """Test the stand-in server answers conditional requests."""
+    session = create_session()
+    conditional = ConditionalStore()
+
+    result = get_data(52.1, 5.1, session=session, conditional=conditional)
+    assert (result[SUCCESS] and not result[NOT_MODIFIED])
+    result = get_data(52.1, 5.1, session=session, conditional=conditional)
+    assert (result[SUCCESS] and result[NOT_MODIFIED])
+    assert (result[CONTENT] == load_file('tests/json/buienradar.json'))
+
+    # the feed and the precipitation forecast:
+    assert (server.stats == {200: 2, 304: 2})
+
+
+def test_errors_and_latency(monkeypatch):
+    """Test the errors and latency of the stand-in server."""
+    with StandinServer(error_rate=1.0, latency=0.01) as server:
+        monkeypatch.setenv(BASE_URL_ENV, server.base_url)
+        result = get_data(52.1, 5.1, usexml=True)
+        assert (result[SUCCESS] is False)
+        # the secondary xml feed is used when the first fails:
+        assert (server.stats == {500: 3})
+
+        response = requests.get(server.base_url + '/unknown')
+        assert (response.status_code == 404)
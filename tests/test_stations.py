@@ -0,0 +1,50 @@
+"""Testing the conversion of weatherstation records."""
+from buienradar.constants import (
+    ATTRIBUTION,
+    CONDITION,
+    FORECAST,
+    MEASURED,
+    PRECIPITATION_FORECAST,
+    STATIONNAME,
+    TEMPERATURE,
+    WINDDIRECTION
+)
+from buienradar.stations import StationConverter
+
+SENSOR_TYPES = {
+    STATIONNAME: ['name', None],
+    CONDITION: ['icon', None],
+    MEASURED: ['timestamp', str],
+    TEMPERATURE: ['temperature', float],
+    WINDDIRECTION: ['winddirection', None],
+}
+
+
+def name_step(name):
+    """Create the step converting the name."""
+    def step(loc_data, data):
+        data[STATIONNAME] = loc_data[name].upper()
+    return step
+
+
+def test_convert():
+    """Test converting a station record using the compiled steps."""
+    converter = StationConverter(SENSOR_TYPES, {STATIONNAME: name_step})
+    assert ([key for key, name, step in converter.steps] ==
+            list(SENSOR_TYPES))
+    # the (plain) values converted by a function, except MEASURED:
+    assert (converter.valid_fields == ((TEMPERATURE, 'temperature'),))
+
+    data, missing = converter.convert({'name': 'arcen', 'icon': 'a',
+                                       'temperature': '16.3'})
+    assert (list(data) == [ATTRIBUTION, FORECAST, PRECIPITATION_FORECAST] +
+            list(SENSOR_TYPES))
+    assert (data[STATIONNAME] == 'ARCEN' and data[CONDITION] == 'a')
+    assert (data[TEMPERATURE] == 16.3 and data[WINDDIRECTION] is None)
+    assert (data[FORECAST] == [] and data[PRECIPITATION_FORECAST] is None)
+    assert (missing == ['timestamp', 'winddirection'])
+
+    # every record gets its own data (and FORECAST list):
+    other, missing = converter.convert({})
+    assert (other is not data and other[FORECAST] is not data[FORECAST])
+    assert (missing == [name for name, func in SENSOR_TYPES.values()])
@@ -0,0 +1,110 @@
+"""Testing the synthetic feeds."""
+from datetime import datetime
+
+from buienradar.buienradar import convert_stations, load_feed, parse_data
+from buienradar.constants import (
+    AVERAGE,
+    DATA,
+    FORECAST,
+    LATITUDE,
+    PRECIPITATION_FORECAST,
+    STATIONNAME,
+    SUCCESS,
+    TEMPERATURE
+)
+from buienradar.precipitation import parse_precipitation
+from buienradar.standin import StandinServer
+from buienradar.synthetic import (
+    json_feed,
+    precipitation_data,
+    write_feeds,
+    xml_feed
+)
+
+NOW = datetime(2019, 2, 4, 21, 7)
+
+
+def test_feeds():
+    """Test parsing the json and xml feed with the same data."""
+    rain = precipitation_data(seed=1, now=NOW)
+    results = []
+    for usexml, generate in ((False, json_feed), (True, xml_feed)):
+        content = generate(500, days=5, seed=1, now=NOW)
+        result = parse_data(content, rain, 52.1, 5.1, usexml=usexml)
+        assert (result[SUCCESS])
+        assert (len(result[DATA][FORECAST]) == 5)
+        assert (result[DATA][PRECIPITATION_FORECAST][AVERAGE] is not None)
+
+        stations = convert_stations(load_feed(content, usexml)[DATA])
+        assert (stations[SUCCESS])
+        assert (len(stations[DATA][LATITUDE]) == 500)
+        results.append(result)
+
+    json_result, xml_result = results
+    assert (json_result[DATA][STATIONNAME] == xml_result[DATA][STATIONNAME])
+    assert (json_result[DATA][TEMPERATURE] == xml_result[DATA][TEMPERATURE])
+
+
+def test_seed():
+    """Test the feeds are the same for the same seed."""
+    assert (json_feed(20, seed=1, now=NOW) == json_feed(20, seed=1, now=NOW))
+    assert (xml_feed(20, seed=1, now=NOW) == xml_feed(20, seed=1, now=NOW))
+    assert (json_feed(20, seed=1, now=NOW) != json_feed(20, seed=2, now=NOW))
+
+
+def test_invalid_and_missing():
+    """Test parsing feeds with invalid and missing values."""
+    content = json_feed(200, days=7, invalid=0.2, missing=0.2, seed=1)
+    assert ('null' in content)
+    result = parse_data(content, None, 52.1, 5.1)
+    assert (result[SUCCESS])
+    assert (len(result[DATA][FORECAST]) == 7)
+
+    content = xml_feed(200, days=7, invalid=0.2, missing=0.2, seed=1)
+    assert ('>-<' in content)
+    result = parse_data(content, None, 52.1, 5.1, usexml=True)
+    assert (result[SUCCESS])
+    # the xml feed has 5 forecast days:
+    assert (len(result[DATA][FORECAST]) == 5)
+
+
+def test_single_station():
+    """Test the xml feed with a single weatherstation."""
+    content = xml_feed(stations=1, seed=1, now=NOW)
+    snapshot = load_feed(content, usexml=True)[DATA]
+    assert (len(snapshot.stations) == 1)
+
+    stations = convert_stations(snapshot)
+    assert (stations[SUCCESS])
+    assert (len(stations[DATA][LATITUDE]) == 1)
+
+    result = parse_data(content, None, 52.1, 5.1, usexml=True)
+    assert (result[SUCCESS])
+    assert (result[DATA][STATIONNAME] ==
+            parse_data(json_feed(stations=1, seed=1, now=NOW), None, 52.1,
+                       5.1)[DATA][STATIONNAME])
+
+
+def test_precipitation_data():
+    """Test the generated precipitation forecast."""
+    data = precipitation_data(intervals=25, seed=1, now=NOW)
+    lines = data.splitlines()
+    assert (len(lines) == 25)
+    assert (lines[0].endswith('|21:00'))
+    assert (lines[-1].endswith('|23:00'))
+    assert (all(0 <= int(line.split('|')[0]) <= 255 for line in lines))
+
+    result = parse_precipitation(data, 120)
+    assert (result[AVERAGE] is not None)
+
+
+def test_write_feeds(tmpdir):
+    """Test writing the feeds for the stand-in server."""
+    paths = write_feeds(str(tmpdir), stations=10, seed=1, now=NOW)
+    assert (sorted(paths) == ['json', 'raindata', 'xml'])
+
+    server = StandinServer(fixtures=str(tmpdir))
+    try:
+        assert (len(server.files) == 4)
+    finally:
+        server.server_close()
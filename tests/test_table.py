@@ -0,0 +1,58 @@
+"""Testing the export of the converted stations to numpy and pandas."""
+import math
+
+import pytest
+
+from buienradar import table
+from buienradar.constants import (
+    CONDITION,
+    LATITUDE,
+    STATIONNAME,
+    TEMPERATURE,
+    WINDFORCE
+)
+
+COLUMNS = {LATITUDE: [51.5, 52.07, 53.1],
+           TEMPERATURE: [3.6, None, -1.0],
+           WINDFORCE: [4, 0, 2],
+           STATIONNAME: ['Arcen (6391)', 'Arnhem (6275)', None],
+           CONDITION: [{'condcode': 'c'}, None, {'condcode': 'a'}]}
+
+
+def test_to_numpy():
+    """Test exporting the columns to numpy arrays."""
+    numpy = pytest.importorskip('numpy')
+
+    arrays = table.to_numpy(COLUMNS)
+
+    assert (list(arrays) == list(COLUMNS))
+    assert (arrays[LATITUDE].dtype == numpy.float64)
+    assert (arrays[WINDFORCE].tolist() == [4.0, 0.0, 2.0])
+    assert (math.isnan(arrays[TEMPERATURE][1]))
+    assert (arrays[STATIONNAME].dtype == object)
+    assert (arrays[CONDITION].tolist() == COLUMNS[CONDITION])
+
+    assert (table.to_numpy({LATITUDE: []})[LATITUDE].shape == (0,))
+
+
+def test_to_dataframe():
+    """Test exporting the columns to a pandas DataFrame."""
+    pytest.importorskip('pandas')
+
+    frame = table.to_dataframe(COLUMNS)
+
+    assert (list(frame.columns) == list(COLUMNS))
+    assert (len(frame) == 3)
+    assert (frame[STATIONNAME][0] == 'Arcen (6391)')
+    assert (frame[TEMPERATURE].isna().tolist() == [False, True, False])
+
+
+def test_missing_packages(monkeypatch):
+    """Test the export without numpy or pandas installed."""
+    monkeypatch.setattr(table, 'numpy', None)
+    monkeypatch.setattr(table, 'pandas', None)
+
+    with pytest.raises(ImportError):
+        table.to_numpy(COLUMNS)
+    with pytest.raises(ImportError):
+        table.to_dataframe(COLUMNS)
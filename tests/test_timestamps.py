@@ -0,0 +1,100 @@
+"""Testing the conversion of the timestamps into local time."""
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+
+from buienradar import timestamps
+from buienradar.timestamps import (
+    ISO_FORMAT,
+    PYTZ,
+    ZONEINFO,
+    cache_clear,
+    cache_info,
+    get_backend,
+    localize,
+    set_backend,
+    timezone,
+    to_localdatetime
+)
+
+TZ = pytz.timezone('Europe/Amsterdam')
+XML_FORMAT = '%m/%d/%Y %H:%M:%S'
+
+
+@pytest.fixture(autouse=True)
+def backend():
+    """Restore the default backend and clear the cache after each test."""
+    yield
+    set_backend(PYTZ)
+    cache_clear()
+
+
+def test_to_localdatetime():
+    """Test converting the timestamps of the json and xml feed."""
+    expected = TZ.localize(datetime(2019, 2, 3, 19, 20))
+    assert (to_localdatetime('2019-02-03T19:20:00') == expected)
+    assert (to_localdatetime('2019-02-03T19:20:00').tzinfo ==
+            expected.tzinfo)
+    assert (to_localdatetime('02/03/2019 19:20:00', XML_FORMAT) == expected)
+
+    # not padded; only valid for strptime:
+    assert (to_localdatetime('2019-2-3T19:20:00') == expected)
+    # only valid for fromisoformat:
+    assert (to_localdatetime('2019-02-03') is None)
+    assert (to_localdatetime('2019-02-03T19:20:00+01:00') is None)
+    assert (to_localdatetime('20190203T192000') is None)
+
+    assert (to_localdatetime('') is None)
+    assert (to_localdatetime(None) is None)
+    assert (to_localdatetime(20190203) is None)
+    assert (to_localdatetime(['2019-02-03T19:20:00']) is None)
+
+
+def test_cached():
+    """Test the same timestamps are converted once."""
+    cache_clear()
+    first = to_localdatetime('2019-02-03T19:20:00')
+    for _ in range(10):
+        assert (to_localdatetime('2019-02-03T19:20:00') is first)
+    to_localdatetime('invalid')
+    to_localdatetime('invalid')
+
+    info = cache_info()
+    assert (info.misses == 2 and info.hits == 11)
+
+
+def test_zoneinfo():
+    """Test the zoneinfo backend gives the same datetimes."""
+    pytz_dt = to_localdatetime('2019-07-03T19:20:00')
+
+    set_backend(ZONEINFO)
+    assert (get_backend() == ZONEINFO)
+    zone_dt = to_localdatetime('2019-07-03T19:20:00')
+    assert (zone_dt == pytz_dt)
+    assert (zone_dt.utcoffset() == timedelta(hours=2))
+    assert (zone_dt.tzinfo is timezone())
+    assert (zone_dt is not pytz_dt)
+
+    # the first (summer time) of the ambiguous hour:
+    zone_dt = to_localdatetime('2019-10-27T02:30:00', ISO_FORMAT)
+    assert (zone_dt.utcoffset() == timedelta(hours=2))
+    assert (localize(datetime(2019, 10, 27, 2, 30)) == zone_dt)
+
+    set_backend(PYTZ)
+    pytz_dt = to_localdatetime('2019-10-27T02:30:00', ISO_FORMAT)
+    assert (pytz_dt.utcoffset() == timedelta(hours=1))
+
+
+def test_set_backend(monkeypatch):
+    """Test selecting an unknown or unavailable backend."""
+    with pytest.raises(ValueError):
+        set_backend('unknown')
+    assert (get_backend() == PYTZ)
+
+    monkeypatch.setattr(timestamps, 'zoneinfo', None)
+    monkeypatch.delitem(timestamps.__dict__['__timezones'], ZONEINFO,
+                        raising=False)
+    with pytest.raises(ValueError):
+        set_backend(ZONEINFO)
+    assert (get_backend() == PYTZ)
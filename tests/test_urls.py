@@ -2,9 +2,18 @@
 from urllib.parse import parse_qs, urlparse
 
 from buienradar.urls import (
+    BASE_URL_ENV,
+    JSON_FEED_URL,
+    JSON_FEED_URL_ENV,
+    PRECIPITATION_URL_ENV,
+    XML_FEED_URL,
+    XML_SECONDARY_FEED_URL,
+    json_feed_url,
     json_precipitation_forecast_url,
     radar_url,
-    xml_precipitation_forecast_url
+    xml_feed_url,
+    xml_precipitation_forecast_url,
+    xml_secondary_feed_url
 )
 
 
@@ -38,6 +47,35 @@ def test_base_urls():
     assert 'https://api.buienradar.nl/image/1.0/RadarMapNL?' in radar_url()
 
 
+def test_configured_urls(monkeypatch):
+    """Test the url's configured using environment variables."""
+    monkeypatch.delenv(BASE_URL_ENV, raising=False)
+    monkeypatch.delenv(JSON_FEED_URL_ENV, raising=False)
+    monkeypatch.delenv(PRECIPITATION_URL_ENV, raising=False)
+    assert (json_feed_url() == JSON_FEED_URL)
+    assert (xml_feed_url() == XML_FEED_URL)
+    assert (xml_secondary_feed_url() == XML_SECONDARY_FEED_URL)
+
+    # all api's on a single server:
+    monkeypatch.setenv(BASE_URL_ENV, 'http://localhost:8080/')
+    assert (json_feed_url() == 'http://localhost:8080/2.0/feed/json')
+    assert (xml_feed_url() == 'http://localhost:8080/xml/')
+    assert (xml_secondary_feed_url() == 'http://localhost:8080/api/')
+    for func in (xml_precipitation_forecast_url,
+                 json_precipitation_forecast_url):
+        assert (func(1.234, 4.567) ==
+                'http://localhost:8080/getrr.php?lat=1.23&lon=4.57')
+
+    # a single url:
+    monkeypatch.setenv(JSON_FEED_URL_ENV, 'http://example.org/feed')
+    monkeypatch.setenv(PRECIPITATION_URL_ENV,
+                       'http://example.org/rain/{lat}/{lon}')
+    assert (json_feed_url() == 'http://example.org/feed')
+    assert (xml_feed_url() == 'http://localhost:8080/xml/')
+    assert (json_precipitation_forecast_url(1.234, 4.567) ==
+            'http://example.org/rain/1.23/4.57')
+
+
 def test_util():
     """Test the utility function for dictionaries."""
     try:
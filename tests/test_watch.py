@@ -0,0 +1,111 @@
+"""Testing the watch mode refreshing the data of a location."""
+import json
+import re
+
+import requests_mock
+
+from buienradar.__main__ import main
+from buienradar.constants import AVERAGE, DATA, PRECIPITATION_FORECAST, SUCCESS
+from buienradar.urls import JSON_FEED_URL
+from buienradar.watch import next_refresh, watch
+
+RAIN_URL = re.compile(r'https://gps\.buienradar\.nl/getrr\.php')
+# Sat, 18 Oct 2025 10:00:00 GMT (a multiple of 5 minutes)
+MODIFIED = 1760781600
+HEADERS = {'Last-Modified': 'Sat, 18 Oct 2025 10:00:00 GMT', 'ETag': '"1"'}
+
+
+def load_file(name):
+    """Load a file with test data."""
+    file = open(name, 'r')
+    data = file.read()
+    file.close()
+    return data
+
+
+class Clock:
+    """Fake clock; sleeping advances the time."""
+
+    def __init__(self, now):
+        """Initialize the clock."""
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        """Return the current time."""
+        return self.now
+
+    def sleep(self, seconds):
+        """Advance the time."""
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_next_refresh():
+    """Test the refreshes are aligned to the updates."""
+    assert (next_refresh(MODIFIED) == MODIFIED + 30)
+    assert (next_refresh(MODIFIED + 29) == MODIFIED + 30)
+    assert (next_refresh(MODIFIED + 30) == MODIFIED + 330)
+    assert (next_refresh(MODIFIED + 299) == MODIFIED + 330)
+    assert (next_refresh(MODIFIED + 40, 600, 0) == MODIFIED + 600)
+
+
+def test_watch():
+    """Test the refreshes reuse the feed and only emit changes."""
+    feed = load_file('tests/json/buienradar.json')
+    rain = [load_file('tests/raindata/raindata77.txt'),
+            load_file('tests/raindata/raindata77.txt'),
+            load_file('tests/raindata/raindata.txt'),
+            load_file('tests/raindata/raindata.txt')]
+    clock = Clock(MODIFIED + 40)
+    emitted = []
+
+    with requests_mock.Mocker() as m:
+        feed_mock = m.get(JSON_FEED_URL, [
+            {'text': feed, 'headers': HEADERS},
+            {'status_code': 304, 'headers': HEADERS}])
+        rain_mock = m.get(RAIN_URL, [{'text': text} for text in rain])
+
+        count = watch(52.1, 5.1, emitted.append, iterations=4,
+                      sleep=clock.sleep, clock=clock)
+
+        # at MODIFIED + 40, 330, 630 and 930:
+        assert (clock.sleeps == [290, 300, 300])
+        # the feed expires 10 minutes after it was modified (so is reused
+        # at MODIFIED + 330), or 30 seconds after a 304 (not modified):
+        assert (feed_mock.call_count == 3)
+        assert (feed_mock.last_request.headers['If-None-Match'] == '"1"')
+        assert (rain_mock.call_count == 4)
+
+    assert (count == 2 and len(emitted) == 2)
+    assert (all(result[SUCCESS] for result in emitted))
+    assert (emitted[0][DATA][PRECIPITATION_FORECAST][AVERAGE] !=
+            emitted[1][DATA][PRECIPITATION_FORECAST][AVERAGE])
+
+
+def test_watch_failed():
+    """Test failed refreshes are skipped."""
+    feed = load_file('tests/json/buienradar.json')
+    clock = Clock(MODIFIED)
+    emitted = []
+
+    with requests_mock.Mocker() as m:
+        m.get(JSON_FEED_URL, [{'status_code': 500}, {'text': feed}])
+        m.get(RAIN_URL, text=load_file('tests/raindata/raindata77.txt'))
+
+        count = watch(52.1, 5.1, emitted.append, iterations=3,
+                      sleep=clock.sleep, clock=clock)
+
+    assert (count == 1 and emitted[0][SUCCESS])
+
+
+def test_main_watch(capsys):
+    """Test the watch mode of the cli."""
+    feed = load_file('tests/json/buienradar.json')
+    with requests_mock.Mocker() as m:
+        m.get(JSON_FEED_URL, text=feed)
+        m.get(RAIN_URL, text=load_file('tests/raindata/raindata77.txt'))
+        main(['--watch', '--iterations=1'])
+
+    lines = capsys.readouterr().out.splitlines()
+    assert (len(lines) == 1 and json.loads(lines[0])[SUCCESS])
@@ -0,0 +1,108 @@
+"""Testing the streaming extraction of elements from xml."""
+import glob
+
+import pytest
+import xmltodict
+
+from buienradar import xmlstream
+from buienradar.buienradar import load_feed
+from buienradar.constants import MESSAGE, SUCCESS
+from buienradar.xmlstream import ExpatError, extract
+
+ROOT = 'buienradarnl'
+STATIONS = (ROOT, 'weergegevens', 'actueel_weer', 'weerstations',
+            'weerstation')
+FORECAST = (ROOT, 'weergegevens', 'verwachting_meerdaags')
+
+
+def load_file(name):
+    """Load a file with test data."""
+    file = open(name, 'r')
+    data = file.read()
+    file.close()
+    return data
+
+
+def get_path(data, path):
+    """Get the value at path from the xmltodict data (or KeyError)."""
+    for name in path:
+        if not isinstance(data, dict):
+            raise KeyError(name)
+        data = data[name]
+    return data
+
+
+def test_extract_same_as_xmltodict():
+    """Test the extracted elements are the same as parsed by xmltodict."""
+    for name in sorted(glob.glob('tests/xml/*.xml')):
+        content = load_file(name)
+        try:
+            expected = xmltodict.parse(content)
+        except xmltodict.expat.ExpatError:
+            with pytest.raises(ExpatError):
+                extract(content, ROOT, (STATIONS, FORECAST))
+            continue
+
+        result = extract(content, ROOT, (STATIONS, FORECAST))
+        if ROOT not in expected:
+            assert (result is None)
+            continue
+
+        for path in (STATIONS, FORECAST):
+            try:
+                assert (result[path] == get_path(expected, path)), name
+            except KeyError:
+                assert (path not in result), name
+
+
+def test_extract():
+    """Test the values of extracted elements."""
+    content = (
+        '<root><skip><a>x</a></skip>'
+        '<a id="1">  text  </a><a/><a id="2"/>'
+        '<b><c>1</c><c>2</c><d x="y">z<e/></d></b>'
+        '</root>')
+
+    result = extract(content, 'root', [('root', 'a'), ('root', 'b'),
+                                       ('root', 'missing')])
+
+    assert (result == {
+        ('root', 'a'): [{'@id': '1', '#text': 'text'}, None, {'@id': '2'}],
+        ('root', 'b'): {'c': ['1', '2'],
+                        'd': {'@x': 'y', '#text': 'z', 'e': None}}})
+
+    # bytes (with declared encoding) and a different root:
+    content = '<?xml version="1.0" encoding="iso-8859-1"?><root><a>\xe9</a>'
+    content += '</root>'
+    result = extract(content.encode('iso-8859-1'), 'root', [('root', 'a')])
+    assert (result == {('root', 'a'): '\xe9'})
+    assert (extract('<other><a/></other>', 'root', [('root', 'a')]) is None)
+
+
+def test_extract_chunks(monkeypatch):
+    """Test parsing a str in (small) chunks gives the same elements."""
+    content = load_file('tests/xml/buienradar.xml').replace(
+        'Meetstation', 'Méétstation \u20ac')
+    expected = extract(content.encode('utf-8'), ROOT, (STATIONS, FORECAST))
+    assert ('Méétstation €' in str(expected))
+
+    for size in (1, 7, 4096):
+        monkeypatch.setattr(xmlstream, 'CHUNK_SIZE', size)
+        assert (extract(content, ROOT, (STATIONS, FORECAST)) == expected)
+
+
+def test_extract_invalid():
+    """Test invalid xml is rejected."""
+    with pytest.raises(ExpatError):
+        extract('<root><a></root>', 'root', [('root', 'a')])
+    with pytest.raises(ExpatError):
+        extract('', 'root', [('root', 'a')])
+
+    content = ('<!DOCTYPE root [<!ENTITY e "entity">]>'
+               '<root><a>&e;</a></root>')
+    with pytest.raises(ValueError):
+        extract(content, 'root', [('root', 'a')])
+
+    result = load_feed(content, usexml=True)
+    assert (result[SUCCESS] is False)
+    assert (result[MESSAGE] == 'Unable to parse content as xml.')